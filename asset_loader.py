@@ -0,0 +1,148 @@
+# asset_loader.py
+"""بارگذاری پس‌زمینه تصاویر و صداها.
+
+decode فایل‌ها (PNG/JPG و WAV) در یک نخ پس‌زمینه انجام می‌شود و فقط ساخت بافت
+GPU، که باید در نخ اصلی باشد، با Clock و چند فایل در هر فریم انجام می‌شود. بافت‌ها
+در کش kv.texture خود Kivy قرار می‌گیرند، پس ویجت‌هایی که بعداً همان مسیر را
+می‌خواهند دیگر فایل را decode نمی‌کنند. ترتیب بارگذاری: اول دارایی‌های لانچر،
+بعد صداها و در آخر دارایی‌های صفحه‌های بازی.
+"""
+import json
+import os
+import queue
+import threading
+
+from kivy.clock import Clock
+from kivy.core.audio import SoundLoader
+from kivy.core.image import ImageLoader
+from kivy.logger import Logger
+
+from sound_bank import SOUND_BANK
+
+# اطلس تصاویر دکمه‌ها (لانچر و سایدبار)؛ با build_atlas.py از PNGهای assets ساخته می‌شود
+BUTTON_ATLAS = "assets/buttons"
+BUTTON_IMAGES = (
+    "flip",
+    "flip_down",
+    "rotate",
+    "rotate_down",
+    "return",
+    "return_down",
+    "reset",
+    "reset_down",
+    "back",
+    "back_down",
+    "exit",
+    "exit_down",
+)
+
+
+def atlas_image(name):
+    """مسیر atlas:// یک تصویر دکمه."""
+    return "atlas://%s/%s" % (BUTTON_ATLAS, name)
+
+
+def atlas_pages(atlas=BUTTON_ATLAS):
+    """مسیر PNG صفحه‌های یک اطلس (همان مسیری که Atlas خود Kivy بارگذاری می‌کند)."""
+    if not os.path.exists(atlas + ".atlas"):
+        return ()
+    with open(atlas + ".atlas") as f:
+        pages = json.load(f)
+    return tuple(os.path.join(os.path.dirname(atlas), page) for page in sorted(pages))
+
+
+# تصاویری که لانچر بدون آن‌ها نمایش داده نمی‌شود (اطلس دکمه‌ها بین لانچر و
+# صفحه‌های بازی مشترک است)
+LAUNCHER_IMAGES = ("assets/cover.jpg", "assets/Logo.png") + atlas_pages()
+# تصاویر اختصاصی صفحه‌های بازی
+GAME_IMAGES = ()
+# حداکثر تعداد بافت‌هایی که در هر فریم به GPU فرستاده می‌شوند
+UPLOADS_PER_FRAME = 2
+
+IMAGE, SOUND = "image", "sound"
+
+
+def _decode_worker(jobs, results, stop):
+    for kind, name, path in jobs:
+        if stop.is_set():
+            return
+        try:
+            if kind == IMAGE:
+                asset = ImageLoader.load(path)
+            else:
+                asset = SoundLoader.load(path)
+        except Exception as e:
+            Logger.warning("AssetLoader: cannot load %s (%s)" % (path, e))
+            asset = None
+        results.put((kind, name, path, asset))
+
+
+class AssetLoader(object):
+    """دارایی‌ها را در پس‌زمینه decode می‌کند و پیشرفت را در نخ اصلی گزارش می‌دهد."""
+
+    def __init__(self, launcher_images=LAUNCHER_IMAGES, game_images=GAME_IMAGES,
+                 sound_bank=SOUND_BANK):
+        self.sound_bank = sound_bank
+        self.jobs = (
+            [(IMAGE, path, path) for path in launcher_images]
+            + [(SOUND, name, path) for name, path in sorted(sound_bank.files.items())]
+            + [(IMAGE, path, path) for path in game_images]
+        )
+        self.required = set(launcher_images)
+        self.total = len(self.jobs)
+        self.done = 0
+        self.ready = False
+        # ارجاع به بافت‌ها تا کش Kivy آن‌ها را دور نریزد
+        self.textures = {}
+        self._results = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self._poll_event = None
+        self._on_progress = None
+        self._on_ready = None
+
+    def start(self, on_progress=None, on_ready=None):
+        """شروع decode؛ on_progress(done, total) و on_ready() در نخ اصلی صدا زده می‌شوند."""
+        self._on_progress = on_progress
+        self._on_ready = on_ready
+        self._thread = threading.Thread(
+            target=_decode_worker,
+            args=(self.jobs, self._results, self._stop),
+            name="asset-loader",
+        )
+        self._thread.daemon = True
+        self._thread.start()
+        self._poll_event = Clock.schedule_interval(self._poll, 0)
+
+    def _install(self, kind, name, path, asset):
+        if kind == SOUND:
+            # صدای ناموفق هم ثبت می‌شود (بی‌صدا) تا اولین پخش آن در نخ اصلی بارگذاری نشود
+            self.sound_bank.add(name, asset)
+        elif asset is not None:
+            # ساخت بافت (در نخ اصلی) و ثبت آن در کش kv.texture
+            self.textures[path] = asset.texture
+
+    def _poll(self, dt):
+        for _ in range(UPLOADS_PER_FRAME):
+            try:
+                kind, name, path, asset = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._install(kind, name, path, asset)
+            self.done += 1
+            self.required.discard(path)
+            if self._on_progress is not None:
+                self._on_progress(self.done, self.total)
+            if not self.ready and not self.required:
+                self.ready = True
+                if self._on_ready is not None:
+                    self._on_ready()
+        if self.done == self.total:
+            self._poll_event = None
+            return False
+
+    def stop(self):
+        self._stop.set()
+        if self._poll_event is not None:
+            self._poll_event.cancel()
+            self._poll_event = None
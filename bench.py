@@ -0,0 +1,553 @@
+# bench.py
+"""بنچمارک مسیرهای داغ components.py بدون پنجره واقعی.
+
+پنجره Kivy با درایور offscreen در SDL ساخته می‌شود تا اجرا روی سرور یا CI هم
+ممکن باشد. برای هر اندازه صفحه زمان هر عملیات چند بار اندازه‌گیری می‌شود و
+میانه (p50) و صدک ۹۵ (p95) بر حسب میلی‌ثانیه در یک فایل JSON نوشته می‌شود تا
+تغییرات بعدی این مسیرها قابل مقایسه باشند:
+
+    python bench.py --repeat 50 --out bench.json
+
+بخش sidebar زمان ساخت صفحه، حافظه و تعداد ویجت‌های کارت را برای سایدبار
+ردیفی و سایدبار مجازی هر مرحله مقایسه می‌کند.
+
+بخش stability بررسی می‌کند که پس از چرخه‌های تغییر اندازه پنجره و جابه‌جایی
+بین لانچر و صفحه‌های بازی، تعداد دستورات گرافیکی و حافظه ثابت بماند؛ اگر رشد
+کنند برنامه با کد خروج ۱ تمام می‌شود.
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+import argparse
+import gc
+import json
+import math
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import kivy
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics.instructions import InstructionGroup, VertexInstruction
+from kivy.lang import Builder
+from kivy.uix.screenmanager import NoTransition, ScreenManager
+
+import components
+from asset_loader import BUTTON_ATLAS, atlas_image
+from game import GameScreen
+from components import CardWidget, restore_board_state
+from levels import LEVELS, LEVELS_BY_NAME
+from savegame import decode_board, encode_board
+
+# تعداد پیش‌فرض نمونه‌های هر عملیات
+REPEAT = 30
+# چرخه‌های تغییر اندازه/جابه‌جایی صفحه و رشد مجاز حافظه در بررسی پایداری
+CYCLES = 40
+MEMORY_TOLERANCE_KB = 256
+OPERATIONS = (
+    "screen",
+    "update_canvas",
+    "setup_cells",
+    "drop_card",
+    "sidebar_add_card",
+    "reset_main_section",
+    "save_encode",
+    "save_decode",
+    "restore_board",
+    "undo_reset",
+)
+
+
+class BenchApp(App):
+    """App بدون run؛ فقط برای کدهایی که App.get_running_app را صدا می‌زنند."""
+
+    _data_dir = None
+
+    def build(self):
+        return ScreenManager()
+
+    @property
+    def user_data_dir(self):
+        # فایل‌های ذخیره صفحه‌ها در پوشه موقت نوشته می‌شوند، نه کنار ذخیره‌های بازی
+        if self._data_dir is None:
+            self._data_dir = tempfile.mkdtemp(prefix="tiptop-bench-")
+        return self._data_dir
+
+
+def summarize(samples):
+    """آمار نمونه‌ها بر حسب میلی‌ثانیه."""
+    ms = np.asarray(samples, dtype=float) * 1000.0
+    return {
+        "n": int(ms.size),
+        "p50": round(float(np.percentile(ms, 50)), 4),
+        "p95": round(float(np.percentile(ms, 95)), 4),
+        "mean": round(float(ms.mean()), 4),
+        "min": round(float(ms.min()), 4),
+        "max": round(float(ms.max()), 4),
+    }
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def frame():
+    """یک فریم مثل EventLoop.idle: Clock و بعد قواعد canvas تأخیری kv.
+
+    بدون Builder.sync قواعد canvas سبک پیش‌فرض (پس‌زمینه Button و Label) هر ویجتی که
+    ساخته می‌شود در صف می‌مانند و با هر ساخت دوباره صفحه حافظه رشد می‌کند.
+    """
+    Clock.tick()
+    Builder.sync()
+
+
+def build_screen(level):
+    """ساخت کامل صفحه: ویجت‌ها، چیدمان و اولین بازرسم در یک فریم."""
+    screen = GameScreen(level=level, name=level.name)
+    screen.size = Window.size
+    Window.add_widget(screen)
+    frame()
+    return screen
+
+
+def bench_screen(level, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        screen = build_screen(level)
+        samples.append(time.perf_counter() - started)
+        Window.remove_widget(screen)
+    return samples
+
+
+def bench_update_canvas(game, repeat):
+    card = game.all_cards[0]
+    samples = []
+    for i in range(repeat):
+        # رو و پشت کارت یک در میان، تا هر دو شاخه اندازه‌گیری شوند
+        card.face_up = i % 2 == 0
+        samples.append(timed(card.update_canvas))
+    card.face_up = True
+    return samples
+
+
+def fill_board(game):
+    main_section = game.main_section
+    for index, card in enumerate(game.all_cards):
+        main_section.place_card(card, index)
+
+
+def bench_setup_cells(game, repeat):
+    # بدترین حالت: همه خانه‌ها پر هستند و همه کارت‌ها جابه‌جا می‌شوند
+    fill_board(game)
+    main_section = game.main_section
+    width, height = main_section.size
+    samples = []
+    for i in range(repeat):
+        main_section.size = (width + i % 2, height)
+        samples.append(timed(main_section.setup_cells))
+    main_section.size = (width, height)
+    game.reset_main_section(None)
+    return samples
+
+
+def bench_drop_card(game, repeat):
+    main_section = game.main_section
+    center = main_section.center
+    samples = []
+    while len(samples) < repeat:
+        for card in game.all_cards:
+            # کارت‌های سایدبار مجازی تا وقتی برداشته نشوند والد ندارند
+            if card.parent is not None:
+                card.parent.remove_widget(card)
+            samples.append(timed(main_section.drop_card, card, center))
+            if len(samples) == repeat:
+                break
+        game.reset_main_section(None)
+    return samples
+
+
+def bench_sidebar_add_card(game, repeat):
+    main_section = game.main_section
+    sidebar = game.sidebar
+    samples = []
+    while len(samples) < repeat:
+        fill_board(game)
+        for card in game.all_cards:
+            main_section.release_card(card)
+            main_section.remove_widget(card)
+            samples.append(timed(sidebar.add_card, card))
+            if len(samples) == repeat:
+                break
+        game.reset_main_section(None)
+    return samples
+
+
+def bench_reset_main_section(game, repeat):
+    samples = []
+    for _ in range(repeat):
+        fill_board(game)
+        samples.append(timed(game.reset_main_section, None))
+    return samples
+
+
+def saved_board(game):
+    """مدل یک صفحه پر با چرخش‌ها و طرف‌های متفاوت (بدترین حالت ذخیره/بازیابی)."""
+    fill_board(game)
+    for card in game.all_cards:
+        card.angle = (card.card_id % 4) * 90
+        card.face_up = card.card_id % 3 != 0
+    board = game.board.copy()
+    game.reset_main_section(None)
+    return board
+
+
+def bench_save_encode(game, repeat):
+    board = saved_board(game)
+    return [timed(encode_board, board, game.card_set) for _ in range(repeat)]
+
+
+def bench_save_decode(game, repeat):
+    data = encode_board(saved_board(game), game.card_set)
+    return [timed(decode_board, data, game.card_set) for _ in range(repeat)]
+
+
+def bench_restore_board(game, repeat):
+    board = saved_board(game)
+    samples = []
+    for _ in range(repeat):
+        samples.append(timed(restore_board_state, game, board))
+        Clock.tick()
+        game.reset_main_section(None)
+        Clock.tick()
+    return samples
+
+
+def bench_undo_reset(game, repeat):
+    # بدترین حالت undo: برگرداندن ریست یک صفحه پر
+    samples = []
+    for _ in range(repeat):
+        fill_board(game)
+        game.reset_main_section(None)
+        Clock.tick()
+        samples.append(timed(game.undo))
+        Clock.tick()
+        game.moves.clear()
+        game.reset_main_section(None)
+    return samples
+
+
+def bench_level(level, repeat, operations):
+    results = {}
+    if "screen" in operations:
+        results["screen"] = bench_screen(level, repeat)
+    screen = build_screen(level)
+    game = screen.game
+    for name in operations:
+        if name == "screen":
+            continue
+        gc.collect()
+        results[name] = globals()["bench_" + name](game, repeat)
+        Clock.tick()
+    Window.remove_widget(screen)
+    stats = dict((name, summarize(samples)) for name, samples in results.items())
+    stats["save_bytes"] = len(encode_board(game.board, game.card_set))
+    return stats
+
+
+def sidebar_report(levels, repeat):
+    """ساخت صفحه هر مرحله با سایدبار ردیفی و مجازی: زمان، حافظه و ویجت‌های کارت."""
+    report = {}
+    for level in levels:
+        report[level.name] = modes = {}
+        for mode, virtual in (("rows", False), ("virtual", True)):
+            samples = []
+            for i in range(repeat + 1):
+                gc.collect()
+                # ساخت اول فقط برای اندازه‌گیری حافظه است (tracemalloc زمان را خراب می‌کند)
+                if i == 0:
+                    tracemalloc.start()
+                started = time.perf_counter()
+                screen = GameScreen(level=level, name=level.name, virtual_sidebar=virtual)
+                screen.size = Window.size
+                Window.add_widget(screen)
+                frame()
+                if i == 0:
+                    # نماهای RecycleView در چند فریم ساخته می‌شوند
+                    for _ in range(3):
+                        frame()
+                    memory = tracemalloc.get_traced_memory()[0]
+                    tracemalloc.stop()
+                    widgets = sum(isinstance(w, CardWidget) for w in screen.walk())
+                else:
+                    samples.append(time.perf_counter() - started)
+                Window.remove_widget(screen)
+            modes[mode] = {
+                "build": summarize(samples),
+                "memory_kb": round(memory / 1024.0, 1),
+                "card_widgets": widgets,
+            }
+    return report
+
+
+def collect_instructions(group, found=None):
+    """دستورات گرافیکی یک canvas با همه گروه‌های تودرتو (canvas فرزندان هم جزو آن است)."""
+    if found is None:
+        found = []
+    for child in group.children:
+        found.append(child)
+        if isinstance(child, InstructionGroup):
+            collect_instructions(child, found)
+    return found
+
+
+def screen_instructions(manager):
+    return sum(len(collect_instructions(screen.canvas)) for screen in manager.screens)
+
+
+def texture_binds(canvas):
+    """(تعداد تعویض بافت در ترتیب رسم، تعداد بافت‌های متمایز) برای یک canvas.
+
+    Kivy فقط وقتی بافت فعلی عوض شود آن را دوباره bind می‌کند؛ دستورات بدون بافت
+    از بافت سفید پیش‌فرض استفاده می‌کنند و ناحیه‌های یک اطلس همان بافت والد هستند.
+    """
+    binds = 0
+    current = None
+    textures = set()
+    for instruction in collect_instructions(canvas):
+        if not isinstance(instruction, VertexInstruction):
+            continue
+        texture = instruction.texture
+        texture_id = texture.id if texture is not None else -1
+        textures.add(texture_id)
+        if texture_id != current:
+            binds += 1
+            current = texture_id
+    return binds, len(textures)
+
+
+def separate_image(name):
+    """مسیر PNG جدای یک تصویر دکمه (ورودی build_atlas.py) به جای ناحیه اطلس."""
+    return os.path.join(os.path.dirname(BUTTON_ATLAS), name + ".png")
+
+
+def screen_texture_binds(factory):
+    screen = factory()
+    screen.size = Window.size
+    Window.add_widget(screen)
+    # قواعد canvas فایل kv (مثل تصویر دکمه‌ها) با تأخیر اعمال می‌شوند
+    Builder.sync()
+    Clock.tick()
+    binds, textures = texture_binds(screen.canvas)
+    Window.remove_widget(screen)
+    return binds, textures
+
+
+def texture_report(levels):
+    """تعویض بافت‌ها در هر فریم برای لانچر و صفحه هر مرحله، با اطلس و بدون آن.
+
+    مبنای بدون اطلس همان صفحه‌ها با تصاویر دکمه از فایل‌های جدا است (atlas_image
+    لانچر و سایدبار موقتاً مسیر PNG جدا را برمی‌گرداند).
+    """
+    import main
+
+    report = {}
+    screens = [("launcher", lambda: main.LauncherScreen(name="launcher"))]
+    screens += [(level.name, lambda level=level: GameScreen(level=level, name=level.name))
+                for level in levels]
+    for name, factory in screens:
+        binds, textures = screen_texture_binds(factory)
+        report[name] = {"binds_per_frame": binds, "textures": textures}
+
+    modules = (main, components)
+    for module in modules:
+        module.atlas_image = separate_image
+    try:
+        for name, factory in screens:
+            binds, textures = screen_texture_binds(factory)
+            report[name]["separate_binds_per_frame"] = binds
+            report[name]["separate_textures"] = textures
+    finally:
+        for module in modules:
+            module.atlas_image = atlas_image
+    return report
+
+
+def collect_garbage():
+    # callback‌های weakref در یک دور gc زباله تازه می‌سازند؛ تا خالی شدن تکرار می‌شود
+    while gc.collect():
+        pass
+
+
+def check_stability(cycles, max_live_screens=None, levels=None):
+    """تغییر اندازه پنجره و رفت‌وبرگشت لانچر ↔ صفحه‌های بازی؛ دستورات و حافظه باید ثابت بمانند.
+
+    مثل برنامه فقط MAX_LIVE_GAME_SCREENS صفحه بازی زنده می‌ماند، پس صفحه‌ها مدام آزاد
+    و دوباره ساخته می‌شوند و هر چیزی که از یک ساخت به ساخت بعد می‌ماند دیده می‌شود.
+    """
+    from main import MAX_LIVE_GAME_SCREENS, LauncherScreen, LazyScreenManager
+
+    if max_live_screens is None:
+        max_live_screens = MAX_LIVE_GAME_SCREENS
+    levels = LEVELS if levels is None else levels
+    manager = LazyScreenManager(
+        factories=dict((level.name, GameScreen) for level in levels),
+        transition=NoTransition(),
+        max_live_screens=max_live_screens,
+    )
+    manager.add_widget(LauncherScreen(name="launcher"))
+    Window.add_widget(manager)
+    width, height = Window.size
+
+    def cycle(i):
+        level = levels[i % len(levels)]
+        Window.size = (width + 40 * (i % 3), height + 30 * (i % 2))
+        frame()
+        manager.current = level.name
+        frame()
+        manager.current = "launcher"
+        frame()
+
+    # یک دوره کامل برای گرم شدن (ساخت صفحه‌ها، کش بافت‌ها و فونت‌ها)؛ تعداد
+    # چرخه‌ها مضرب دوره (مراحل × شش اندازه پنجره) است تا در پایان همان صفحه‌ها با
+    # همان اندازه پنجره زنده باشند. حافظه از پیش از گرم شدن ردیابی می‌شود تا آزاد
+    # شدن صفحه‌های قدیمی هم به حساب بیاید
+    period = len(levels) * 6 // math.gcd(len(levels), 6)
+    cycles = -(-cycles // period) * period
+    tracemalloc.start()
+    for i in range(period):
+        cycle(i)
+    collect_garbage()
+    instructions_before = screen_instructions(manager)
+    # دستورات لانچر باید همان اشیای قبلی بمانند (به‌روزرسانی درجا، نه ساخت دوباره)
+    launcher_before = collect_instructions(manager.get_screen("launcher").canvas)
+    memory_before = tracemalloc.get_traced_memory()[0]
+    for i in range(cycles):
+        cycle(i)
+    collect_garbage()
+    instructions_after = screen_instructions(manager)
+    launcher_after = set(
+        id(instruction)
+        for instruction in collect_instructions(manager.get_screen("launcher").canvas)
+    )
+    replaced = sum(id(instruction) not in launcher_after for instruction in launcher_before)
+    memory_after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    Window.remove_widget(manager)
+    Window.size = (width, height)
+
+    growth_kb = (memory_after - memory_before) / 1024.0
+    return {
+        "cycles": cycles,
+        "max_live_screens": max_live_screens,
+        "instructions_before": instructions_before,
+        "instructions_after": instructions_after,
+        "launcher_instructions_replaced": replaced,
+        "memory_growth_kb": round(growth_kb, 1),
+        "flat": instructions_after == instructions_before
+        and not replaced
+        and growth_kb < MEMORY_TOLERANCE_KB,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="headless benchmarks of the game widgets")
+    parser.add_argument("levels", nargs="*", default=[level.name for level in LEVELS])
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--ops", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--out", help="JSON output path (default: stdout)")
+    parser.add_argument("--cycles", type=int, default=CYCLES,
+                        help="resize/screen-switch cycles of the stability check (0 = skip)")
+    args = parser.parse_args(argv)
+
+    app = BenchApp()
+    app.root = app.build()
+    App._running_app = app
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "kivy": kivy.__version__,
+            "platform": platform.platform(),
+            "window": [int(Window.width), int(Window.height)],
+            "repeat": args.repeat,
+            "unit": "ms",
+        },
+        "results": {},
+    }
+    for name in args.levels:
+        level = LEVELS_BY_NAME[name]
+        stats = bench_level(level, args.repeat, args.ops)
+        report["results"][name] = stats
+        sys.stderr.write("%-11s save file %d bytes\n" % (name, stats["save_bytes"]))
+        for op in args.ops:
+            sys.stderr.write(
+                "%-11s %-19s p50 %8.3fms  p95 %8.3fms\n"
+                % (name, op, stats[op]["p50"], stats[op]["p95"])
+            )
+
+    report["sidebar"] = sidebar_report(
+        [LEVELS_BY_NAME[name] for name in args.levels], max(1, args.repeat // 3)
+    )
+    for name in args.levels:
+        for mode, stats in sorted(report["sidebar"][name].items()):
+            sys.stderr.write(
+                "%-11s sidebar %-8s build p50 %8.3fms  %8.1fKB  %4d card widgets\n"
+                % (name, mode, stats["build"]["p50"], stats["memory_kb"], stats["card_widgets"])
+            )
+
+    report["textures"] = texture_report([LEVELS_BY_NAME[name] for name in args.levels])
+    for name, stats in sorted(report["textures"].items()):
+        sys.stderr.write(
+            "%-11s texture binds/frame %4d  (%d textures), separate images %4d  (%d textures)\n"
+            % (
+                name,
+                stats["binds_per_frame"],
+                stats["textures"],
+                stats["separate_binds_per_frame"],
+                stats["separate_textures"],
+            )
+        )
+
+    if args.cycles:
+        stability = check_stability(args.cycles)
+        report["stability"] = stability
+        sys.stderr.write(
+            "stability: %d cycles, instructions %d -> %d (launcher %d replaced), memory %+.1fKB (%s)\n"
+            % (
+                stability["cycles"],
+                stability["instructions_before"],
+                stability["instructions_after"],
+                stability["launcher_instructions_replaced"],
+                stability["memory_growth_kb"],
+                "flat" if stability["flat"] else "GROWING",
+            )
+        )
+
+    if app._data_dir is not None:
+        shutil.rmtree(app._data_dir, ignore_errors=True)
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    report = main()
+    if not report.get("stability", {}).get("flat", True):
+        sys.exit(1)
@@ -0,0 +1,148 @@
+# board.py
+import numpy as np
+
+# کارتی که روی صفحه نیست (در سایدبار است)
+OFF_BOARD = -1
+
+
+class BoardModel(object):
+    """مدل صفحه بازی بدون وابستگی به Kivy؛ همه وضعیت‌ها در آرایه‌های NumPy نگه داشته می‌شوند.
+
+    برای هر کارت: خانه (cell)، تعداد ربع‌چرخش پادساعتگرد (turns)، رو بودن (face_up)
+    و ایندکس رنگ پشت (back_color). برای هر خانه: کارتی که در آن است (occupant).
+    خانه‌ها به ترتیب سطری از پایین شماره می‌خورند.
+    """
+
+    def __init__(self, cols, rows, back_colors):
+        self.cols = cols
+        self.rows = rows
+        n_cards = len(back_colors)
+        self.cell = np.full(n_cards, OFF_BOARD, dtype=np.int16)
+        self.occupant = np.full(cols * rows, OFF_BOARD, dtype=np.int16)
+        self.turns = np.zeros(n_cards, dtype=np.uint8)
+        self.face_up = np.ones(n_cards, dtype=np.bool_)
+        self.back_color = np.asarray(back_colors, dtype=np.uint8)
+        # توابعی که پس از هر تغییر یک خانه با ایندکس آن خانه صدا زده می‌شوند
+        self.watchers = []
+
+    @property
+    def n_cards(self):
+        return len(self.cell)
+
+    @property
+    def n_cells(self):
+        return self.cols * self.rows
+
+    def copy(self):
+        other = BoardModel.__new__(BoardModel)
+        other.cols = self.cols
+        other.rows = self.rows
+        other.cell = self.cell.copy()
+        other.occupant = self.occupant.copy()
+        other.turns = self.turns.copy()
+        other.face_up = self.face_up.copy()
+        other.back_color = self.back_color.copy()
+        other.watchers = []
+        return other
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, BoardModel)
+            and self.cols == other.cols
+            and self.rows == other.rows
+            and np.array_equal(self.cell, other.cell)
+            and np.array_equal(self.turns, other.turns)
+            and np.array_equal(self.face_up, other.face_up)
+            and np.array_equal(self.back_color, other.back_color)
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def _notify(self, index):
+        for watcher in self.watchers:
+            watcher(index)
+
+    def _card_changed(self, card):
+        if self.watchers:
+            index = int(self.cell[card])
+            if index != OFF_BOARD:
+                self._notify(index)
+
+    def index_of(self, row, col):
+        return row * self.cols + col
+
+    def cell_of(self, card):
+        index = int(self.cell[card])
+        return None if index == OFF_BOARD else index
+
+    def card_in(self, index):
+        card = int(self.occupant[index])
+        return None if card == OFF_BOARD else card
+
+    def card_at(self, row, col):
+        return self.card_in(row * self.cols + col)
+
+    def is_free(self, index):
+        return self.occupant[index] == OFF_BOARD
+
+    def placed(self):
+        """جفت‌های (ایندکس خانه، کارت) برای خانه‌های اشغال‌شده، به ترتیب خانه."""
+        cells = np.flatnonzero(self.occupant != OFF_BOARD)
+        return [(int(i), int(self.occupant[i])) for i in cells]
+
+    def off_board(self):
+        return [int(i) for i in np.flatnonzero(self.cell == OFF_BOARD)]
+
+    def place(self, card, index):
+        current = self.occupant[index]
+        if current == card:
+            return
+        if current != OFF_BOARD:
+            raise ValueError("cell %d is already occupied" % index)
+        self.remove(card)
+        self.occupant[index] = card
+        self.cell[card] = index
+        if self.watchers:
+            self._notify(index)
+
+    def remove(self, card):
+        """کارت را از صفحه برمی‌دارد و ایندکس خانه قبلی (یا None) را برمی‌گرداند."""
+        index = int(self.cell[card])
+        if index == OFF_BOARD:
+            return None
+        self.occupant[index] = OFF_BOARD
+        self.cell[card] = OFF_BOARD
+        if self.watchers:
+            self._notify(index)
+        return index
+
+    def clear(self):
+        """همه کارت‌ها را از صفحه برمی‌دارد و لیست آن‌ها را برمی‌گرداند."""
+        placed = self.placed()
+        self.cell.fill(OFF_BOARD)
+        self.occupant.fill(OFF_BOARD)
+        if self.watchers:
+            for index, _ in placed:
+                self._notify(index)
+        return [card for _, card in placed]
+
+    def rotate(self, card, quarter_turns=1):
+        self.turns[card] = (int(self.turns[card]) + quarter_turns) % 4
+        self._card_changed(card)
+
+    def set_turns(self, card, quarter_turns):
+        quarter_turns %= 4
+        if self.turns[card] != quarter_turns:
+            self.turns[card] = quarter_turns
+            self._card_changed(card)
+
+    def flip(self, card):
+        self.face_up[card] = not self.face_up[card]
+        self._card_changed(card)
+
+    def set_face_up(self, card, face_up):
+        face_up = bool(face_up)
+        if self.face_up[card] != face_up:
+            self.face_up[card] = face_up
+            self._card_changed(card)
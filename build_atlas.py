@@ -0,0 +1,52 @@
+# build_atlas.py
+"""ساخت اطلس تصاویر دکمه‌ها از روی PNGهای پوشه assets.
+
+بعد از هر تغییر در تصاویر دکمه‌ها اجرا شود (به Pillow نیاز دارد):
+
+    python build_atlas.py
+
+خروجی assets/buttons.atlas و assets/buttons-0.png است؛ ویجت‌ها با
+atlas://assets/buttons/<نام> به ناحیه‌های آن ارجاع می‌دهند.
+"""
+import argparse
+import os
+import sys
+
+from kivy.atlas import Atlas
+
+from asset_loader import BUTTON_ATLAS, BUTTON_IMAGES
+
+# اندازه هر صفحه اطلس (همه دکمه‌ها در یک صفحه جا می‌شوند)
+ATLAS_SIZE = 512
+ATLAS_PADDING = 2
+
+
+def build(atlas=BUTTON_ATLAS, names=BUTTON_IMAGES, size=ATLAS_SIZE, padding=ATLAS_PADDING):
+    source_dir = os.path.dirname(atlas)
+    filenames = [os.path.join(source_dir, name + ".png") for name in names]
+    missing = [filename for filename in filenames if not os.path.exists(filename)]
+    if missing:
+        raise IOError("missing atlas sources: %s" % ", ".join(missing))
+    # صفحه‌های قبلی پاک می‌شوند تا صفحه اضافه‌ای از ساخت قبل باقی نماند
+    for filename in os.listdir(source_dir or "."):
+        if filename.startswith(os.path.basename(atlas) + "-") and filename.endswith(".png"):
+            os.remove(os.path.join(source_dir, filename))
+    result = Atlas.create(atlas, filenames, size, padding=padding)
+    if not result:
+        raise ValueError("images do not fit in %dx%d atlas pages" % (size, size))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="pack the button images into a Kivy atlas")
+    parser.add_argument("--size", type=int, default=ATLAS_SIZE)
+    args = parser.parse_args(argv)
+    try:
+        filename, meta = build(size=args.size)
+    except (IOError, ValueError) as e:
+        sys.exit(str(e))
+    print("%s: %d images in %d page(s)" % (filename, len(BUTTON_IMAGES), len(meta)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# cell_grid.py
+from bisect import bisect_left
+
+
+class CellGrid(object):
+    """هندسه خانه‌ها و ایندکس خانه‌های خالی روی یک BoardModel.
+
+    اشغال خانه‌ها (خانه←کارت و کارت←خانه) در آرایه‌های مدل نگه داشته می‌شود و همه
+    تغییرات از طریق place/remove/clear انجام می‌شود تا ایندکس خانه‌های خالی هم‌گام بماند.
+    کارت‌ها با شناسه عددی‌شان در مدل مشخص می‌شوند.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.cols = board.cols
+        self.rows = board.rows
+        self.origin = (0.0, 0.0)
+        self.cell_size = 0.0
+        self._rebuild_free()
+
+    def _rebuild_free(self):
+        # برای هر سطر، ستون‌های خالی به صورت مرتب
+        occupant = self.board.occupant
+        self._free_cols = [
+            [col for col in range(self.cols) if occupant[row * self.cols + col] < 0]
+            for row in range(self.rows)
+        ]
+        self.free_count = sum(len(free) for free in self._free_cols)
+
+    def set_geometry(self, origin_x, origin_y, cell_size):
+        self.origin = (origin_x, origin_y)
+        self.cell_size = cell_size
+
+    def index_of(self, row, col):
+        return row * self.cols + col
+
+    def row_col(self, index):
+        return divmod(index, self.cols)
+
+    def cell_pos(self, index):
+        row, col = divmod(index, self.cols)
+        return (
+            self.origin[0] + col * self.cell_size,
+            self.origin[1] + row * self.cell_size,
+        )
+
+    def cell_at(self, x, y):
+        """خانه زیر مختصات داده‌شده را با محاسبه مستقیم (محدود به گرید) برمی‌گرداند."""
+        if self.cell_size <= 0:
+            return 0, 0
+        col = int((x - self.origin[0]) // self.cell_size)
+        row = int((y - self.origin[1]) // self.cell_size)
+        return min(max(row, 0), self.rows - 1), min(max(col, 0), self.cols - 1)
+
+    def is_free(self, index):
+        return self.board.is_free(index)
+
+    def card_in(self, index):
+        return self.board.card_in(index)
+
+    def card_at(self, row, col):
+        return self.board.card_at(row, col)
+
+    def slot_of(self, card):
+        return self.board.cell_of(card)
+
+    def placed(self):
+        """جفت‌های (ایندکس خانه، کارت) برای خانه‌های اشغال‌شده."""
+        return self.board.placed()
+
+    def place(self, card, index):
+        """کارت را در خانه index می‌گذارد (اگر جای دیگری بود، ابتدا از آنجا برداشته می‌شود)."""
+        current = self.board.card_in(index)
+        if current == card:
+            return
+        if current is not None:
+            raise ValueError("cell %d is already occupied" % index)
+        self.remove(card)
+        self.board.place(card, index)
+        self._occupy(index)
+
+    def remove(self, card):
+        """کارت را از خانه‌اش برمی‌دارد و ایندکس آن خانه (یا None) را برمی‌گرداند."""
+        index = self.board.remove(card)
+        if index is not None:
+            self._release(index)
+        return index
+
+    def clear(self):
+        """همه خانه‌ها را خالی می‌کند و کارت‌های برداشته‌شده را برمی‌گرداند."""
+        cards = self.board.clear()
+        self._free_cols = [list(range(self.cols)) for _ in range(self.rows)]
+        self.free_count = self.cols * self.rows
+        return cards
+
+    def return_all(self):
+        """ریست صفحه: همه کارت‌ها برداشته و رو می‌شوند (کارت‌های سایدبار همیشه رو هستند).
+
+        کارت‌های برداشته‌شده را برمی‌گرداند؛ MainSection.reset و replay.py هر دو از همین
+        مسیر استفاده می‌کنند.
+        """
+        cards = self.clear()
+        for card in cards:
+            self.board.set_face_up(card, True)
+        return cards
+
+    def _occupy(self, index):
+        row, col = divmod(index, self.cols)
+        free = self._free_cols[row]
+        i = bisect_left(free, col)
+        if i < len(free) and free[i] == col:
+            del free[i]
+            self.free_count -= 1
+
+    def _release(self, index):
+        row, col = divmod(index, self.cols)
+        free = self._free_cols[row]
+        i = bisect_left(free, col)
+        if i == len(free) or free[i] != col:
+            free.insert(i, col)
+            self.free_count += 1
+
+    def _nearest_in_row(self, row, fx):
+        """نزدیک‌ترین ستون خالی سطر به مختصات کسری fx (بر حسب ستون)."""
+        free = self._free_cols[row]
+        if not free:
+            return None
+        i = bisect_left(free, fx)
+        if i == 0:
+            return free[0]
+        if i == len(free):
+            return free[-1]
+        left, right = free[i - 1], free[i]
+        return left if fx - left <= right - fx else right
+
+    def nearest_free(self, x, y):
+        """نزدیک‌ترین خانه خالی به (x, y) بر اساس فاصله تا مرکز خانه‌ها، یا None."""
+        if not self.free_count or self.cell_size <= 0:
+            return None
+        row, col = self.cell_at(x, y)
+        index = self.index_of(row, col)
+        if self.is_free(index):
+            return index
+        # مختصات بر حسب واحد خانه، به طوری که مرکز خانه‌ها روی اعداد صحیح باشد
+        fx = (x - self.origin[0]) / self.cell_size - 0.5
+        fy = (y - self.origin[1]) / self.cell_size - 0.5
+        best_index = None
+        best_dist = None
+        below, above = row, row + 1
+        # سطرها به ترتیب فاصله عمودی بررسی می‌شوند و وقتی فاصله عمودی از بهترین بیشتر شود متوقف می‌شویم
+        while below >= 0 or above < self.rows:
+            dy_below = fy - below if below >= 0 else None
+            dy_above = above - fy if above < self.rows else None
+            if dy_above is None or (dy_below is not None and abs(dy_below) <= abs(dy_above)):
+                current, dy = below, dy_below
+                below -= 1
+            else:
+                current, dy = above, dy_above
+                above += 1
+            if best_dist is not None and dy * dy >= best_dist:
+                break
+            c = self._nearest_in_row(current, fx)
+            if c is None:
+                continue
+            dist = (fx - c) ** 2 + dy * dy
+            if best_dist is None or dist < best_dist:
+                best_dist = dist
+                best_index = self.index_of(current, c)
+        return best_index
@@ -1,32 +1,95 @@
 # components.py
+import numpy as np
+
 from kivy.uix.widget import Widget
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.image import Image
 from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.properties import (
     BooleanProperty,
     NumericProperty,
     ListProperty,
     ObjectProperty,
 )
-from kivy.graphics import Color, Ellipse, Line, PushMatrix, PopMatrix, Rotate, Rectangle
+from kivy.graphics import (
+    Color,
+    Ellipse,
+    InstructionGroup,
+    Line,
+    PushMatrix,
+    PopMatrix,
+    Rotate,
+    Rectangle,
+    Scale,
+)
 from kivy.graphics.vertex_instructions import RoundedRectangle
 from kivy.animation import Animation
 from kivy.app import App
-from kivy.core.audio import SoundLoader
+from kivy.clock import Clock
+
+from board import OFF_BOARD, BoardModel
+from cell_grid import CellGrid
+from move_log import HINT, MOVE
+from validator import MISMATCH, EdgeValidator
+from sound_bank import SOUND_BANK
+from asset_loader import atlas_image
 
 CARD_MARGIN = 5
+# اندازه پیش‌فرض دکمه‌های مربعی پنل سایدبار
+BUTTON_SIZE = 80
+# بیشینه اندازه کارت و ارتفاع ردیف‌های سایدبار (وقتی جا کم است کوچک‌تر می‌شوند)
+CARD_SIZE = 80
+ROW_HEIGHT = 110
+# کمینه ارتفاع ردیف‌های سایدبار مجازی؛ اگر همه ردیف‌ها جا نشوند فهرست اسکرول می‌شود
+MIN_ROW_HEIGHT = 48
+
+# قاب صفحه، قاب صفحه حل‌شده و نوار لبه‌های ناجور (رنگ و ضخامت)
+FRAME_COLOR = (0.7, 0.7, 0.7, 1)
+SOLVED_FRAME_COLOR = (0.1, 0.75, 0.2, 1)
+CONFLICT_COLOR = (1, 0.1, 0.1, 1)
+CONFLICT_WIDTH = 4
+# دکمه راهنما وقتی هیچ پیشنهادی نیست این مدت خاکستری با متن NO_HINT_TEXT می‌ماند
+NO_HINT_SECONDS = 1.5
+NO_HINT_TEXT = "No\nhint"
+NO_HINT_COLOR = (0.45, 0.45, 0.45, 1)
+
+# رنگ مربع‌های روی کارت؛ ایندکس همان شماره رنگ در solver.py است (قرمز، سبز، زرد،
+# آبی و بعد رنگ‌هایی که صفحه‌های بزرگ‌تر لازم دارند، تا solver.default_colors(12))
+FACE_COLORS = (
+    (1, 0, 0, 1),
+    (0, 1, 0, 1),
+    (1, 1, 0, 1),
+    (0, 0, 1, 1),
+    (1, 0.5, 0, 1),
+    (0.55, 0, 0.8, 1),
+    (0, 0.9, 0.9, 1),
+    (1, 0, 1, 1),
+    (0.55, 0.3, 0.05, 1),
+    (0.1, 0.1, 0.1, 1),
+    (1, 0.7, 0.75, 1),
+    (0, 0.45, 0.15, 1),
+    (0.05, 0.1, 0.45, 1),
+    (0.6, 0.6, 0.6, 1),
+)
 
 
 class CardWidget(Widget):
     face_up = BooleanProperty(True)
     angle = NumericProperty(0)
     card_color = ListProperty([1, 1, 1, 1])
+    # شماره رنگ ربع‌های روی کارت به ترتیب ساعتگرد از بالا-چپ (مثل solver.Card.face)
+    face = ListProperty([0, 1, 3, 2])
     in_sidebar = BooleanProperty(True)
     selected = BooleanProperty(False)
     dragging = BooleanProperty(False)
+    # انیمیشن flip در جریان است (تا پایانش flip دوباره نادیده گرفته می‌شود)
+    flipping = BooleanProperty(False)
     old_cell = ObjectProperty(None, allownone=True)
 
     touch_offset_x = NumericProperty(0)
@@ -35,133 +98,219 @@ class CardWidget(Widget):
     scale_x = NumericProperty(1)
     selection_border_opacity = NumericProperty(0)
 
+    # شناسه کارت، مدل صفحه‌ای که این ویجت نمای آن است و بازی (کنترلری) که کارت
+    # به آن تعلق دارد؛ هنگام ساخت ویجت در Game تنظیم می‌شوند
+    card_id = None
+    board = None
+    game = None
+
+    @staticmethod
     def play_global_reset_sound():
-        reset_sound = SoundLoader.load("sounds/reset.wav")
-        if reset_sound:
-            reset_sound.play()
+        SOUND_BANK.play("reset")
 
     def __init__(self, **kwargs):
         super(CardWidget, self).__init__(**kwargs)
         self.size_hint = (None, None)
-        self.size = (80, 80)
-        # بارگذاری افکت‌های صوتی
-        self.flip_sound = SoundLoader.load("assets/sounds/flip.wav")
-        self.rotate_sound = SoundLoader.load("assets/sounds/rotate.wav")
-        self.return_sound = SoundLoader.load("assets/sounds/return.wav")
-        self.reset_sound = SoundLoader.load("assets/sounds/reset.wav")
-        self.drop_sound = SoundLoader.load("assets/sounds/drop.wav")
+        self.size = (CARD_SIZE, CARD_SIZE)
+        # افکت‌های صوتی از بانک مشترک SOUND_BANK پخش می‌شوند (بدون بارگذاری در هر کارت)
+        # همه تغییرات یک فریم در یک بازرسم واحد (پیش از رندر فریم) جمع می‌شوند
+        self._trigger_redraw = Clock.create_trigger(self.update_canvas, -1)
+        self.redraw_count = 0
+        self.redraw_frames = 0
+        self.max_redraws_per_frame = 0
+        self._redraw_frame = None
+        self._frame_redraws = 0
         self.bind(
-            pos=self.update_canvas,
-            size=self.update_canvas,
-            face_up=self.update_canvas,
-            angle=self.update_canvas,
-            selected=self.update_canvas,
-            in_sidebar=self.update_canvas,
-            scale_x=self.update_canvas,
-            selection_border_opacity=self.update_canvas,
+            pos=self._trigger_redraw,
+            size=self._trigger_redraw,
+            face_up=self._trigger_redraw,
+            angle=self._trigger_redraw,
+            selected=self._trigger_redraw,
+            in_sidebar=self._trigger_redraw,
+            scale_x=self._trigger_redraw,
+            selection_border_opacity=self._trigger_redraw,
+            card_color=self._trigger_redraw,
+            face=self._trigger_redraw,
         )
+        self._build_canvas()
         self.update_canvas()
 
-    def update_canvas(self, *args):
-        self.canvas.clear()
-        center_point = (self.x + self.width / 2.0, self.y + self.height / 2.0)
+    def _build_canvas(self):
+        """دستورات گرافیکی کارت یک‌بار ساخته می‌شوند و بعداً فقط مقادیرشان تغییر می‌کند."""
         with self.canvas:
             PushMatrix()
-            Rotate(angle=self.angle, origin=center_point)
-            from kivy.graphics.context_instructions import Scale
-
-            Scale(self.scale_x, 1, 1, origin=center_point)
-            if self.in_sidebar:
-                Color(0.2, 0.2, 0.2, 1)
-            else:
-                Color(1, 1, 1, 1)
-            RoundedRectangle(pos=self.pos, size=self.size, radius=[10])
-            if self.face_up:
-                margin = CARD_MARGIN
-                inner_w = self.width - 2 * margin
-                inner_h = self.height - 2 * margin
-                spacing = 2
-                sq_w = (inner_w - spacing) / 2.0
-                sq_h = (inner_h - spacing) / 2.0
-                colors = [
-                    [1, 0, 0, 1],
-                    [0, 1, 0, 1],
-                    [1, 1, 0, 1],
-                    [0, 0, 1, 1],
-                ]
-                positions = [
-                    (self.x + margin, self.y + margin + sq_h + spacing),
-                    (
-                        self.x + margin + sq_w + spacing,
-                        self.y + margin + sq_h + spacing,
-                    ),
-                    (self.x + margin, self.y + margin),
-                    (self.x + margin + sq_w + spacing, self.y + margin),
-                ]
-                for i in range(4):
-                    Color(*colors[i])
-                    RoundedRectangle(pos=positions[i], size=(sq_w, sq_h), radius=[5])
-            else:
-                Color(*self.card_color)
-                d = self.width - 2 * CARD_MARGIN
-                Ellipse(pos=(self.center_x - d / 2, self.center_y - d / 2), size=(d, d))
-            if self.selected and not self.in_sidebar:
-                Color(0.8, 0.8, 0.8, self.selection_border_opacity)
-                Line(rectangle=(self.x, self.y, self.width, self.height), width=2)
+            self._rotate = Rotate(angle=self.angle, origin=self.center)
+            self._scale = Scale(self.scale_x, 1, 1, origin=self.center)
+            self._base_color = Color(1, 1, 1, 1)
+            self._base_rect = RoundedRectangle(radius=[10])
+            # جایگاه روی کارت: یکی از دو گروه ازپیش‌ساخته (رو یا پشت) در آن قرار می‌گیرد
+            self._side_slot = InstructionGroup()
+            self._border_color = Color(0.8, 0.8, 0.8, 0)
+            self._border_line = Line(rectangle=(0, 0, 0, 0), width=2)
             PopMatrix()
 
-    def animate_flip(self):
+        self._face_group = InstructionGroup()
+        self._face_rects = []
+        self._face_colors = []
+        for _ in range(4):
+            color = Color(1, 1, 1, 1)
+            self._face_group.add(color)
+            self._face_colors.append(color)
+            rect = RoundedRectangle(radius=[5])
+            self._face_group.add(rect)
+            self._face_rects.append(rect)
+
+        self._back_group = InstructionGroup()
+        self._back_color = Color(*self.card_color)
+        self._back_ellipse = Ellipse()
+        self._back_group.add(self._back_color)
+        self._back_group.add(self._back_ellipse)
+        self._shown_side = None
+
+    def _show_side(self, group):
+        if self._shown_side is not group:
+            if self._shown_side is not None:
+                self._side_slot.remove(self._shown_side)
+            self._side_slot.add(group)
+            self._shown_side = group
+
+    def _count_redraw(self):
+        frame = Clock.frames
+        if frame != self._redraw_frame:
+            self._redraw_frame = frame
+            self._frame_redraws = 0
+            self.redraw_frames += 1
+        self._frame_redraws += 1
+        self.redraw_count += 1
+        if self._frame_redraws > self.max_redraws_per_frame:
+            self.max_redraws_per_frame = self._frame_redraws
+
+    def redraw_stats(self):
+        """تعداد بازرسم‌های این کارت و میانگین/بیشینه بازرسم در هر فریم."""
+        return {
+            "redraws": self.redraw_count,
+            "frames": self.redraw_frames,
+            "per_frame_avg": self.redraw_count / float(self.redraw_frames or 1),
+            "per_frame_max": self.max_redraws_per_frame,
+        }
+
+    def update_canvas(self, *args):
+        self._count_redraw()
+        x, y = self.pos
+        w, h = self.size
+        center_point = (x + w / 2.0, y + h / 2.0)
+        self._rotate.angle = self.angle
+        self._rotate.origin = center_point
+        self._scale.x = self.scale_x
+        self._scale.origin = center_point
+        if self.in_sidebar:
+            self._base_color.rgba = (0.2, 0.2, 0.2, 1)
+        else:
+            self._base_color.rgba = (1, 1, 1, 1)
+        self._base_rect.pos = (x, y)
+        self._base_rect.size = (w, h)
+        if self.face_up:
+            margin = CARD_MARGIN
+            spacing = 2
+            sq_w = (w - 2 * margin - spacing) / 2.0
+            sq_h = (h - 2 * margin - spacing) / 2.0
+            # بالا-چپ، بالا-راست، پایین-راست، پایین-چپ (ترتیب face)
+            positions = (
+                (x + margin, y + margin + sq_h + spacing),
+                (x + margin + sq_w + spacing, y + margin + sq_h + spacing),
+                (x + margin + sq_w + spacing, y + margin),
+                (x + margin, y + margin),
+            )
+            for rect, color, rect_pos, quad in zip(
+                self._face_rects, self._face_colors, positions, self.face
+            ):
+                rect.pos = rect_pos
+                rect.size = (sq_w, sq_h)
+                color.rgba = FACE_COLORS[quad]
+            self._show_side(self._face_group)
+        else:
+            self._back_color.rgba = self.card_color
+            d = w - 2 * CARD_MARGIN
+            self._back_ellipse.pos = (center_point[0] - d / 2, center_point[1] - d / 2)
+            self._back_ellipse.size = (d, d)
+            self._show_side(self._back_group)
+        if self.selected and not self.in_sidebar:
+            self._border_color.a = self.selection_border_opacity
+        else:
+            self._border_color.a = 0
+        self._border_line.rectangle = (x, y, w, h)
+
+    def on_face_up(self, instance, value):
+        if self.board is not None:
+            self.board.set_face_up(self.card_id, value)
+
+    def on_angle(self, instance, value):
+        if self.board is not None:
+            self.board.set_turns(self.card_id, int(round(value / 90.0)))
+
+    def animate_flip(self, on_flipped=None):
+        """کارت را با انیمیشن پشت‌ورو می‌کند و در صورت شروع انیمیشن True برمی‌گرداند.
+
+        رو بودن کارت در میانه انیمیشن عوض می‌شود و همان لحظه on_flipped صدا زده
+        می‌شود؛ تا پایان انیمیشن درخواست flip دیگری پذیرفته نمی‌شود.
+        """
+        if self.flipping:
+            return False
+        self.flipping = True
         anim1 = Animation(scale_x=0, duration=0.15, t="out_quad")
 
         def flip_callback(*args):
             self.face_up = not self.face_up
+            if on_flipped is not None:
+                on_flipped()
 
-        anim1.bind(on_complete=lambda *x: flip_callback())
+        anim1.bind(on_complete=flip_callback)
         anim2 = Animation(scale_x=1, duration=0.15, t="out_quad")
+        anim2.bind(on_complete=self._end_flip)
         (anim1 + anim2).start(self)
-        if self.flip_sound:
-            self.flip_sound.play()
+        SOUND_BANK.play("flip")
+        return True
+
+    def _end_flip(self, *args):
+        self.flipping = False
+
+    def cancel_flip(self):
+        """انیمیشن flip نیمه‌کاره را بدون عوض کردن رو بودن کارت متوقف می‌کند."""
+        Animation.cancel_all(self, "scale_x")
+        self.scale_x = 1
+        self.flipping = False
 
     def animate_rotate(self, delta_angle=90):
         new_angle = (self.angle + delta_angle) % 360
         Animation(angle=new_angle, duration=0.2).start(self)
-        if self.rotate_sound:
-            self.rotate_sound.play()
+        SOUND_BANK.play("rotate")
 
-    # می‌توانید متدهای مشابهی برای return و reset هم اضافه کنید
     def play_return_sound(self):
-        if self.return_sound:
-            self.return_sound.play()
+        SOUND_BANK.play("return")
 
     def play_reset_sound(self):
-        if self.reset_sound:
-            self.reset_sound.play()
+        SOUND_BANK.play("reset")
 
     def play_drop_sound(self):
-        if self.drop_sound:
-            self.drop_sound.play()
+        SOUND_BANK.play("drop")
+
+    def start_drag(self, x, y):
+        """کشیدن کارت از نقطه (x، y) شروع می‌شود."""
+        self.touch_offset_x = self.center_x - x
+        self.touch_offset_y = self.center_y - y
+        self.dragging = True
+        # وضعیت پیش از کشیدن، برای ثبت حرکت در تاریخچه هنگام رها کردن
+        self._drag_state = self.game.card_state(self)
 
     def on_touch_down(self, touch):
         if self.collide_point(*touch.pos):
-            self.touch_offset_x = self.center_x - touch.x
-            self.touch_offset_y = self.center_y - touch.y
-            self.dragging = True
+            self.start_drag(*touch.pos)
             if not self.in_sidebar:
-                app = App.get_running_app()
-                current_screen = app.root.get_screen(app.root.current)
-                game_widget = current_screen.children[0]
-                for child in game_widget.main_section.children:
-                    if isinstance(child, CardWidget):
-                        child.selected = False
-                self.selected = True
-                game_widget.selected_card = self
+                self.game.select_card(self)
                 self.selection_border_opacity = 1
                 Animation(selection_border_opacity=0, duration=3).start(self)
-                cell = game_widget.main_section.get_cell_for_card(self)
-                if cell:
-                    cell["occupied"] = False
-                    cell["card"] = None
-                self.old_cell = cell
+                # خانه فعلی آزاد می‌شود و برای برگشت احتمالی نگه داشته می‌شود
+                self.old_cell = self.game.main_section.release_card(self)
             return True
         return super(CardWidget, self).on_touch_down(touch)
 
@@ -175,9 +324,7 @@ class CardWidget(Widget):
     def on_touch_up(self, touch):
         if self.dragging:
             self.dragging = False
-            app = App.get_running_app()
-            current_screen = app.root.get_screen(app.root.current)
-            game_widget = current_screen.children[0]
+            game_widget = self.game
 
             if self.in_sidebar:
                 # کارت در سایدبار است
@@ -202,28 +349,108 @@ class CardWidget(Widget):
                 # کارت در سکشن اصلی است
                 if game_widget.main_section.collide_point(*touch.pos):
                     snapped = game_widget.main_section.drop_card(self, touch.pos)
-                    if not snapped and self.old_cell:
-                        self.pos = self.old_cell["pos"]
-                        self.size = self.old_cell["size"]
-                        self.old_cell["occupied"] = True
-                        self.old_cell["card"] = self
+                    if not snapped and self.old_cell is not None:
+                        game_widget.main_section.place_card(self, self.old_cell)
                 else:
                     # از سکشن اصلی بیرون آمده → به خانه قبلی برگردد
-                    if self.old_cell:
-                        self.pos = self.old_cell["pos"]
-                        self.size = self.old_cell["size"]
-                        self.old_cell["occupied"] = True
-                        self.old_cell["card"] = self
+                    if self.old_cell is not None:
+                        game_widget.main_section.place_card(self, self.old_cell)
 
             self.old_cell = None
+            game_widget.record_move(MOVE, self, self._drag_state)
             if not self.in_sidebar:
-                self.selected = True
-                game_widget.selected_card = self
+                game_widget.select_card(self)
             return True
 
         return super(CardWidget, self).on_touch_up(touch)
 
 
+class CardViews(object):
+    """ویجت کارت‌ها به ترتیب شناسه کارت؛ هر ویجت اولین بار که لازم شود ساخته می‌شود.
+
+    factory(card_id, view) ویجت را از روی حالت کارت در مدل صفحه می‌سازد، یا اگر
+    view داده شود همان ویجت رهاشده را برای این کارت تنظیم می‌کند. سایدبار مجازی
+    ویجت کارت‌های برگشته را با release رها می‌کند؛ ویجت‌های رهاشده نه چیده می‌شوند
+    و نه رسم، و پیش از ساختن ویجت تازه دوباره به کار می‌روند.
+    """
+
+    def __init__(self, factory, count):
+        self.factory = factory
+        self.count = count
+        self.views = {}
+        self.pool = []
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, card_id):
+        view = self.views.get(card_id)
+        if view is None:
+            if not 0 <= card_id < self.count:
+                raise IndexError(card_id)
+            view = self.factory(card_id, self.pool.pop() if self.pool else None)
+            self.views[card_id] = view
+        return view
+
+    def __iter__(self):
+        for card_id in range(self.count):
+            yield self[card_id]
+
+    def get(self, card_id):
+        """ویجت ساخته‌شده کارت، یا None (بدون ساختن ویجت تازه)."""
+        return self.views.get(card_id)
+
+    def release(self, card_id):
+        view = self.views.pop(card_id, None)
+        if view is not None:
+            self.pool.append(view)
+
+    @property
+    def live(self):
+        """تعداد ویجت‌هایی که الان نمای یک کارت هستند (بدون ویجت‌های رهاشده)."""
+        return len(self.views)
+
+
+def make_text_button(text, font_size=40, **kwargs):
+    # هم‌رنگ آیکون‌های زرد بقیه دکمه‌های پنل
+    kwargs.setdefault("size_hint", (None, None))
+    kwargs.setdefault("size", (BUTTON_SIZE, BUTTON_SIZE))
+    return Button(
+        text=text,
+        font_size=font_size,
+        bold=True,
+        color=(0.15, 0.15, 0.15, 1),
+        background_normal="",
+        background_color=(1, 0.86, 0, 1),
+        **kwargs
+    )
+
+
+def make_hint_button():
+    return make_text_button("?", halign="center")
+
+
+def fit_button_panel(panel, max_size=BUTTON_SIZE):
+    """دکمه‌های مربعی پنل را تا جایی کوچک می‌کند که همه در عرض پنل جا شوند."""
+
+    def fit(*args):
+        buttons = panel.children
+        if not buttons:
+            return
+        free = (
+            panel.width
+            - panel.padding[0]
+            - panel.padding[2]
+            - panel.spacing * (len(buttons) - 1)
+        )
+        size = max(1, min(max_size, free / float(len(buttons))))
+        for button in buttons:
+            button.size = (size, size)
+
+    panel.bind(width=fit, children=fit)
+    fit()
+
+
 class SidebarRow(GridLayout):
     def __init__(self, row_color, **kwargs):
         super(SidebarRow, self).__init__(**kwargs)
@@ -244,11 +471,12 @@ class SidebarRow(GridLayout):
 
 
 class Sidebar(BoxLayout):
-    def __init__(self, show_logo=True, add_back_button=False, **kwargs):
+    def __init__(self, show_logo=True, add_back_button=False, add_history_buttons=False,
+                 **kwargs):
         super(Sidebar, self).__init__(**kwargs)
         self.orientation = "vertical"
         self.size_hint = (None, 1)
-        self.width = 420
+        self.width = kwargs.get("width", 420)
         self.padding = [20, 20, 20, 20]
         self.spacing = 15
         with self.canvas.before:
@@ -267,7 +495,10 @@ class Sidebar(BoxLayout):
             self.add_widget(self.logo)
 
         self.row_colors = []  # default empty; should be set externally
+        self.row_index = {}
         self.rows = []
+        # اندازه کارت‌های سایدبار؛ با layout_rows از فضای موجود محاسبه می‌شود
+        self.card_size = (CARD_SIZE, CARD_SIZE)
 
         # Button panel
         self.button_panel = BoxLayout(
@@ -278,26 +509,26 @@ class Sidebar(BoxLayout):
             padding=[10, 5, 10, 5],
         )
         self.flip_button = Button(
-            background_normal="assets/flip.png",
-            background_down="assets/flip_down.png",
+            background_normal=atlas_image("flip"),
+            background_down=atlas_image("flip_down"),
             size_hint=(None, None),
             size=(80, 80),
         )
         self.return_button = Button(
-            background_normal="assets/return.png",
-            background_down="assets/return_down.png",
+            background_normal=atlas_image("return"),
+            background_down=atlas_image("return_down"),
             size_hint=(None, None),
             size=(80, 80),
         )
         self.reset_button = Button(
-            background_normal="assets/reset.png",
-            background_down="assets/reset_down.png",
+            background_normal=atlas_image("reset"),
+            background_down=atlas_image("reset_down"),
             size_hint=(None, None),
             size=(80, 80),
         )
         self.rotate_button = Button(
-            background_normal="assets/rotate.png",
-            background_down="assets/rotate_down.png",
+            background_normal=atlas_image("rotate"),
+            background_down=atlas_image("rotate_down"),
             size_hint=(None, None),
             size=(80, 80),
         )
@@ -305,15 +536,33 @@ class Sidebar(BoxLayout):
         self.button_panel.add_widget(self.rotate_button)
         self.button_panel.add_widget(self.return_button)
         self.button_panel.add_widget(self.reset_button)
+        self.hint_button = make_hint_button()
+        self.button_panel.add_widget(self.hint_button)
+        self._hint_button_state = None
+        self._restore_hint_button = Clock.create_trigger(
+            self.restore_hint_button, NO_HINT_SECONDS
+        )
+        fit_button_panel(self.button_panel)
         self.add_widget(self.button_panel)
 
+        if add_history_buttons:
+            # undo/redo در یک ردیف بین پنل دکمه‌ها و دکمه برگشت
+            self.history_panel = BoxLayout(
+                orientation="horizontal", size_hint_y=None, height=44, spacing=15
+            )
+            self.undo_button = make_text_button("Undo", font_size=20, size_hint=(1, 1))
+            self.redo_button = make_text_button("Redo", font_size=20, size_hint=(1, 1))
+            self.history_panel.add_widget(self.undo_button)
+            self.history_panel.add_widget(self.redo_button)
+            self.add_widget(self.history_panel)
+
         if add_back_button:
             self.back_button = Button(
                 text="",
                 size_hint=(1, None),
                 height=50,
-                background_normal="assets/back.png",
-                background_down="assets/back_down.png",
+                background_normal=atlas_image("back"),
+                background_down=atlas_image("back_down"),
             )
             self.back_button.bind(
                 on_release=lambda x: setattr(
@@ -322,116 +571,543 @@ class Sidebar(BoxLayout):
             )
             self.add_widget(self.back_button)
 
+        self.bind(size=self.layout_rows)
+
+    def set_rows(self, row_colors, cards_per_row):
+        """ردیف‌های رنگی سایدبار را (بالای پنل دکمه‌ها) می‌سازد."""
+        for row in self.rows:
+            self.remove_widget(row)
+        self._set_row_colors(row_colors)
+        self.rows = []
+        # ردیف‌ها بالای پنل دکمه‌ها و دکمه برگشت قرار می‌گیرند
+        index = self.children.index(self.button_panel) + 1
+        for color in row_colors:
+            row = SidebarRow(row_color=color, cols=cards_per_row)
+            self.add_widget(row, index=index)
+            self.rows.append(row)
+        self.layout_rows()
+
+    def _set_row_colors(self, row_colors):
+        self.row_colors = row_colors
+        # رنگ (RGB) ← ایندکس ردیف، برای پیدا کردن ردیف هر کارت بدون مقایسه با همه رنگ‌ها
+        self.row_index = dict(
+            (tuple(color[:3]), i) for i, color in reversed(list(enumerate(row_colors)))
+        )
+
+    def attach_board(self, board, cards):
+        """کارت‌های بیرون از صفحه مدل را یکجا در ردیف‌هایشان می‌گذارد."""
+        self.return_cards([cards[card_id] for card_id in board.off_board()])
+
+    def layout_rows(self, *args):
+        """ارتفاع ردیف‌ها و اندازه کارت‌ها را یک‌بار از ابعاد سایدبار حساب می‌کند."""
+        if not self.rows:
+            return
+        fixed = self.padding[1] + self.padding[3] + self.spacing * (len(self.children) - 1)
+        for child in self.children:
+            if child not in self.rows:
+                fixed += child.height
+        row_height = max(1, min(ROW_HEIGHT, (self.height - fixed) / float(len(self.rows))))
+        per_row = self.rows[0].cols
+        row_padding = min(10, row_height / 8.0)
+        inner_width = self.width - self.padding[0] - self.padding[2] - 2 * row_padding
+        card = min(
+            CARD_SIZE,
+            row_height - 2 * row_padding,
+            (inner_width - row_padding * (per_row - 1)) / float(per_row),
+        )
+        card = max(1, card)
+        self.card_size = (card, card)
+        # کارت‌ها در عرض ردیف پخش می‌شوند
+        spacing = (inner_width - card * per_row) / (per_row - 1) if per_row > 1 else 0
+        for row in self.rows:
+            row.height = row_height
+            row.padding = [row_padding] * 4
+            row.spacing = [spacing, row_padding]
+            for card_widget in row.children:
+                card_widget.size = self.card_size
+
     def update_bg(self, *args):
-        self.canvas.before.clear()
-        with self.canvas.before:
-            Color(0.12, 0.12, 0.12, 1)
-            Rectangle(pos=self.pos, size=self.size)
+        self.bg_rect.pos = self.pos
+        self.bg_rect.size = self.size
+
+    def show_no_hint(self):
+        """دکمه راهنما را برای NO_HINT_SECONDS به حالت «راهنمایی نیست» می‌برد."""
+        button = self.hint_button
+        if self._hint_button_state is None:
+            self._hint_button_state = (button.text, button.font_size, button.background_color)
+        button.text = NO_HINT_TEXT
+        button.font_size = button.height * 0.25
+        button.background_color = NO_HINT_COLOR
+        self._restore_hint_button.cancel()
+        self._restore_hint_button()
+
+    def restore_hint_button(self, *args):
+        self._restore_hint_button.cancel()
+        if self._hint_button_state is None:
+            return
+        button = self.hint_button
+        button.text, button.font_size, button.background_color = self._hint_button_state
+        self._hint_button_state = None
 
     def get_row_index_for_card(self, card):
         """بر اساس رنگ کارت، ایندکس ردیفی که باید به آن اضافه شود را برمی‌گرداند."""
-        for i, color in enumerate(self.row_colors):
-            if card.card_color[:3] == color[:3]:
-                return i
-        return None
+        return self.row_index.get(tuple(card.card_color[:3]))
 
-    def add_card(self, card):
-        """اضافه کردن کارت به ردیف مرتبط با رنگ آن در سایدبار."""
+    def _move_to_row(self, card):
+        """کارت را بدون چیدن ردیف به ردیف رنگش منتقل می‌کند و ردیف را برمی‌گرداند."""
         row_index = self.get_row_index_for_card(card)
-        if row_index is not None and row_index < len(self.rows):
-            target_row = self.rows[row_index]
+        if row_index is None or row_index >= len(self.rows):
+            return None
+        target_row = self.rows[row_index]
 
-            # اگر کارت از قبل در همین ردیف نیست، ابتدا از والد فعلی حذف کن
-            if card.parent is not target_row:
-                if card.parent is not None:
-                    card.parent.remove_widget(card)
-
-            # حالا بدون مشکل کارت را اضافه می‌کنیم
+        # اگر کارت از قبل در همین ردیف نیست، ابتدا از والد فعلی حذف کن
+        if card.parent is not target_row:
+            if card.parent is not None:
+                card.parent.remove_widget(card)
             target_row.add_widget(card)
-            card.in_sidebar = True
-            card.face_up = True
+        card.size = self.card_size
+        card.in_sidebar = True
+        card.face_up = True
+        return target_row
 
+    def add_card(self, card):
+        """اضافه کردن کارت به ردیف مرتبط با رنگ آن در سایدبار."""
+        target_row = self._move_to_row(card)
+        if target_row is not None:
             # برای اطمینان از بروزرسانی آنی، یکبار layout را اجرا می‌کنیم
             target_row.do_layout()
 
+    def return_cards(self, cards):
+        """چند کارت را یکجا به ردیف‌هایشان برمی‌گرداند.
+
+        هر ردیف تغییرکرده فقط یک‌بار و پیش از فریم بعد چیده می‌شود.
+        """
+        touched = {}
+        for card in cards:
+            target_row = self._move_to_row(card)
+            if target_row is not None:
+                touched[id(target_row)] = target_row
+        for target_row in touched.values():
+            target_row._trigger_layout()
+
+
+class SidebarRowView(RecycleDataViewBehavior, Widget):
+    """یک ردیف سایدبار مجازی: رنگ ردیف، یک کارت نمونه و تعداد کارت‌های باقی‌مانده."""
+
+    row_color = ListProperty([1, 1, 1, 1])
+    count = NumericProperty(0)
+    card_size = NumericProperty(CARD_SIZE)
+    sidebar = ObjectProperty(None, allownone=True)
+
+    def __init__(self, **kwargs):
+        super(SidebarRowView, self).__init__(**kwargs)
+        self.row_index = 0
+        with self.canvas.before:
+            self._row_color = Color(*self.row_color)
+            self._rect = RoundedRectangle(radius=[15])
+        # کارت نمونه به هیچ مدلی وصل نیست و لمس آن را خود ردیف می‌گیرد
+        self.preview = CardWidget()
+        self.count_label = Label(
+            bold=True,
+            halign="left",
+            valign="middle",
+            outline_width=2,
+            outline_color=(0, 0, 0, 1),
+        )
+        self.add_widget(self.preview)
+        self.add_widget(self.count_label)
+        self.bind(
+            pos=self.update_view,
+            size=self.update_view,
+            row_color=self.update_view,
+            card_size=self.update_view,
+            count=self.update_count,
+        )
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.row_index = index
+        return super(SidebarRowView, self).refresh_view_attrs(rv, index, data)
+
+    def update_view(self, *args):
+        x, y = self.pos
+        w, h = self.size
+        padding = min(10, h / 8.0)
+        card = self.card_size
+        self._row_color.rgba = self.row_color
+        self._rect.pos = self.pos
+        self._rect.size = self.size
+        self.preview.size = (card, card)
+        self.preview.pos = (x + padding, y + (h - card) / 2.0)
+        label = self.count_label
+        label.pos = (x + card + 2 * padding, y)
+        label.size = (max(1, w - card - 3 * padding), h)
+        label.text_size = label.size
+        label.font_size = min(28, h * 0.45)
+        self.update_count()
+
+    def update_count(self, *args):
+        self.preview.opacity = 1 if self.count else 0.35
+        self.count_label.text = u"\u00d7 %d" % self.count
+
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos):
+            return False
+        if self.count and self.sidebar is not None:
+            self.sidebar.pick_card(self.row_index, *self.to_window(*touch.pos))
+        return True
+
+
+class VirtualSidebar(Sidebar):
+    """سایدبار صفحه‌های بزرگ: ردیف‌ها نماهای بازیافتی یک RecycleView هستند.
+
+    هر ردیف فقط یک کارت نمونه و تعداد کارت‌های باقی‌مانده آن رنگ را نشان می‌دهد و
+    کارت‌های بیرون از صفحه ویجتی ندارند. با لمس یک ردیف ویجت یکی از کارت‌های آن
+    رنگ ساخته و زیر انگشت کشیده می‌شود؛ کارتی که به سایدبار برگردد دوباره رها
+    می‌شود. تعداد ویجت‌ها و هزینه چیدمان سایدبار به اندازه صفحه بستگی ندارد.
+    """
+
+    def __init__(self, **kwargs):
+        super(VirtualSidebar, self).__init__(**kwargs)
+        self.board = None
+        self.cards = None
+        self.counts = []
+        # کارت‌هایی که از سایدبار برداشته شده‌اند و هنوز کشیده می‌شوند
+        self.held = set()
+        # اسکرول فقط با نوار کناری (و چرخ ماوس)؛ لمس ردیف‌ها بی‌درنگ کارت برمی‌دارد
+        self.row_list = RecycleView(
+            size_hint=(1, 1),
+            do_scroll_x=False,
+            do_scroll_y=False,
+            scroll_type=["bars"],
+            bar_width=10,
+        )
+        row_layout = RecycleBoxLayout(
+            orientation="vertical",
+            size_hint=(1, None),
+            default_size=(None, ROW_HEIGHT),
+            default_size_hint=(1, None),
+            spacing=10,
+        )
+        row_layout.bind(minimum_height=row_layout.setter("height"))
+        self.row_list.add_widget(row_layout)
+        # viewclass مال layout_manager است و فقط پس از اضافه شدن آن ثبت می‌شود
+        self.row_list.viewclass = SidebarRowView
+        # تغییرات یک فریم (ریست، بازیابی) در یک شمارش جمع می‌شوند
+        self._trigger_counts = Clock.create_trigger(self.update_counts, -1)
+
+    def set_rows(self, row_colors, cards_per_row):
+        """یک ردیف بازیافتی برای هر رنگ (بالای پنل دکمه‌ها) می‌سازد."""
+        self._set_row_colors(row_colors)
+        self.counts = [cards_per_row] * len(row_colors)
+        if self.row_list.parent is None:
+            index = self.children.index(self.button_panel) + 1
+            self.add_widget(self.row_list, index=index)
+        self.layout_rows()
+
+    def attach_board(self, board, cards):
+        """تعداد کارت‌های هر ردیف از این پس از روی مدل صفحه شمرده می‌شود."""
+        if self.board is not None and self._cell_changed in self.board.watchers:
+            self.board.watchers.remove(self._cell_changed)
+        self.board = board
+        self.cards = cards
+        self.held = set()
+        board.watchers.append(self._cell_changed)
+        self.update_counts()
+
+    def _cell_changed(self, index):
+        self._trigger_counts()
+
+    def update_counts(self, *args):
+        board = self.board
+        if board is None:
+            return
+        off_board = board.cell == OFF_BOARD
+        self.held = set(card_id for card_id in self.held if off_board[card_id])
+        counts = np.bincount(board.back_color[off_board], minlength=len(self.row_colors))
+        for card_id in self.held:
+            counts[board.back_color[card_id]] -= 1
+        counts = counts.tolist()
+        # فقط ردیف‌هایی که تعدادشان عوض شده به‌روز می‌شوند (بدون بازسازی همه نماها)
+        data = self.row_list.data
+        adapter = self.row_list.view_adapter
+        for index, count in enumerate(counts):
+            if count == self.counts[index]:
+                continue
+            if index < len(data):
+                data[index]["count"] = count
+                view = adapter.get_visible_view(index)
+                if view is not None:
+                    view.count = count
+        self.counts = counts
+
+    def _update_data(self):
+        self.row_list.data = [
+            {"row_color": color, "count": count, "card_size": self.card_size[0], "sidebar": self}
+            for color, count in zip(self.row_colors, self.counts)
+        ]
+
+    def layout_rows(self, *args):
+        """ارتفاع ردیف‌ها و اندازه کارت‌ها؛ اگر همه ردیف‌ها جا نشوند فهرست اسکرول می‌شود."""
+        if not self.row_colors:
+            return
+        fixed = self.padding[1] + self.padding[3] + self.spacing * (len(self.children) - 1)
+        for child in self.children:
+            if child is not self.row_list:
+                fixed += child.height
+        available = max(1, self.height - fixed)
+        n_rows = len(self.row_colors)
+        spacing = self.row_list.layout_manager.spacing
+        row_height = min(ROW_HEIGHT, (available - spacing * (n_rows - 1)) / float(n_rows))
+        row_height = max(MIN_ROW_HEIGHT, row_height)
+        card = max(1, min(CARD_SIZE, row_height - 2 * min(10, row_height / 8.0)))
+        self.card_size = (card, card)
+        self.row_list.layout_manager.default_size = (None, row_height)
+        self.row_list.do_scroll_y = row_height * n_rows + spacing * (n_rows - 1) > available
+        self._update_data()
+
+    def pick_card(self, row_index, x, y):
+        """یکی از کارت‌های بیرون از صفحه ردیف row_index را در نقطه (x، y) پنجره
+        می‌سازد و کشیدنش را شروع می‌کند؛ کارت یا None را برمی‌گرداند."""
+        window = self.get_root_window()
+        board = self.board
+        if window is None or board is None:
+            return None
+        candidates = np.flatnonzero((board.cell == OFF_BOARD) & (board.back_color == row_index))
+        card_id = next((c for c in candidates.tolist() if c not in self.held), None)
+        if card_id is None:
+            return None
+        card = self.cards[card_id]
+        self.held.add(card_id)
+        card.size = self.card_size
+        card.in_sidebar = True
+        card.face_up = True
+        card.center = (x, y)
+        # کارت کشیده‌شده روی همه ویجت‌ها و بیرون از ناحیه بریده‌شده فهرست ردیف‌ها است
+        if card.parent is not None:
+            card.parent.remove_widget(card)
+        window.add_widget(card)
+        card.start_drag(x, y)
+        self._trigger_counts()
+        return card
+
+    def add_card(self, card):
+        """کارت به شمارش ردیفش برمی‌گردد و ویجتش رها می‌شود."""
+        if card.parent is not None:
+            card.parent.remove_widget(card)
+        card.in_sidebar = True
+        card.face_up = True
+        self.held.discard(card.card_id)
+        if self.cards is not None:
+            self.cards.release(card.card_id)
+        self._trigger_counts()
+
+    def return_cards(self, cards):
+        for card in cards:
+            self.add_card(card)
+
 
 class MainSection(FloatLayout):
     grid_size = ListProperty([None, None])
+    # همه خانه‌ها پر و همه لبه‌ها جور
+    solved = BooleanProperty(False)
 
     def __init__(self, **kwargs):
         grid_size = kwargs.pop("grid_size", [None, None])
         super(MainSection, self).__init__(**kwargs)
         self.grid_size = grid_size
-        self.cells = []
-        self.bind(size=self.setup_cells, pos=self.setup_cells)
-
-    def setup_cells(self, *args):
-        self.canvas.before.clear()
-        self.cells = []
+        # پس‌زمینه و قاب صفحه یک‌بار ساخته می‌شوند و فقط جا و اندازه‌شان عوض می‌شود
         with self.canvas.before:
             Color(0.95, 0.95, 0.95, 1)
-            Rectangle(pos=self.pos, size=self.size)
-            cell_size = min(
-                self.width / self.grid_size[0], self.height / self.grid_size[1]
-            )
-            grid_width = cell_size * self.grid_size[0]
-            grid_height = cell_size * self.grid_size[1]
-            start_x = self.x + (self.width - grid_width) / 2
-            start_y = self.y + (self.height - grid_height) / 2
-            Color(0.7, 0.7, 0.7, 1)
-            Line(rectangle=(start_x, start_y, grid_width, grid_height), width=2)
-        cell_size = min(self.width / self.grid_size[0], self.height / self.grid_size[1])
-        grid_width = cell_size * self.grid_size[0]
-        grid_height = cell_size * self.grid_size[1]
+            self._bg_rect = Rectangle(pos=self.pos, size=self.size)
+            self._frame_color = Color(*FRAME_COLOR)
+            self._frame_line = Line(rectangle=(0, 0, 0, 0), width=2)
+        # لبه‌های ناجور روی کارت‌ها کشیده می‌شوند؛ هر لبه یک نوار که فقط وقتی
+        # حالت همان لبه عوض شود اضافه یا حذف می‌شود
+        with self.canvas.after:
+            Color(*CONFLICT_COLOR)
+            self._conflicts = InstructionGroup()
+        self._conflict_rects = {}
+        self.validator = None
+        self._trigger_conflicts = Clock.create_trigger(self.update_conflicts, -1)
+        # ویجت‌ها نمای مدل هستند؛ تا وقتی attach_board صدا زده نشود مدل خالی است
+        self.card_views = []
+        self.attach_board(BoardModel(self.grid_size[0], self.grid_size[1], []), [], [])
+        # تغییرات پشت‌سرهم اندازه و مکان (تغییر اندازه پنجره، چرخش، تمام‌صفحه)
+        # در یک محاسبه هندسه پیش از فریم بعد جمع می‌شوند
+        self._trigger_setup_cells = Clock.create_trigger(self.setup_cells, -1)
+        self.bind(size=self._trigger_setup_cells, pos=self._trigger_setup_cells)
+
+    def setup_cells(self, *args):
+        """هندسه خانه‌ها را حساب می‌کند و کارت‌های روی صفحه را در همان خانه‌هایشان جابه‌جا می‌کند."""
+        cols, rows = self.grid_size
+        cell_size = min(self.width / cols, self.height / rows)
+        grid_width = cell_size * cols
+        grid_height = cell_size * rows
         start_x = self.x + (self.width - grid_width) / 2
         start_y = self.y + (self.height - grid_height) / 2
-        for row in range(self.grid_size[1]):
-            for col in range(self.grid_size[0]):
-                cell_pos = (start_x + col * cell_size, start_y + row * cell_size)
-                cell_dict = {
-                    "pos": cell_pos,
-                    "size": (cell_size, cell_size),
-                    "occupied": False,
-                    "card": None,
-                }
-                self.cells.append(cell_dict)
-
-    def get_cell_for_card(self, card):
-        for cell in self.cells:
-            if cell["card"] == card:
-                return cell
-        return None
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
+        self._frame_line.rectangle = (start_x, start_y, grid_width, grid_height)
+        self.grid.set_geometry(start_x, start_y, cell_size)
+        # کارت‌های قرارگرفته در خانه‌های خودشان می‌مانند و فقط جابه‌جا می‌شوند
+        for index, card_id in self.grid.placed():
+            card = self.card_views[card_id]
+            card.size = (cell_size, cell_size)
+            card.pos = self.grid.cell_pos(index)
+        for edge, rect in self._conflict_rects.items():
+            rect.pos, rect.size = self._edge_rect(edge)
+
+    def attach_board(self, board, cards, card_set):
+        """مدل صفحه و ویجت کارت‌ها (به ترتیب شناسه کارت) را به این سکشن وصل می‌کند.
+
+        card_set کارت‌های solver.Card مرحله برای بررسی لبه‌ها است.
+        """
+        self.board = board
+        self.card_views = cards
+        # هندسه و اشغال خانه‌ها (خانه←کارت و کارت←خانه) فقط از طریق این ایندکس تغییر می‌کند
+        self.grid = CellGrid(board)
+        # حالت لبه‌ها با هر تغییر خانه در مدل به‌روز می‌شود
+        if self.validator is not None:
+            self.validator.detach()
+        self._conflicts.clear()
+        self._conflict_rects = {}
+        self.validator = EdgeValidator(board, card_set, on_change=self._trigger_conflicts)
+        self._trigger_conflicts()
+
+    def _edge_rect(self, edge):
+        """(pos، size) نوار باریک روی لبه؛ Rectangle از Line با ضخامت ارزان‌تر ساخته می‌شود."""
+        a, b, horizontal = self.validator.edge_cells[edge]
+        x, y = self.grid.cell_pos(b)
+        size = self.grid.cell_size
+        half = CONFLICT_WIDTH / 2.0
+        if horizontal:
+            # لبه بین خانه و خانه راستش: نوار عمودی در سمت چپ خانه راست
+            return (x - half, y), (CONFLICT_WIDTH, size)
+        return (x, y - half), (size, CONFLICT_WIDTH)
+
+    def update_conflicts(self, *args):
+        """نوار لبه‌هایی که از فریم قبل ناجور یا جور شده‌اند اضافه یا حذف می‌شود."""
+        validator = self.validator
+        states = validator.states
+        for edge in validator.pop_dirty():
+            rect = self._conflict_rects.get(edge)
+            if states[edge] == MISMATCH:
+                if rect is None:
+                    pos, size = self._edge_rect(edge)
+                    rect = Rectangle(pos=pos, size=size)
+                    self._conflict_rects[edge] = rect
+                    self._conflicts.add(rect)
+            elif rect is not None:
+                self._conflicts.remove(rect)
+                del self._conflict_rects[edge]
+        self.solved = validator.complete
+        self._frame_color.rgba = SOLVED_FRAME_COLOR if self.solved else FRAME_COLOR
+
+    @property
+    def is_laid_out(self):
+        return self.grid.cell_size > 0
+
+    def cell_of(self, card):
+        """ایندکس خانه‌ای که کارت در آن است (یا None)."""
+        return self.grid.slot_of(card.card_id)
+
+    def card_at(self, row, col):
+        card_id = self.grid.card_at(row, col)
+        return None if card_id is None else self.card_views[card_id]
+
+    def is_free(self, index):
+        return self.grid.is_free(index)
+
+    def release_card(self, card):
+        """کارت را از خانه‌اش آزاد می‌کند (بدون حذف ویجت) و ایندکس خانه را برمی‌گرداند."""
+        return self.grid.remove(card.card_id)
 
     def drop_card(self, card, drop_pos):
-        best_cell = None
-        best_dist = None
-        for cell in self.cells:
-            if not cell["occupied"]:
-                cx = cell["pos"][0] + cell["size"][0] / 2.0
-                cy = cell["pos"][1] + cell["size"][1] / 2.0
-                dist = ((drop_pos[0] - cx) ** 2 + (drop_pos[1] - cy) ** 2) ** 0.5
-                if best_dist is None or dist < best_dist:
-                    best_dist = dist
-                    best_cell = cell
-        if best_cell:
-            best_cell["occupied"] = True
-            best_cell["card"] = card
-            if card.parent != self:
-                self.add_widget(card)
-            card.size = best_cell["size"]
-            card.pos = best_cell["pos"]
-            from kivy.app import App
-
-            app = App.get_running_app()
-            for child in self.children:
-                if isinstance(child, CardWidget):
-                    child.selected = False
-            card.selected = True
-            app.root.selected_card = card
+        """کارت را در نزدیک‌ترین خانه آزاد می‌گذارد (انتخاب کارت با کنترلر بازی است)."""
+        index = self.grid.nearest_free(drop_pos[0], drop_pos[1])
+        if index is not None:
+            self.place_card(card, index)
             return True
         return False
 
+    def place_card(self, card, index):
+        """کارت را مستقیماً در خانه با ایندکس داده‌شده قرار می‌دهد."""
+        self.grid.place(card.card_id, index)
+        if card.parent is not self:
+            if card.parent is not None:
+                card.parent.remove_widget(card)
+            self.add_widget(card)
+        card.in_sidebar = False
+        card.size = (self.grid.cell_size, self.grid.cell_size)
+        card.pos = self.grid.cell_pos(index)
+
     def reset(self):
-        for cell in self.cells:
-            cell["occupied"] = False
-            cell["card"] = None
+        with self.validator.suspended():
+            self.grid.return_all()
+
+
+def capture_board_state(game):
+    """یک کپی از مدل صفحه بازی برمی‌گرداند."""
+    return game.board.copy()
+
+
+def restore_board_state(game, state):
+    """ویجت‌های بازی را در یک گذر مطابق مدل ذخیره‌شده می‌چیند.
+
+    کارت‌های روی صفحه مستقیم در خانه‌هایشان قرار می‌گیرند و بقیه یکجا به سایدبار
+    برمی‌گردند؛ چیدمان ردیف‌ها و سکشن اصلی فقط یک‌بار پیش از فریم بعد انجام می‌شود.
+    اگر مدل ذخیره‌شده مال این مرحله نباشد چیزی تغییر نمی‌کند و False برمی‌گردد.
+    """
+    board = game.board
+    if (state.cols, state.rows) != (board.cols, board.rows) or (
+        state.back_color.tolist() != board.back_color.tolist()
+    ):
+        return False
+    main_section = game.main_section
+    if not main_section.is_laid_out:
+        main_section.setup_cells()
+    game.select_card(None)
+    cards = main_section.card_views
+    returning = [cards[card_id] for card_id in state.off_board() if board.cell[card_id] != OFF_BOARD]
+    # حالت لبه‌ها یک‌بار در پایان و به صورت برداری حساب می‌شود
+    with main_section.validator.suspended():
+        main_section.reset()
+        for card_id in range(board.n_cards):
+            turns = int(state.turns[card_id])
+            face_up = bool(state.face_up[card_id])
+            card = cards.get(card_id)
+            if card is None:
+                # کارت سایدبار مجازی ویجت ندارد؛ ویجت بعدی از مدل ساخته می‌شود
+                board.set_turns(card_id, turns)
+                board.set_face_up(card_id, face_up)
+            else:
+                card.cancel_flip()
+                card.angle = turns * 90
+                card.face_up = face_up
+        for index, card_id in state.placed():
+            main_section.place_card(cards[card_id], index)
+        game.sidebar.return_cards(returning)
+    return True
+
+
+def apply_hint(game, hint):
+    """کارت پیشنهادی راهنما را با چرخش و طرف مناسب در خانه‌اش می‌گذارد و انتخاب می‌کند.
+
+    اگر راهنمایی نباشد دکمه راهنما حالت «راهنمایی نیست» را نشان می‌دهد.
+    """
+    if hint is None:
+        game.sidebar.show_no_hint()
+        return
+    main_section = game.main_section
+    if not main_section.is_free(hint.cell):
+        return
+    card = main_section.card_views[hint.card]
+    if main_section.cell_of(card) is not None:
+        return
+    old_state = game.card_state(card)
+    card.angle = hint.turns * 90
+    card.face_up = hint.face_up
+    main_section.place_card(card, hint.cell)
+    game.record_move(HINT, card, old_state)
+    game.select_card(card)
+    card.play_drop_sound()
@@ -0,0 +1,282 @@
+# game.py
+from kivy.animation import Animation
+from kivy.core.window import Window
+from kivy.logger import Logger
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.screenmanager import Screen
+
+from board import OFF_BOARD, BoardModel
+from components import (
+    CardViews,
+    CardWidget,
+    Sidebar,
+    VirtualSidebar,
+    MainSection,
+    apply_hint,
+    restore_board_state,
+)
+from hint import HINT_ENGINE
+from levels import LEVELS_BY_NAME, card_back_colors, cards_per_color, level_cards
+from move_log import FLIP, ROTATE, RETURN, RESET, MoveLog
+from profiler import PROFILER
+from savegame import decode_board, encode_board, load_board, save_board, save_path
+
+# کلیدهای undo (Ctrl+Z) و redo (Ctrl+Y یا Ctrl+Shift+Z)
+UNDO_KEY = 122
+REDO_KEY = 121
+# مرحله‌هایی با کارت‌های بیشتر از این تعداد سایدبار مجازی (یک ردیف شمارنده برای
+# هر رنگ به جای یک ویجت برای هر کارت) دارند
+VIRTUAL_SIDEBAR_CARDS = 64
+
+
+class Game(BoxLayout):
+    """بازی NxN که از روی یک مرحله جدول LEVELS ساخته می‌شود.
+
+    virtual_sidebar=None یعنی سایدبار مجازی فقط برای مرحله‌های بزرگ‌تر از
+    VIRTUAL_SIDEBAR_CARDS کارت.
+    """
+
+    def __init__(self, level, virtual_sidebar=None, **kwargs):
+        super(Game, self).__init__(**kwargs)
+        self.level = level
+        self.orientation = "horizontal"
+        self.size_hint = (1, 1)
+
+        # سکشن اصلی با ابعاد مرحله
+        self.main_section = MainSection(
+            size_hint=(1, 1), grid_size=[level.cols, level.rows]
+        )
+
+        if virtual_sidebar is None:
+            virtual_sidebar = level.cols * level.rows > VIRTUAL_SIDEBAR_CARDS
+        sidebar_class = VirtualSidebar if virtual_sidebar else Sidebar
+        # سایدبار با پنل دکمه‌ها و دکمه برگشت؛ ردیف‌ها بالای پنل اضافه می‌شوند
+        self.sidebar = sidebar_class(
+            show_logo=False,
+            add_back_button=True,
+            add_history_buttons=True,
+            size_hint=(None, 1),
+            width=level.sidebar_width,
+        )
+        self.add_widget(self.main_section)
+        self.add_widget(self.sidebar)
+
+        self.sidebar.set_rows(level.row_colors, cards_per_color(level))
+
+        # مدل صفحه بازی؛ ویجت کارت‌ها (به ترتیب ردیف‌های سایدبار) نمای آن هستند و
+        # هرکدام اولین بار که لازم شود ساخته می‌شود
+        self.board = BoardModel(level.cols, level.rows, card_back_colors(level))
+        # روی کارت‌ها (solver.Card)؛ برای هر مرحله یک چیدمان جور وجود دارد
+        self.card_set = level_cards(level)
+        self.all_cards = CardViews(self._make_card, self.board.n_cards)
+        self.main_section.attach_board(self.board, self.all_cards, self.card_set)
+        self.sidebar.attach_board(self.board, self.all_cards)
+
+        # تنها کارت انتخاب‌شده بازی (انتخاب فقط از طریق select_card عوض می‌شود)
+        self.selected_card = None
+        # تاریخچه حرکت‌ها برای undo/redo
+        self.moves = MoveLog()
+
+        # اتصال دکمه‌های سایدبار
+        self.sidebar.flip_button.bind(on_press=self.flip_selected)
+        self.sidebar.return_button.bind(on_press=self.return_selected)
+        self.sidebar.rotate_button.bind(on_press=self.rotate_selected)
+        self.sidebar.reset_button.bind(on_press=self.reset_main_section)
+        self.sidebar.hint_button.bind(on_press=self.show_hint)
+        self.sidebar.undo_button.bind(on_press=self.undo)
+        self.sidebar.redo_button.bind(on_press=self.redo)
+
+    def _make_card(self, card_id, card=None):
+        """ویجت کارت card_id با حالت فعلی آن در مدل صفحه (در صورت وجود، روی ویجت رهاشده card)."""
+        board = self.board
+        if card is None:
+            card = CardWidget()
+        else:
+            # تا تنظیم شدن حالت تازه، ویجت به مدل وصل نیست تا کارت قبلی را تغییر ندهد
+            Animation.cancel_all(card)
+            card.board = None
+            card.dragging = False
+            card.flipping = False
+            card.selected = False
+            card.scale_x = 1
+            card.selection_border_opacity = 0
+        card.card_color = self.level.row_colors[int(board.back_color[card_id])]
+        card.face = self.card_set[card_id].face
+        card.angle = int(board.turns[card_id]) * 90
+        card.face_up = bool(board.face_up[card_id])
+        card.in_sidebar = bool(board.cell[card_id] == OFF_BOARD)
+        card.card_id = card_id
+        card.board = board
+        card.game = self
+        return card
+
+    def select_card(self, card):
+        """کارت انتخاب‌شده را عوض می‌کند؛ فقط کارت قبلی و کارت تازه تغییر می‌کنند."""
+        previous = self.selected_card
+        if previous is not None and previous is not card:
+            previous.selected = False
+        self.selected_card = card
+        if card is not None:
+            card.selected = True
+
+    def card_state(self, card):
+        """(خانه یا OFF_BOARD، ربع‌چرخش، رو بودن) کارت در مدل صفحه."""
+        card_id = card.card_id
+        board = self.board
+        return int(board.cell[card_id]), int(board.turns[card_id]), bool(board.face_up[card_id])
+
+    def record_move(self, kind, card, old_state, new_state=None):
+        """تغییر یک کارت را در تاریخچه ثبت می‌کند (اگر چیزی عوض شده باشد)."""
+        if new_state is None:
+            new_state = self.card_state(card)
+        if new_state == old_state:
+            return
+        self.moves.record(
+            kind,
+            card.card_id,
+            old_state[0],
+            new_state[0],
+            old_state[1],
+            new_state[1],
+            old_state[2],
+            new_state[2],
+        )
+
+    def flip_selected(self, instance):
+        card = self.selected_card
+        if card:
+            old_state = self.card_state(card)
+            # رو بودن کارت در میانه انیمیشن عوض می‌شود و حرکت همان لحظه با وضعیت
+            # واقعی کارت ثبت می‌شود؛ undo پیش از آن انیمیشن را لغو می‌کند
+            card.animate_flip(lambda: self.record_move(FLIP, card, old_state))
+
+    def rotate_selected(self, instance):
+        if not self.selected_card:
+            return
+        old_state = self.card_state(self.selected_card)
+        old_angle = self.selected_card.angle
+        new_angle = (old_angle + 90) % 360
+        new_angle = round(new_angle / 90) * 90
+        self.selected_card.angle = new_angle
+        self.record_move(ROTATE, self.selected_card, old_state)
+
+    def _return_all_cards(self):
+        self.select_card(None)
+        # همه کارت‌ها یکجا برمی‌گردند؛ هر ردیف سایدبار فقط یک‌بار چیده می‌شود و
+        # حالت لبه‌ها فقط یک‌بار در پایان حساب می‌شود
+        with self.main_section.validator.suspended():
+            self.sidebar.return_cards(
+                [child for child in self.main_section.children if isinstance(child, CardWidget)]
+            )
+            self.main_section.reset()
+
+    def reset_main_section(self, instance):
+        if self.board.placed():
+            # undo ریست وضعیت فشرده صفحه پیش از آن را یکجا بازمی‌گرداند
+            self.moves.record(RESET, snapshot=encode_board(self.board, self.card_set))
+        self._return_all_cards()
+
+    def return_selected(self, instance):
+        card = self.selected_card
+        if card is None or card.parent is not self.main_section:
+            return
+        old_state = self.card_state(card)
+        self.select_card(None)
+        self.main_section.release_card(card)
+        self.main_section.remove_widget(card)
+        card.in_sidebar = True
+        self.sidebar.add_card(card)
+        self.record_move(RETURN, card, old_state)
+
+    def _set_card_state(self, card, cell, turns, face_up):
+        # انیمیشن flip نیمه‌کاره نباید بعداً رو بودن کارت را دوباره عوض کند
+        card.cancel_flip()
+        if cell == OFF_BOARD:
+            if self.selected_card is card:
+                self.select_card(None)
+            if card.parent is self.main_section:
+                self.main_section.release_card(card)
+                self.main_section.remove_widget(card)
+            self.sidebar.add_card(card)
+        else:
+            self.main_section.place_card(card, cell)
+            self.select_card(card)
+        card.angle = turns * 90
+        card.face_up = face_up
+
+    def undo(self, instance=None):
+        step = self.moves.undo()
+        if step is None:
+            return
+        move, snapshot = step
+        if move.kind == RESET:
+            # رکوردهای اجراشده از یک فایل (replay.py) وضعیت پیش از ریست را ندارند
+            if snapshot is not None:
+                restore_board_state(self, decode_board(snapshot, self.card_set))
+        else:
+            self._set_card_state(
+                self.all_cards[move.card], move.old_cell, move.old_turns, move.old_face_up
+            )
+
+    def redo(self, instance=None):
+        step = self.moves.redo()
+        if step is None:
+            return
+        move, snapshot = step
+        if move.kind == RESET:
+            self._return_all_cards()
+        else:
+            self._set_card_state(
+                self.all_cards[move.card], move.new_cell, move.new_turns, move.new_face_up
+            )
+
+    def show_hint(self, instance):
+        HINT_ENGINE.request(self.board, self.card_set, lambda hint: apply_hint(self, hint))
+
+
+class GameScreen(Screen):
+    """صفحه بازی؛ مرحله از روی نام صفحه در جدول LEVELS پیدا می‌شود."""
+
+    def __init__(self, level=None, virtual_sidebar=None, **kwargs):
+        super(GameScreen, self).__init__(**kwargs)
+        self.game = Game(level or LEVELS_BY_NAME[self.name], virtual_sidebar=virtual_sidebar)
+        self.add_widget(self.game)
+
+    def on_enter(self):
+        # پنل پروفایلر (F12 یا سه ضربه در گوشه بالا-چپ) فقط روی صفحه‌های بازی
+        PROFILER.attach(self)
+        Window.bind(on_key_down=self._on_key_down)
+
+    def on_leave(self):
+        PROFILER.detach(self)
+        Window.unbind(on_key_down=self._on_key_down)
+        self.save_game()
+
+    def _on_key_down(self, window, key, scancode, codepoint, modifiers):
+        if "ctrl" not in modifiers:
+            return False
+        if key == UNDO_KEY and "shift" not in modifiers:
+            self.game.undo()
+        elif key == REDO_KEY or key == UNDO_KEY:
+            self.game.redo()
+        else:
+            return False
+        return True
+
+    def save_game(self, path=None):
+        """وضعیت صفحه را در فایل ذخیره این مرحله می‌نویسد."""
+        try:
+            path = path or save_path(self.name)
+            save_board(self.game.board, self.game.card_set, path)
+        except (OSError, RuntimeError) as e:
+            Logger.warning("GameScreen: cannot save %s (%s)" % (self.name, e))
+
+
+def load_saved_board(name, cards, path=None):
+    """مدل ذخیره‌شده یک مرحله با کارت‌های cards، یا None اگر فایلی نباشد یا خوانا نباشد."""
+    try:
+        path = path or save_path(name)
+        return load_board(path, cards)
+    except (OSError, RuntimeError, ValueError) as e:
+        Logger.warning("GameScreen: ignoring saved %s (%s)" % (name, e))
+        return None
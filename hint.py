@@ -0,0 +1,248 @@
+# hint.py
+"""راهنمای حرکت بعدی.
+
+حل‌کننده در یک پردازه جدا اجرا می‌شود تا حلقه اصلی Kivy هیچ‌وقت منتظر آن نماند.
+هر درخواست یک شماره نسل دارد؛ با تغییر صفحه یا درخواست تازه، شماره نسل مشترک
+بالا می‌رود و پردازه جستجوی کهنه را رها می‌کند. نتیجه‌ها بر اساس کارت‌های روی
+صفحه کش می‌شوند و با Clock در نخ اصلی تحویل داده می‌شوند.
+
+اگر کارت‌های فعلی صفحه به هیچ جواب کاملی نرسند، راهنما از سازگاری محلی ساخته
+می‌شود: یک خانه خالی و یک کارت آزاد (با چرخش و طرف) که ربع‌هایش با همه همسایه‌های
+گذاشته‌شده جور باشند. None یعنی هیچ کارت آزادی در هیچ خانه خالی جور نمی‌شود.
+"""
+import multiprocessing
+import queue
+from collections import OrderedDict, namedtuple
+
+from kivy.clock import Clock
+
+from solver import Solver, edges, oriented_quadrants
+
+# تعداد وضعیت‌های صفحه که راهنمایشان نگه داشته می‌شود
+HINT_CACHE_SIZE = 64
+# فاصله بررسی پاسخ پردازه راهنما (فقط وقتی درخواستی در جریان است)
+POLL_INTERVAL = 1 / 30.0
+
+Hint = namedtuple("Hint", "card cell turns face_up")
+
+
+def fixed_placements(board):
+    """کارت‌های روی صفحه به صورت (خانه، کارت، چرخش، رو بودن)؛ کلید کش راهنما."""
+    return tuple(
+        (index, card, int(board.turns[card]), bool(board.face_up[card]))
+        for index, card in board.placed()
+    )
+
+
+def local_hint(cards, cols, rows, fixed):
+    """کارت آزادی که در یک خانه خالی با همه همسایه‌های گذاشته‌شده‌اش جور است، یا None.
+
+    خانه‌هایی که همسایه گذاشته‌شده بیشتری دارند زودتر امتحان می‌شوند و در هر خانه
+    روی کارت‌ها پیش از پشتشان.
+    """
+    placed = dict(
+        (index, edges(oriented_quadrants(cards[card], turns, face_up)))
+        for index, card, turns, face_up in fixed
+    )
+    used = set(card for _, card, _, _ in fixed)
+    free_cards = [card for card in range(len(cards)) if card not in used]
+
+    def neighbours(index):
+        # (خانه همسایه، لبه این خانه، لبه روبه‌روی همسایه) به ترتیب چپ، راست، پایین، بالا
+        row, col = divmod(index, cols)
+        if col > 0:
+            yield index - 1, 0, 1
+        if col + 1 < cols:
+            yield index + 1, 1, 0
+        if row > 0:
+            yield index - cols, 2, 3
+        if row + 1 < rows:
+            yield index + cols, 3, 2
+
+    free_cells = []
+    for index in range(cols * rows):
+        if index in placed:
+            continue
+        touching = [
+            (side, placed[other][other_side])
+            for other, side, other_side in neighbours(index)
+            if other in placed
+        ]
+        free_cells.append((-len(touching), index, touching))
+    free_cells.sort()
+    for _, index, touching in free_cells:
+        for face_up in (True, False):
+            for card in free_cards:
+                for turns in range(4):
+                    card_edges = edges(oriented_quadrants(cards[card], turns, face_up))
+                    if all(card_edges[side] == edge for side, edge in touching):
+                        return Hint(card, index, turns, face_up)
+    return None
+
+
+def compute_hint(cards, cols, rows, fixed, should_stop=None):
+    """جای‌گذاری بعدی که با کارت‌های ثابت یک جواب کامل می‌سازد.
+
+    اگر چنین جوابی نباشد (یا جستجو متوقف شود) local_hint برگردانده می‌شود.
+    """
+    solver = Solver(cards, cols, rows)
+    prefix = []
+    used = set()
+    for index, card, turns, face_up in fixed:
+        v = solver.variant_for(card, turns, face_up)
+        if v is None:
+            return local_hint(cards, cols, rows, fixed)
+        prefix.append((index, v))
+        used.add(card)
+    if solver.solve(should_stop=should_stop, prefix=prefix) is None:
+        return local_hint(cards, cols, rows, fixed)
+    fixed_cells = set(index for index, _ in prefix)
+    # اولین خانه‌ای که جستجو پر کرده (محدودترین خانه کنار کارت‌های فعلی)
+    for index, v in solver.assignment.items():
+        if index in fixed_cells:
+            continue
+        for card in solver.type_cards[solver.variant_type[v]]:
+            if card not in used:
+                turns = (solver.variant_turns[v] + solver.card_offset[card]) % 4
+                return Hint(card, index, turns, solver.variant_face_up[v])
+    return None
+
+
+def _hint_worker(requests, replies, generation):
+    # اگر برنامه بدون بستن موتور راهنما بسته شود، پردازه نباید یتیم بماند
+    parent = multiprocessing.parent_process()
+    while True:
+        try:
+            job = requests.get(timeout=1)
+        except queue.Empty:
+            if parent is not None and not parent.is_alive():
+                return
+            continue
+        if job is None:
+            return
+        job_generation, key, fixed, cards, cols, rows = job
+
+        def stale():
+            return generation.value != job_generation or (
+                parent is not None and not parent.is_alive()
+            )
+
+        if stale():
+            continue
+        hint = compute_hint(cards, cols, rows, fixed, stale)
+        if not stale():
+            replies.put((key, hint))
+
+
+class HintEngine(object):
+    """درخواست راهنما از نخ اصلی و تحویل نتیجه با Clock، بدون مسدود کردن UI."""
+
+    def __init__(self, cache_size=HINT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self._generation = multiprocessing.Value("i", 0)
+        self._requests = None
+        self._replies = None
+        self._process = None
+        # درخواست در جریان: (نسل، صفحه، کارت‌ها، کلید کش، callback)
+        self._pending = None
+        self._poll_event = None
+
+    def _cache_key(self, board, cards, fixed):
+        return (board.cols, board.rows, tuple(cards), fixed)
+
+    def _ensure_worker(self):
+        if self._process is not None and self._process.is_alive():
+            return
+        self._requests = multiprocessing.Queue()
+        self._replies = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_hint_worker,
+            args=(self._requests, self._replies, self._generation),
+            daemon=True,
+        )
+        self._process.start()
+
+    def _bump_generation(self):
+        with self._generation.get_lock():
+            self._generation.value += 1
+            return self._generation.value
+
+    def request(self, board, cards, callback):
+        """راهنمای وضعیت فعلی board را (فوری از کش یا بعداً با Clock) به callback می‌دهد.
+
+        cards کارت‌های solver.Card مرحله به ترتیب شناسه کارت است (levels.level_cards).
+        """
+        fixed = fixed_placements(board)
+        key = self._cache_key(board, cards, fixed)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            callback(self.cache[key])
+            return
+        pending = self._pending
+        if pending is not None and pending[1] is board and pending[3] == key:
+            self._pending = pending[:4] + (callback,)
+            return
+        self.cancel()
+        generation = self._bump_generation()
+        self._ensure_worker()
+        self._requests.put((generation, key, fixed, cards, board.cols, board.rows))
+        self._pending = (generation, board, cards, key, callback)
+        if self._poll_event is None:
+            self._poll_event = Clock.schedule_interval(self._poll, POLL_INTERVAL)
+
+    def cancel(self, board=None):
+        """درخواست در جریان (یا فقط درخواست مربوط به board) را لغو می‌کند."""
+        pending = self._pending
+        if pending is None or (board is not None and pending[1] is not board):
+            return
+        self._pending = None
+        self._bump_generation()
+        self._stop_polling()
+
+    def _stop_polling(self):
+        if self._poll_event is not None:
+            self._poll_event.cancel()
+            self._poll_event = None
+
+    def _store(self, key, hint):
+        self.cache[key] = hint
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _poll(self, dt):
+        pending = self._pending
+        if pending is None:
+            self._stop_polling()
+            return False
+        generation, board, cards, key, callback = pending
+        # صفحه از زمان درخواست تغییر کرده → جستجو بی‌فایده است
+        if self._cache_key(board, cards, fixed_placements(board)) != key:
+            self.cancel()
+            return False
+        while True:
+            try:
+                reply_key, hint = self._replies.get_nowait()
+            except queue.Empty:
+                return
+            self._store(reply_key, hint)
+            if reply_key == key:
+                self._pending = None
+                self._stop_polling()
+                callback(hint)
+                return False
+
+    def close(self):
+        self.cancel()
+        if self._process is not None:
+            if self._process.is_alive():
+                self._requests.put(None)
+                self._process.join(1)
+                if self._process.is_alive():
+                    self._process.terminate()
+            self._process = None
+
+
+# موتور سراسری راهنما (یک پردازه مشترک برای همه بازی‌ها)
+HINT_ENGINE = HintEngine()
@@ -0,0 +1,111 @@
+# levels.py
+import json
+import zlib
+from collections import namedtuple
+
+from solver import BACK_COLOR_BASE, Card, default_colors, random_puzzle
+
+# رنگ‌های پشت کارت و ردیف‌های سایدبار
+RED = [1, 0, 0, 1]
+YELLOW = [1, 1, 0, 1]
+GREEN = [0, 1, 0, 1]
+BLUE = [0, 0, 1, 1]
+BROWN = [0.59, 0.29, 0, 1]
+GRAY = [0.5, 0.5, 0.5, 1]
+ORANGE = [1, 0.5, 0, 1]
+PINK = [1, 0.75, 0.8, 1]
+PURPLE = [0.5, 0, 0.5, 1]
+CYAN = [0, 1, 1, 1]
+WHITE = [1, 1, 1, 1]
+DARK_GREEN = [0, 0.5, 0, 1]
+
+FOUR_COLORS = [RED, YELLOW, GREEN, BLUE]
+NINE_COLORS = [BLUE, RED, YELLOW, GREEN, BROWN, GRAY, ORANGE, PINK, PURPLE]
+TWELVE_COLORS = NINE_COLORS + [CYAN, WHITE, DARK_GREEN]
+
+# هر مرحله: نام صفحه، عنوان دکمه لانچر، ابعاد صفحه، رنگ ردیف‌های سایدبار
+# (تعداد کارت‌های هر رنگ = تعداد خانه‌ها / تعداد رنگ‌ها)، رنگ دکمه لانچر، عرض سایدبار
+# و کارت‌های ازپیش‌ساخته (None یعنی کارت‌های ثابت level_cards)
+Level = namedtuple(
+    "Level", "name title cols rows row_colors button_color sidebar_width cards",
+    defaults=(None,),
+)
+
+LEVELS = [
+    Level("game_2x2", "Beginner's Grid", 2, 2, FOUR_COLORS, RED, 420),
+    Level("game_3x3", "Simple Challenge", 3, 3, NINE_COLORS, YELLOW, 350),
+    Level("game_4x4", "Smart Squares", 4, 4, FOUR_COLORS, GREEN, 420),
+    Level("game_6x6", "Ultimate Challenge", 6, 6, NINE_COLORS, BLUE, 420),
+    Level("game_8x8", "Expert Board", 8, 8, NINE_COLORS[:8], ORANGE, 420),
+    Level("game_10x10", "Master Board", 10, 10, TWELVE_COLORS[:10], PURPLE, 460),
+    Level("game_12x12", "Grandmaster Board", 12, 12, TWELVE_COLORS, GRAY, 500),
+]
+
+LEVELS_BY_NAME = dict((level.name, level) for level in LEVELS)
+
+
+def cards_per_color(level):
+    """تعداد کارت‌های هر رنگ (هر ردیف سایدبار)."""
+    n_cells = level.cols * level.rows
+    if n_cells % len(level.row_colors):
+        raise ValueError(
+            "%s: %d cells cannot be split over %d colors"
+            % (level.name, n_cells, len(level.row_colors))
+        )
+    return n_cells // len(level.row_colors)
+
+
+def card_back_colors(level):
+    """رنگ پشت هر کارت (ایندکس ردیف سایدبار) به ترتیب شناسه کارت‌ها."""
+    per_row = cards_per_color(level)
+    return [color for color in range(len(level.row_colors)) for _ in range(per_row)]
+
+
+def level_cards(level, seed=None, n_colors=None):
+    """کارت‌های مرحله (solver.Card) به ترتیب شناسه کارت.
+
+    روی کارت‌ها از یک شبکه رنگی بریده می‌شوند، پس همیشه یک چیدمان جور (همه کارت‌ها
+    رو) وجود دارد؛ پشت هر کارت یکدست و به رنگ ردیف سایدبارش است. بدون seed کارت‌های
+    level.cards، یا کارت‌های ثابتی که از نام مرحله ساخته می‌شوند، برگردانده می‌شوند.
+    """
+    if seed is None:
+        if level.cards is not None:
+            return list(level.cards)
+        seed = zlib.crc32(level.name.encode("ascii"))
+    if n_colors is None:
+        n_colors = default_colors(level.cols, level.rows)
+    faces = random_puzzle(level.cols, level.rows, n_colors=n_colors, n_back_colors=1, seed=seed)
+    back_base = max(BACK_COLOR_BASE, n_colors)
+    return [
+        Card(card.face, (back_base + color,) * 4)
+        for card, color in zip(faces, card_back_colors(level))
+    ]
+
+
+def load_puzzle(path, index=0):
+    """پازل شماره index فایل puzzle_generator.py به صورت یک Level قابل بازی.
+
+    نام مرحله از مرحله پایه و شناسه پازل ساخته می‌شود تا ذخیره هر پازل جدا باشد.
+    اگر ابعاد یا رنگ پشت کارت‌ها با مرحله پایه نخواند ValueError می‌دهد.
+    """
+    with open(path) as f:
+        for line_no, line in enumerate(f):
+            if line_no == index:
+                break
+        else:
+            raise ValueError("%s: no puzzle %d" % (path, index))
+    puzzle = json.loads(line)
+    base = LEVELS_BY_NAME.get(puzzle.get("level"))
+    if base is None:
+        raise ValueError("%s: puzzle %d has no known level" % (path, index))
+    cards = tuple(Card(tuple(face), tuple(back)) for face, back in puzzle["cards"])
+    # پشت‌ها یکدست‌اند و رنگ ردیف اول سایدبار کمترین شماره را دارد
+    back_base = min(card.back[0] for card in cards)
+    backs = [card.back[0] - back_base if len(set(card.back)) == 1 else None for card in cards]
+    if (puzzle["cols"], puzzle["rows"]) != (base.cols, base.rows) or backs != card_back_colors(base):
+        raise ValueError("%s: puzzle %d does not fit %s" % (path, index, base.name))
+    return base._replace(
+        name="%s_%s" % (base.name, puzzle["key"][:8]),
+        title="%s #%d" % (base.title, index + 1),
+        cards=cards,
+    )
@@ -5,6 +5,7 @@ from kivy.uix.anchorlayout import AnchorLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from kivy.uix.image import Image
+from kivy.uix.progressbar import ProgressBar
 from kivy.uix.button import Button
 from kivy.clock import Clock
 from kivy.animation import Animation
@@ -12,11 +13,24 @@ from kivy.uix.widget import Widget
 from kivy.uix.floatlayout import FloatLayout
 from kivy.graphics import Color, Rectangle, RoundedRectangle
 from kivy.core.window import Window
+from kivy.logger import Logger
 from kivy.properties import ListProperty, NumericProperty
-from game_2x2 import Game2x2Screen
-from game_3x3 import Game3x3Screen
-from game_4x4 import Game4x4Screen
-from game_6x6 import Game6x6Screen
+import argparse
+import math
+from collections import OrderedDict
+from functools import partial
+from asset_loader import AssetLoader, atlas_image
+from hint import HINT_ENGINE
+from components import capture_board_state, restore_board_state
+from game import GameScreen, load_saved_board
+from levels import LEVELS, load_puzzle
+
+# صفحه‌های بازی فقط در اولین ورود ساخته می‌شوند (نام صفحه ← سازنده‌ای که با name=
+# صدا زده می‌شود و یک GameScreen برمی‌گرداند)
+GAME_SCREENS = dict((level.name, GameScreen) for level in LEVELS)
+
+# حداکثر تعداد صفحه‌های بازی که هم‌زمان زنده می‌مانند
+MAX_LIVE_GAME_SCREENS = 2
 
 
 class RoundedButton(Button):
@@ -27,23 +41,30 @@ class RoundedButton(Button):
         super(RoundedButton, self).__init__(**kwargs)
         self.background_normal = ""
         self.background_color = (0, 0, 0, 0)
+        # پس‌زمینه گرد یک‌بار ساخته می‌شود و فقط مقادیرش به‌روز می‌شوند
+        with self.canvas.before:
+            self._bg_color = Color(*self.bg_color)
+            self._bg_rect = RoundedRectangle(
+                pos=self.pos, size=self.size, radius=[self.corner_radius]
+            )
         self.bind(
             pos=self._update_canvas,
             size=self._update_canvas,
+            corner_radius=self._update_canvas,
             bg_color=self._on_bg_color,
         )
         self._on_bg_color(self, self.bg_color)
 
     def _on_bg_color(self, instance, value):
+        self._bg_color.rgba = value
         r, g, b, _ = value
         lum = 0.299 * r + 0.587 * g + 0.114 * b
         self.color = [0, 0, 0, 1] if lum > 0.5 else [1, 1, 1, 1]
 
     def _update_canvas(self, *args):
-        self.canvas.before.clear()
-        with self.canvas.before:
-            Color(*self.bg_color)
-            RoundedRectangle(pos=self.pos, size=self.size, radius=[self.corner_radius])
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
+        self._bg_rect.radius = [self.corner_radius]
 
 
 class LauncherScreen(Screen):
@@ -55,12 +76,8 @@ class LauncherScreen(Screen):
         # پس‌زمینه: یک رنگ ثابت + تصویر cover
         with root.canvas.before:
             Color(0.15, 0.15, 0.15, 1)
-            self.bg_rect = Rectangle(pos=root.pos, size=Window.size)
-        root.bind(
-            pos=lambda inst, val: setattr(
-                self, "bg_rect", Rectangle(pos=inst.pos, size=inst.size)
-            )
-        )
+            self.bg_rect = Rectangle(pos=root.pos, size=root.size)
+        root.bind(pos=self.update_bg, size=self.update_bg)
         cover = Image(
             source="assets/cover.jpg",
             allow_stretch=True,
@@ -81,8 +98,8 @@ class LauncherScreen(Screen):
             anchor_x="right", anchor_y="top", size_hint=(1, None), height=120
         )
         exit_btn = Button(
-            background_normal="assets/exit.png",
-            background_down="assets/exit_down.png",
+            background_normal=atlas_image("exit"),
+            background_down=atlas_image("exit_down"),
             size_hint=(None, None),
             size=(100, 100),
             text="",
@@ -107,66 +124,32 @@ class LauncherScreen(Screen):
         logo_box.add_widget(logo_anchor)
         main_layout.add_widget(logo_box)
 
-        # گرید دکمه‌های بازی
+        # گرید دکمه‌های بازی (یک دکمه برای هر مرحله جدول LEVELS)
+        cols = 2 if len(LEVELS) <= 4 else int(math.ceil(len(LEVELS) / 2.0))
+        rows = int(math.ceil(len(LEVELS) / float(cols)))
         grid_anchor = AnchorLayout(size_hint=(1, 0.5))
-        grid = GridLayout(cols=2, spacing=20, size_hint=(None, None), size=(550, 550))
-        grid_anchor.add_widget(grid)
-
-        btn_2x2 = RoundedButton(
-            text="Beginner's Grid",
-            bg_color=[1, 0, 0, 1],
-            size_hint=(None, None),
-            size=(250, 250),
-            corner_radius=20,
-        )
-        btn_2x2.bind(
-            on_release=lambda x: setattr(
-                App.get_running_app().root, "current", "game_2x2"
-            )
-        )
-        grid.add_widget(btn_2x2)
-
-        btn_4x4 = RoundedButton(
-            text="Smart Squares",
-            bg_color=[0, 1, 0, 1],
+        grid = GridLayout(
+            cols=cols,
+            spacing=20,
             size_hint=(None, None),
-            size=(250, 250),
-            corner_radius=20,
-        )
-        btn_4x4.bind(
-            on_release=lambda x: setattr(
-                App.get_running_app().root, "current", "game_4x4"
-            )
+            size=(cols * 250 + (cols + 1) * 20, rows * 250 + (rows + 1) * 20),
         )
-        grid.add_widget(btn_4x4)
+        grid_anchor.add_widget(grid)
 
-        btn_3x3 = RoundedButton(
-            text="Simple Challenge",
-            bg_color=[1, 1, 0, 1],
-            size_hint=(None, None),
-            size=(250, 250),
-            corner_radius=20,
-        )
-        btn_3x3.bind(
-            on_release=lambda x: setattr(
-                App.get_running_app().root, "current", "game_3x3"
+        for level in LEVELS:
+            button = RoundedButton(
+                text=level.title,
+                bg_color=level.button_color,
+                size_hint=(None, None),
+                size=(250, 250),
+                corner_radius=20,
             )
-        )
-        grid.add_widget(btn_3x3)
-
-        btn_6x6 = RoundedButton(
-            text="Ultimate Challenge",
-            bg_color=[0, 0, 1, 1],
-            size_hint=(None, None),
-            size=(250, 250),
-            corner_radius=20,
-        )
-        btn_6x6.bind(
-            on_release=lambda x: setattr(
-                App.get_running_app().root, "current", "game_6x6"
+            button.bind(
+                on_release=lambda x, name=level.name: setattr(
+                    App.get_running_app().root, "current", name
+                )
             )
-        )
-        grid.add_widget(btn_6x6)
+            grid.add_widget(button)
         main_layout.add_widget(grid_anchor)
 
         # فوتر (پایین صفحه)
@@ -179,23 +162,142 @@ class LauncherScreen(Screen):
         root.add_widget(main_layout)
         self.add_widget(root)
 
+    def update_bg(self, instance, value):
+        self.bg_rect.pos = instance.pos
+        self.bg_rect.size = instance.size
+
+
+class SplashScreen(Screen):
+    """صفحه شروع بدون هیچ تصویری تا فوراً نمایش داده شود؛ پیشرفت بارگذاری دارایی‌ها را نشان می‌دهد."""
+
+    def __init__(self, **kwargs):
+        super(SplashScreen, self).__init__(**kwargs)
+        with self.canvas.before:
+            Color(0.15, 0.15, 0.15, 1)
+            self.bg_rect = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self.update_bg, size=self.update_bg)
+
+        layout = BoxLayout(
+            orientation="vertical",
+            spacing=20,
+            size_hint=(0.5, None),
+            height=140,
+            pos_hint={"center_x": 0.5, "center_y": 0.5},
+        )
+        layout.add_widget(Label(text="TipTop", font_size=48, bold=True))
+        self.progress = ProgressBar(max=1, value=0, size_hint_y=None, height=20)
+        layout.add_widget(self.progress)
+        self.add_widget(layout)
+
     def update_bg(self, *args):
         self.bg_rect.pos = self.pos
         self.bg_rect.size = self.size
 
+    def set_progress(self, done, total):
+        self.progress.max = max(1, total)
+        self.progress.value = done
+
+
+class LazyScreenManager(ScreenManager):
+    """صفحه‌های بازی را هنگام اولین ورود می‌سازد و صفحه‌های بی‌استفاده را (LRU) آزاد می‌کند."""
+
+    def __init__(self, factories=None, max_live_screens=MAX_LIVE_GAME_SCREENS, **kwargs):
+        self.factories = dict(GAME_SCREENS if factories is None else factories)
+        self.max_live_screens = max(1, max_live_screens)
+        self.saved_states = {}
+        self._recent = OrderedDict()
+        super(LazyScreenManager, self).__init__(**kwargs)
+
+    def _build_screen(self, name):
+        screen = self.factories[name](name=name)
+        # وضعیت و تاریخچه صفحه‌ای که در همین اجرا آزاد شده، وگرنه فایل ذخیره مرحله
+        # (فایل ذخیره فقط وضعیت صفحه را دارد)
+        state, moves = self.saved_states.pop(name, (None, None))
+        if state is None:
+            state = load_saved_board(name, screen.game.card_set)
+        if state is not None:
+            if not restore_board_state(screen.game, state):
+                Logger.warning("LazyScreenManager: saved board does not match %s" % name)
+            elif moves is not None:
+                screen.game.moves = moves
+        self.add_widget(screen)
+        return screen
+
+    def _evict_idle_screens(self):
+        busy = (self.current_screen, self.transition.screen_out)
+        for name in list(self._recent):
+            if len(self._recent) <= self.max_live_screens:
+                break
+            if not self.has_screen(name):
+                del self._recent[name]
+                continue
+            screen = self.get_screen(name)
+            if screen in busy:
+                continue
+            # وضعیت صفحه و تاریخچه undo/redo آن را نگه می‌داریم و صفحه را کاملاً آزاد
+            # می‌کنیم؛ MoveLog به ویجت‌ها ارجاعی ندارد
+            self.saved_states[name] = (capture_board_state(screen.game), screen.game.moves)
+            HINT_ENGINE.cancel(screen.game.board)
+            self.remove_widget(screen)
+            del self._recent[name]
+
+    def on_current(self, instance, value):
+        if value in self.factories and not self.has_screen(value):
+            self._build_screen(value)
+        super(LazyScreenManager, self).on_current(instance, value)
+        if value in self.factories:
+            self._recent.pop(value, None)
+            self._recent[value] = True
+            self._evict_idle_screens()
+
 
 class TipTopApp(App):
+    def __init__(self, puzzle=None, **kwargs):
+        # مرحله ساخته‌شده از یک پازل puzzle_generator.py که بعد از لانچر باز می‌شود
+        self.puzzle = puzzle
+        super(TipTopApp, self).__init__(**kwargs)
+
     def build(self):
         Window.fullscreen = "auto"
-        sm = ScreenManager(transition=FadeTransition())
+        # اول صفحه شروع؛ تصاویر و صداها در پس‌زمینه decode می‌شوند و لانچر وقتی
+        # دارایی‌های خودش آماده شد جایگزین می‌شود (دارایی‌های بازی پشت آن ادامه می‌یابند)
+        sm = LazyScreenManager(transition=FadeTransition())
+        splash = SplashScreen(name="splash")
+        sm.add_widget(splash)
+        sm.current = "splash"
+        self.assets = AssetLoader()
+        self.assets.start(on_progress=splash.set_progress, on_ready=self.show_launcher)
+        return sm
+
+    def show_launcher(self):
+        # فقط لانچر در شروع ساخته می‌شود؛ صفحه‌های بازی هنگام ورود ساخته می‌شوند
+        sm = self.root
         sm.add_widget(LauncherScreen(name="launcher"))
-        sm.add_widget(Game2x2Screen(name="game_2x2"))
-        sm.add_widget(Game3x3Screen(name="game_3x3"))
-        sm.add_widget(Game4x4Screen(name="game_4x4"))
-        sm.add_widget(Game6x6Screen(name="game_6x6"))
         sm.current = "launcher"
-        return sm
+        if self.puzzle is not None:
+            sm.factories[self.puzzle.name] = partial(GameScreen, level=self.puzzle)
+            sm.current = self.puzzle.name
+        splash = sm.get_screen("splash")
+        Clock.schedule_once(lambda dt: sm.remove_widget(splash), sm.transition.duration + 0.1)
+
+    def on_stop(self):
+        # on_leave هنگام بستن برنامه صدا زده نمی‌شود
+        screen = self.root.current_screen
+        if isinstance(screen, GameScreen):
+            screen.save_game()
+        self.assets.stop()
+        HINT_ENGINE.close()
+
+
+def main(argv=None):
+    # آرگومان‌های برنامه بعد از -- می‌آیند (قبل از آن مال Kivy است)
+    parser = argparse.ArgumentParser(description="TipTop game")
+    parser.add_argument("--puzzle", help="JSON Lines file written by puzzle_generator.py")
+    parser.add_argument("--index", type=int, default=0, help="puzzle number in the file")
+    args = parser.parse_args(argv)
+    puzzle = load_puzzle(args.puzzle, args.index) if args.puzzle else None
+    TipTopApp(puzzle=puzzle).run()
 
 
 if __name__ == "__main__":
-    TipTopApp().run()
+    main()
@@ -0,0 +1,117 @@
+# move_log.py
+"""تاریخچه حرکت‌ها برای undo/redo.
+
+هر حرکت یک رکورد با عرض ثابت در یک آرایه حلقوی NumPy است: نوع حرکت، کارت و
+مقدار قبلی و بعدی خانه، چرخش و رو بودن آن. undo مقدارهای قبلی را برمی‌گرداند و
+redo مقدارهای بعدی را، بدون کپی گرفتن از ویجت‌ها. ریست صفحه تنها حرکتی است که
+چند کارت را تغییر می‌دهد؛ رکورد آن به وضعیت فشرده صفحه پیش از ریست (savegame)
+اشاره می‌کند. وقتی آرایه پر شود قدیمی‌ترین رکوردها (و وضعیت‌هایشان) دور ریخته
+می‌شوند، پس حافظه محدود می‌ماند.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# تعداد حرکت‌هایی که نگه داشته می‌شوند
+MOVE_LOG_SIZE = 4096
+
+# نوع حرکت‌ها
+FLIP, ROTATE, MOVE, RETURN, HINT, RESET = range(6)
+
+MOVE_DTYPE = np.dtype([
+    ("kind", np.uint8),
+    ("card", np.int16),
+    ("old_cell", np.int16),
+    ("new_cell", np.int16),
+    ("old_turns", np.uint8),
+    ("new_turns", np.uint8),
+    ("old_face_up", np.bool_),
+    ("new_face_up", np.bool_),
+])
+
+Move = namedtuple("Move", MOVE_DTYPE.names)
+
+
+class MoveLog(object):
+    """آرایه حلقوی حرکت‌ها با مکان‌نمای undo.
+
+    شماره حرکت‌ها (seq) همیشه افزایشی است و خانه هر حرکت seq % size است.
+    حرکت‌های [start, cursor) قابل undo و [cursor, end) قابل redo هستند.
+    """
+
+    def __init__(self, size=MOVE_LOG_SIZE):
+        self.size = max(1, size)
+        self.records = np.zeros(self.size, dtype=MOVE_DTYPE)
+        # وضعیت فشرده صفحه پیش از هر ریست، بر اساس seq رکورد ریست
+        self.snapshots = {}
+        self.start = 0
+        self.cursor = 0
+        self.end = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    @property
+    def can_undo(self):
+        return self.cursor > self.start
+
+    @property
+    def can_redo(self):
+        return self.cursor < self.end
+
+    def clear(self):
+        self.snapshots.clear()
+        self.start = self.cursor = self.end = 0
+
+    def record(self, kind, card=-1, old_cell=-1, new_cell=-1, old_turns=0, new_turns=0,
+               old_face_up=True, new_face_up=True, snapshot=None):
+        """یک حرکت تازه ثبت می‌کند؛ حرکت‌های قابل redo دور ریخته می‌شوند."""
+        for seq in range(self.cursor, self.end):
+            self.snapshots.pop(seq, None)
+        seq = self.cursor
+        self.records[seq % self.size] = (
+            kind, card, old_cell, new_cell, old_turns, new_turns, old_face_up, new_face_up,
+        )
+        if snapshot is not None:
+            self.snapshots[seq] = snapshot
+        self.cursor = self.end = seq + 1
+        if self.end - self.start > self.size:
+            self.snapshots.pop(self.start, None)
+            self.start += 1
+
+    def applied(self):
+        """رکوردهای حرکت‌های انجام‌شده (قابل undo) به ترتیب، به صورت یک آرایه تازه."""
+        return self.records[np.arange(self.start, self.cursor) % self.size]
+
+    def load(self, records):
+        """رکوردها را جایگزین تاریخچه می‌کند؛ همه به صورت قابل redo (برای اجرای دوباره)."""
+        records = np.asarray(records, dtype=MOVE_DTYPE)
+        self.size = max(self.size, len(records))
+        self.records = np.zeros(self.size, dtype=MOVE_DTYPE)
+        self.records[:len(records)] = records
+        self.snapshots.clear()
+        self.start = self.cursor = 0
+        self.end = len(records)
+
+    def _move(self, seq):
+        return Move(*self.records[seq % self.size].item())
+
+    def undo(self):
+        """حرکتی که باید برگردانده شود (و وضعیت ذخیره‌شده‌اش)، یا None."""
+        if not self.can_undo:
+            return None
+        self.cursor -= 1
+        return self._move(self.cursor), self.snapshots.get(self.cursor)
+
+    def redo(self):
+        """حرکتی که باید دوباره انجام شود، یا None."""
+        if not self.can_redo:
+            return None
+        self.cursor += 1
+        return self._move(self.cursor - 1), self.snapshots.get(self.cursor - 1)
+
+    def peek_redo(self):
+        """حرکتی که redo بعدی انجام می‌دهد، بدون جلو بردن مکان‌نما، یا None."""
+        if not self.can_redo:
+            return None
+        return self._move(self.cursor)
@@ -0,0 +1,220 @@
+# parallel_solver.py
+"""حل موازی پازل روی چند پردازه.
+
+درخت جستجو از روی اولین جای‌گذاری‌ها به زیردرخت‌ها (پیشوندها) شکسته می‌شود و
+زیردرخت‌ها از یک صف مشترک بین پردازه‌ها پخش می‌شوند؛ هر پردازه بیکار کار بعدی
+را برمی‌دارد. زیردرختی که در بودجه گره‌اش تمام نشود با بودجه دو برابر و ترتیب
+تصادفی تازه به ته صف برمی‌گردد (مثل شروع دوباره در Solver.solve)؛ اگر صف از
+تعداد پردازه‌ها کوتاه‌تر باشد به زیردرخت‌های کوچک‌تر شکسته می‌شود تا پردازه‌های
+بیکار هم سهمی از آن بردارند. اولین جوابی که پیدا شود بقیه پردازه‌ها را متوقف می‌کند.
+
+تعداد پردازه‌ها به تعداد هسته‌ها محدود است؛ با یک پردازه یا صفحه‌های کوچک (که
+هزینه راه‌اندازی پردازه‌ها از زمان حل بیشتر است) همان Solver.solve اجرا می‌شود.
+"""
+import argparse
+import multiprocessing
+import queue
+import random
+import time
+
+from solver import Solver, check_solution, default_colors, random_puzzle
+
+# تعداد زیردرخت‌های اولیه به ازای هر پردازه
+TASKS_PER_WORKER = 8
+# بودجه گره اولیه هر زیردرخت و ضریب افزایش آن در هر بار برگشت به صف
+TASK_BUDGET = 2000
+TASK_BUDGET_GROWTH = 2
+# صفحه‌هایی با این تعداد خانه یا کمتر بدون پردازه‌های جدا حل می‌شوند
+SERIAL_MAX_CELLS = 25
+
+FOUND, EXHAUSTED, OVER_BUDGET, STOPPED = "found", "exhausted", "over_budget", "stopped"
+
+# وضعیت هر پردازه: حل‌کننده‌ای که یک‌بار ساخته می‌شود و پرچم توقف مشترک
+_worker_solver = None
+_worker_stop = None
+
+
+def _init_worker(cards, cols, rows, stop):
+    global _worker_solver, _worker_stop
+    _worker_solver = Solver(cards, cols, rows)
+    _worker_stop = stop
+
+
+def _run_task(prefix, budget, seed):
+    """یک زیردرخت را جستجو می‌کند: (وضعیت، جواب، تعداد گره)."""
+    solver = _worker_solver
+    stop = _worker_stop
+    if stop.is_set():
+        return STOPPED, None, 0
+    found = solver.search(prefix, budget, stop.is_set, seed)
+    nodes = solver.nodes
+    if found:
+        return FOUND, solver.placements(), nodes
+    if found is False:
+        return EXHAUSTED, None, nodes
+    if stop.is_set():
+        return STOPPED, None, nodes
+    return OVER_BUDGET, None, nodes
+
+
+def clamp_workers(workers=None):
+    """تعداد پردازه‌ها بین ۱ و تعداد هسته‌ها (پیش‌فرض: همه هسته‌ها)."""
+    cpus = multiprocessing.cpu_count()
+    return max(1, min(workers or cpus, cpus))
+
+
+def split_tree(solver, n_tasks):
+    """درخت جستجو را سطر به سطر باز می‌کند تا حداقل n_tasks پیشوند به دست آید."""
+    frontier = [()]
+    while len(frontier) < n_tasks:
+        expanded = []
+        for prefix in frontier:
+            expanded.extend(solver.children(prefix))
+        if not expanded or expanded == frontier:
+            return expanded
+        frontier = expanded
+    return frontier
+
+
+class ParallelSolver(object):
+    """حل‌کننده چندپردازه‌ای با همان خروجی Solver.solve."""
+
+    def __init__(self, cards, cols, rows=None, workers=None,
+                 tasks_per_worker=TASKS_PER_WORKER, task_budget=TASK_BUDGET):
+        self.cards = list(cards)
+        self.cols = cols
+        self.rows = cols if rows is None else rows
+        self.workers = clamp_workers(workers)
+        self.tasks_per_worker = tasks_per_worker
+        self.task_budget = task_budget
+        self.nodes = 0
+        self.tasks = 0
+        self.splits = 0
+        self.elapsed = 0.0
+
+    def solve(self, seed=0):
+        started = time.perf_counter()
+        self.nodes = 0
+        self.tasks = 0
+        self.splits = 0
+        result = None
+        solver = Solver(self.cards, self.cols, self.rows)
+        if self.workers == 1 or self.cols * self.rows <= SERIAL_MAX_CELLS:
+            result = solver.solve(seed=seed)
+            self.nodes = solver.nodes
+            self.elapsed = time.perf_counter() - started
+            return result
+        prefixes = []
+        if len(self.cards) >= self.cols * self.rows:
+            prefixes = split_tree(solver, self.workers * self.tasks_per_worker)
+        random.Random(seed).shuffle(prefixes)
+
+        stop = multiprocessing.Event()
+        pool = multiprocessing.Pool(
+            self.workers, _init_worker, (self.cards, self.cols, self.rows, stop)
+        )
+        # نتیجه‌ها از نخ پشتیبان Pool به این صف می‌رسند
+        results = queue.Queue()
+
+        def submit(prefix, budget):
+            self.tasks += 1
+
+            def done(outcome):
+                results.put((prefix, budget, outcome))
+
+            pool.apply_async(
+                _run_task,
+                (prefix, budget, seed + self.tasks),
+                callback=done,
+                error_callback=done,
+            )
+
+        try:
+            pending = 0
+            for prefix in prefixes:
+                submit(prefix, self.task_budget)
+                pending += 1
+            while pending:
+                prefix, budget, outcome = results.get()
+                pending -= 1
+                if isinstance(outcome, BaseException):
+                    raise outcome
+                status, placements, nodes = outcome
+                self.nodes += nodes
+                if status == FOUND:
+                    result = placements
+                    stop.set()
+                    break
+                if status != OVER_BUDGET:
+                    continue
+                if pending < self.workers:
+                    # پردازه‌ها به زودی بیکار می‌شوند → زیردرخت را بین آن‌ها تقسیم کن
+                    children = solver.children(prefix)
+                    if len(children) > 1:
+                        self.splits += 1
+                        for child in children:
+                            submit(child, self.task_budget)
+                            pending += 1
+                        continue
+                submit(prefix, budget * TASK_BUDGET_GROWTH)
+                pending += 1
+        finally:
+            stop.set()
+            pool.terminate()
+            pool.join()
+        self.elapsed = time.perf_counter() - started
+        return result
+
+
+def solve_parallel(cards, cols, rows=None, workers=None):
+    return ParallelSolver(cards, cols, rows, workers).solve()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="speedup of the parallel solver")
+    parser.add_argument("sizes", nargs="*", type=int, default=[6, 8])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=multiprocessing.cpu_count(),
+        help="largest worker count to try (at most the number of CPUs; "
+        "1 worker and boards up to %d cells run the serial solver)" % SERIAL_MAX_CELLS,
+    )
+    parser.add_argument("--seeds", type=int, default=3)
+    # رنگ کمتر از پیش‌فرض = پازل سخت‌تر، تا زمان حل از هزینه راه‌اندازی پردازه‌ها بیشتر باشد
+    parser.add_argument("--fewer-colors", type=int, default=2)
+    args = parser.parse_args(argv)
+    workers = clamp_workers(args.workers)
+    if workers != args.workers:
+        print("using %d workers (%d CPUs)" % (workers, multiprocessing.cpu_count()))
+
+    for size in args.sizes:
+        n_colors = max(2, default_colors(size) - args.fewer_colors)
+        puzzles = [
+            random_puzzle(size, n_colors=n_colors, seed=seed) for seed in range(args.seeds)
+        ]
+        serial = 0.0
+        for cards in puzzles:
+            solver = Solver(cards, size)
+            if solver.solve() is None:
+                print("%dx%d: serial solve FAILED" % (size, size))
+            serial += solver.elapsed
+        print("%dx%d (%d colors, %d puzzles): serial %.3fs" % (size, size, n_colors, len(puzzles), serial))
+        for n_workers in range(1, workers + 1):
+            total = 0.0
+            nodes = 0
+            ok = True
+            for cards in puzzles:
+                parallel = ParallelSolver(cards, size, workers=n_workers)
+                result = parallel.solve()
+                ok = ok and result is not None and check_solution(cards, size, size, result)
+                total += parallel.elapsed
+                nodes += parallel.nodes
+            print(
+                "  %2d workers: %.3fs  speedup x%.2f  (%d nodes)%s"
+                % (n_workers, total, serial / total if total else 0.0, nodes, "" if ok else "  FAILED")
+            )
+
+
+if __name__ == "__main__":
+    main()
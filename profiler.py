@@ -0,0 +1,359 @@
+# profiler.py
+"""پروفایلر درون‌برنامه‌ای زمان فریم و مسیرهای داغ.
+
+وقتی فعال است، متدهای update_canvas، do_layout چیدمان‌ها، drop_card و
+هندلرهای لمس کارت روی کلاس‌هایشان با یک نسخه زمان‌سنج جایگزین می‌شوند و با
+غیرفعال شدن دوباره متد اصلی برمی‌گردد؛ بنابراین وقتی خاموش است هیچ هزینه‌ای
+ندارد. (Clock و bind متدها را با نامشان پیدا می‌کنند، پس ویجت‌های از قبل
+ساخته‌شده هم نسخه زمان‌سنج را صدا می‌زنند.)
+
+روی صفحه‌های بازی کلید F12 یا سه ضربه در گوشه بالا-چپ پنل را روشن/خاموش
+می‌کند؛ با TIPTOP_PROFILE=1 برنامه با پروفایلر روشن شروع می‌شود. داده چند ثانیه
+آخر با دکمه Export یا Profiler.export در یک فایل JSON ذخیره می‌شود.
+"""
+import functools
+import json
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.floatlayout import FloatLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.label import Label
+from kivy.uix.relativelayout import RelativeLayout
+from kivy.uix.widget import Widget
+
+from components import CardWidget, MainSection
+
+# تعداد فریم‌هایی که نگه داشته و صادر می‌شوند
+ROLLING_FRAMES = 600
+# فاصله به‌روزرسانی متن پنل
+OVERLAY_INTERVAL = 0.25
+# مرز سطل‌های هیستوگرام زمان فریم (میلی‌ثانیه)
+HISTOGRAM_EDGES = (8, 17, 33, 50, 100)
+HISTOGRAM_LABELS = ("<8", "<17", "<33", "<50", "<100", "100+")
+# گوشه‌ای که سه ضربه در آن پنل را روشن/خاموش می‌کند
+TOGGLE_CORNER = 120
+TOGGLE_KEY = 293  # F12
+
+# (برچسب، کلاس، نام متد)؛ do_layout فقط روی کلاس‌هایی که خودشان تعریفش کرده‌اند
+HOOKS = (
+    ("update_canvas", CardWidget, "update_canvas"),
+    ("do_layout", GridLayout, "do_layout"),
+    ("do_layout", BoxLayout, "do_layout"),
+    ("do_layout", FloatLayout, "do_layout"),
+    ("do_layout", RelativeLayout, "do_layout"),
+    ("drop_card", MainSection, "drop_card"),
+    ("touch", CardWidget, "on_touch_down"),
+    ("touch", CardWidget, "on_touch_move"),
+    ("touch", CardWidget, "on_touch_up"),
+)
+HOOK_NAMES = ("update_canvas", "do_layout", "drop_card", "touch")
+
+
+class Profiler(object):
+    """جمع‌آوری زمان فریم‌ها و شمار/زمان هر هوک در هر فریم."""
+
+    def __init__(self, rolling_frames=ROLLING_FRAMES):
+        self.enabled = False
+        self.frames = deque(maxlen=rolling_frames)
+        self.totals = dict((name, [0, 0.0]) for name in HOOK_NAMES)
+        self._frame = dict((name, [0, 0.0]) for name in HOOK_NAMES)
+        self._originals = []
+        self._frame_event = None
+        self._last_frame = None
+        self.overlay = None
+        self._screens = []
+
+    # --- هوک‌ها ---
+
+    def _hooked(self, name, func):
+        @functools.wraps(func)
+        def hooked(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                entry = self._frame[name]
+                entry[0] += 1
+                entry[1] += time.perf_counter() - started
+
+        return hooked
+
+    def _install(self):
+        for name, cls, attr in HOOKS:
+            func = cls.__dict__.get(attr)
+            if func is None:
+                continue
+            self._originals.append((cls, attr, func))
+            setattr(cls, attr, self._hooked(name, func))
+
+    def _uninstall(self):
+        for cls, attr, func in reversed(self._originals):
+            setattr(cls, attr, func)
+        self._originals = []
+
+    # --- فریم‌ها ---
+
+    def _on_frame(self, dt):
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            hooks = {}
+            for name, entry in self._frame.items():
+                if entry[0]:
+                    total = self.totals[name]
+                    total[0] += entry[0]
+                    total[1] += entry[1]
+                    hooks[name] = (entry[0], entry[1] * 1000.0)
+                    entry[0] = 0
+                    entry[1] = 0.0
+            self.frames.append((now, (now - self._last_frame) * 1000.0, hooks))
+        self._last_frame = now
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self._install()
+        self._last_frame = None
+        self._frame_event = Clock.schedule_interval(self._on_frame, 0)
+        if self._screens:
+            self._show_overlay()
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._uninstall()
+        self._frame_event.cancel()
+        self._frame_event = None
+        self._hide_overlay()
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def reset(self):
+        self.frames.clear()
+        for entry in list(self.totals.values()) + list(self._frame.values()):
+            entry[0] = 0
+            entry[1] = 0.0
+
+    # --- خلاصه و خروجی ---
+
+    def frame_times(self):
+        return np.fromiter((frame[1] for frame in self.frames), dtype=float)
+
+    def summary(self):
+        """FPS، زمان فریم، هیستوگرام و شمار/زمان هوک‌ها روی فریم‌های نگه‌داشته‌شده."""
+        times = self.frame_times()
+        n = int(times.size)
+        hooks = {}
+        for name in HOOK_NAMES:
+            counts = [frame[2][name][0] for frame in self.frames if name in frame[2]]
+            last = self.frames[-1][2].get(name, (0, 0.0)) if n else (0, 0.0)
+            hooks[name] = {
+                "last_frame": last[0],
+                "per_frame": sum(counts) / float(n or 1),
+                "total_count": self.totals[name][0],
+                "total_ms": self.totals[name][1] * 1000.0,
+            }
+        if not n:
+            return {"frames": 0, "fps": 0.0, "hooks": hooks,
+                    "histogram": [0] * len(HISTOGRAM_LABELS)}
+        histogram = np.bincount(
+            np.searchsorted(HISTOGRAM_EDGES, times, side="right"),
+            minlength=len(HISTOGRAM_LABELS),
+        )
+        return {
+            "frames": n,
+            "fps": 1000.0 / times.mean(),
+            "frame_ms": times[-1],
+            "frame_p50": float(np.percentile(times, 50)),
+            "frame_p95": float(np.percentile(times, 95)),
+            "frame_max": float(times.max()),
+            "histogram": histogram.tolist(),
+            "hooks": hooks,
+        }
+
+    def export(self, path=None):
+        """داده فریم‌های اخیر را در یک فایل JSON می‌نویسد و مسیر آن را برمی‌گرداند."""
+        if path is None:
+            app = App.get_running_app()
+            path = os.path.join(
+                app.user_data_dir if app is not None else os.getcwd(),
+                time.strftime("profile-%Y%m%d-%H%M%S.json"),
+            )
+        started = self.frames[0][0] if self.frames else 0.0
+        data = {
+            "summary": self.summary(),
+            "histogram_edges_ms": list(HISTOGRAM_EDGES),
+            "frames": [
+                {
+                    "t": round(t - started, 6),
+                    "frame_ms": round(frame_ms, 4),
+                    "hooks": dict(
+                        (name, [count, round(ms, 4)]) for name, (count, ms) in hooks.items()
+                    ),
+                }
+                for t, frame_ms, hooks in self.frames
+            ],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=1)
+        return path
+
+    # --- پنل روی صفحه‌های بازی ---
+
+    def attach(self, screen):
+        """صفحه بازی فعال شده است: کلید/ژست روشن‌کردن و در صورت فعال بودن پنل."""
+        if not self._screens:
+            Window.bind(on_key_down=self._on_key_down, on_touch_down=self._on_touch_down)
+        self._screens.append(screen)
+        if self.enabled:
+            self._show_overlay()
+
+    def detach(self, screen):
+        if screen in self._screens:
+            self._screens.remove(screen)
+        if not self._screens:
+            Window.unbind(on_key_down=self._on_key_down, on_touch_down=self._on_touch_down)
+            self._hide_overlay()
+
+    def _on_key_down(self, window, key, *args):
+        if key == TOGGLE_KEY:
+            self.toggle()
+            return True
+
+    def _on_touch_down(self, window, touch):
+        if (
+            touch.is_triple_tap
+            and touch.x < TOGGLE_CORNER
+            and touch.y > window.height - TOGGLE_CORNER
+        ):
+            self.toggle()
+            return True
+
+    def _show_overlay(self):
+        if self.overlay is None:
+            self.overlay = ProfilerOverlay(self)
+        if self.overlay.parent is None:
+            Window.add_widget(self.overlay)
+            self.overlay.start()
+
+    def _hide_overlay(self):
+        if self.overlay is not None and self.overlay.parent is not None:
+            self.overlay.stop()
+            self.overlay.parent.remove_widget(self.overlay)
+
+
+class ProfilerOverlay(Widget):
+    """پنل نیمه‌شفاف بالا-چپ: FPS، زمان فریم، هیستوگرام و هوک‌ها."""
+
+    def __init__(self, profiler, **kwargs):
+        super(ProfilerOverlay, self).__init__(**kwargs)
+        self.profiler = profiler
+        self.size_hint = (None, None)
+        self.size = (400, 260)
+        self._event = None
+
+        with self.canvas.before:
+            Color(0, 0, 0, 0.7)
+            self._bg = Rectangle()
+            self._bar_color = Color(0.3, 0.9, 0.3, 0.9)
+            self._bars = [Rectangle() for _ in HISTOGRAM_LABELS]
+
+        self.label = Label(
+            halign="left", valign="top", font_size=13, font_name="RobotoMono-Regular"
+        )
+        self.bucket_labels = [Label(text=text, font_size=11) for text in HISTOGRAM_LABELS]
+        self.export_button = Button(text="Export", size_hint=(None, None), size=(80, 30))
+        self.export_button.bind(on_press=self.export)
+        self.add_widget(self.label)
+        for label in self.bucket_labels:
+            self.add_widget(label)
+        self.add_widget(self.export_button)
+        self.bind(pos=self.layout, size=self.layout)
+        Window.bind(size=self.layout)
+        self.layout()
+
+    def layout(self, *args):
+        self.pos = (10, Window.height - self.height - 10)
+        x, y = self.pos
+        w, h = self.size
+        self._bg.pos = self.pos
+        self._bg.size = self.size
+        self.label.pos = (x + 10, y + 100)
+        self.label.size = (w - 20, h - 110)
+        self.label.text_size = self.label.size
+        slot = (w - 110) / float(len(self.bucket_labels))
+        for i, label in enumerate(self.bucket_labels):
+            label.pos = (x + 10 + i * slot, y + 5)
+            label.size = (slot, 20)
+        self.export_button.pos = (x + w - 90, y + 8)
+        self.refresh()
+
+    def start(self):
+        self.profiler.reset()
+        self.refresh()
+        self._event = Clock.schedule_interval(self.refresh, OVERLAY_INTERVAL)
+
+    def stop(self):
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+
+    def refresh(self, *args):
+        summary = self.profiler.summary()
+        lines = []
+        if summary["frames"]:
+            lines.append(
+                "FPS %.0f  frame %.1f  p95 %.1f  max %.1f ms"
+                % (summary["fps"], summary["frame_ms"], summary["frame_p95"], summary["frame_max"])
+            )
+        else:
+            lines.append("FPS -")
+        lines.append("%-14s %5s %7s %10s" % ("", "last", "avg/f", "total ms"))
+        for name in HOOK_NAMES:
+            hook = summary["hooks"][name]
+            lines.append(
+                "%-14s %5d %7.2f %10.1f"
+                % (name, hook["last_frame"], hook["per_frame"], hook["total_ms"])
+            )
+        self.label.text = "\n".join(lines)
+
+        # هیستوگرام: ستون‌ها نسبت به پرجمعیت‌ترین سطل
+        histogram = summary["histogram"]
+        peak = float(max(histogram) or 1)
+        x, y = self.pos
+        slot = (self.width - 110) / float(len(histogram))
+        for i, (bar, count) in enumerate(zip(self._bars, histogram)):
+            bar.pos = (x + 10 + i * slot + 2, y + 28)
+            bar.size = (slot - 4, 65 * count / peak)
+
+    def export(self, instance):
+        path = self.profiler.export()
+        self.export_button.text = "Saved"
+        Clock.schedule_once(lambda dt: setattr(self.export_button, "text", "Export"), 2)
+        return path
+
+    def on_touch_down(self, touch):
+        if self.export_button.collide_point(*touch.pos):
+            return self.export_button.on_touch_down(touch)
+        return False
+
+
+# پروفایلر سراسری (برای همه صفحه‌های بازی مشترک)
+PROFILER = Profiler()
+if os.environ.get("TIPTOP_PROFILE") == "1":
+    PROFILER.enable()
@@ -0,0 +1,147 @@
+# puzzle_generator.py
+"""تولید انبوه پازل‌های حل‌پذیر روی چند پردازه.
+
+هر پازل برای یکی از مرحله‌های levels.py با level_cards از یک seed ساخته می‌شود
+(روی کارت‌ها بریده از یک شبکه رنگی، چرخانده و بُر خورده؛ پشت کارت‌ها به رنگ
+ردیف‌های سایدبار همان مرحله) و سپس با Solver حل و با check_solution بررسی می‌شود.
+دو پازل وقتی یکی هستند که مجموعه کارت‌هایشان، مستقل از ترتیب و چرخش کارت‌ها،
+یکی باشد؛ تکراری‌ها در پردازه اصلی کنار گذاشته می‌شوند. پازل‌ها به محض رسیدن
+به صورت JSON Lines (هر خط یک پازل با جوابش) در فایل نوشته می‌شوند:
+
+    python puzzle_generator.py game_4x4 --count 5000 --out puzzles_game_4x4.jsonl
+    python puzzle_generator.py game_4x4 --count 2000 --workers 1 2 4
+
+با چند مقدار برای --workers همان تولید با هر تعداد پردازه تکرار و توان عملیاتی
+(پازل در دقیقه) برای هرکدام گزارش می‌شود. هر پازل فایل با levels.load_puzzle
+به یک مرحله قابل بازی تبدیل می‌شود (python main.py -- --puzzle <فایل>).
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from levels import LEVELS_BY_NAME, level_cards
+from solver import Solver, check_solution, default_colors, rotate_quadrants
+
+# تعداد پازلی که هر بار به یک پردازه داده می‌شود
+CHUNK_SIZE = 16
+
+
+def puzzle_key(cards):
+    """شناسه پازل مستقل از ترتیب و چرخش کارت‌ها."""
+    canonical = sorted(
+        min(
+            (rotate_quadrants(card.face, turns), rotate_quadrants(card.back, turns))
+            for turns in range(4)
+        )
+        for card in cards
+    )
+    return hashlib.blake2b(repr(canonical).encode("ascii"), digest_size=16).hexdigest()
+
+
+def generate_one(job):
+    """یک پازل حل‌شده و بررسی‌شده برای (نام مرحله، تعداد رنگ، seed)، یا None."""
+    name, n_colors, seed = job
+    level = LEVELS_BY_NAME[name]
+    cols, rows = level.cols, level.rows
+    cards = level_cards(level, seed, n_colors)
+    solution = Solver(cards, cols, rows).solve()
+    if solution is None or not check_solution(cards, cols, rows, solution):
+        return None
+    return {
+        "key": puzzle_key(cards),
+        "level": name,
+        "seed": seed,
+        "cols": cols,
+        "rows": rows,
+        "cards": [[list(card.face), list(card.back)] for card in cards],
+        "solution": [
+            [p.cell, p.card, p.turns, p.face_up] for p in sorted(solution, key=lambda p: p.cell)
+        ],
+    }
+
+
+def generate(name, count, out, workers=None, n_colors=None, seed=0):
+    """count پازل متمایز برای مرحله name می‌سازد و هرکدام را به محض رسیدن در فایل out می‌نویسد.
+
+    آمار تولید را برمی‌گرداند (پازل‌ها، تکراری‌ها، شکست‌ها، زمان).
+    """
+    if n_colors is None:
+        level = LEVELS_BY_NAME[name]
+        n_colors = default_colors(level.cols, level.rows)
+    workers = workers or multiprocessing.cpu_count()
+    seen = set()
+    stats = {"puzzles": 0, "duplicates": 0, "failed": 0}
+    next_seed = seed
+    started = time.perf_counter()
+    pool = multiprocessing.Pool(workers)
+    try:
+        while stats["puzzles"] < count:
+            # فقط به اندازه کمبود seed فرستاده می‌شود؛ تکراری‌ها در دور بعد جبران می‌شوند
+            produced = stats["puzzles"]
+            need = count - produced
+            jobs = [(name, n_colors, s) for s in range(next_seed, next_seed + need)]
+            next_seed += need
+            for puzzle in pool.imap_unordered(generate_one, jobs, CHUNK_SIZE):
+                if puzzle is None:
+                    stats["failed"] += 1
+                    continue
+                if puzzle["key"] in seen:
+                    stats["duplicates"] += 1
+                    continue
+                seen.add(puzzle["key"])
+                out.write(json.dumps(puzzle, separators=(",", ":")) + "\n")
+                stats["puzzles"] += 1
+            if stats["puzzles"] == produced:
+                # همه پازل‌های این اندازه و تعداد رنگ تکراری شده‌اند
+                break
+    finally:
+        pool.terminate()
+        pool.join()
+    elapsed = time.perf_counter() - started
+    stats.update(
+        workers=workers,
+        seconds=round(elapsed, 3),
+        puzzles_per_min=round(stats["puzzles"] * 60.0 / elapsed, 1) if elapsed > 0 else None,
+    )
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="bulk generator of verified-solvable puzzles")
+    parser.add_argument("level", choices=sorted(LEVELS_BY_NAME))
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--colors", type=int, help="face colours (default: solver.default_colors)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[multiprocessing.cpu_count()])
+    parser.add_argument("--out", help="JSON Lines output path (default: puzzles_<level>.jsonl)")
+    args = parser.parse_args(argv)
+
+    path = args.out or "puzzles_%s.jsonl" % args.level
+    results = []
+    for workers in args.workers:
+        # هر خط بلافاصله نوشته می‌شود تا فایل در حین تولید هم قابل خواندن باشد
+        with open(path, "w", buffering=1) as out:
+            stats = generate(args.level, args.count, out, workers, args.colors, args.seed)
+        results.append(stats)
+        sys.stderr.write(
+            "%s %2d workers: %d puzzles in %.2fs  %10.1f puzzles/min  (%d duplicates, %d failed)\n"
+            % (
+                args.level,
+                workers,
+                stats["puzzles"],
+                stats["seconds"],
+                stats["puzzles_per_min"] or 0,
+                stats["duplicates"],
+                stats["failed"],
+            )
+        )
+    sys.stderr.write("%s: %d bytes\n" % (path, os.path.getsize(path)))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# replay.py
+"""اجرای دوباره یک دنباله حرکت بدون پنجره، برای سنجش توان عملیاتی منطق بازی.
+
+حرکت‌ها همان رکوردهای move_log هستند (انداختن در خانه، چرخاندن، پشت‌ورو کردن،
+برگرداندن و ریست). به طور پیش‌فرض دنباله روی BoardModel و CellGrid، یعنی منطق
+پشت صفحه‌های بازی و بدون Kivy، اجرا می‌شود. با --widgets همان دنباله روی یک
+Game واقعی در پنجره offscreen هم اجرا می‌شود (یک فریم Clock بعد از هر حرکت):
+انداختن‌ها مثل رها کردن کارت با انگشت از MainSection.drop_card در مرکز خانه
+مقصد می‌گذرند و بقیه حرکت‌ها از مسیر redo؛ هزینه ویجت‌ها در کنار منطق دیده و
+وضعیت نهایی دو اجرا مقایسه می‌شود:
+
+    python replay.py game_12x12 --moves 100000
+    python replay.py game_6x6 --moves 2000 --widgets --save moves.npz
+    python replay.py --load moves.npz --widgets
+
+دنباله بدون --load به صورت تصادفی (با seed ثابت) ساخته می‌شود.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from board import OFF_BOARD, BoardModel
+from cell_grid import CellGrid
+from levels import LEVELS_BY_NAME, card_back_colors, level_cards
+from move_log import FLIP, ROTATE, MOVE, RETURN, RESET, MOVE_DTYPE
+from savegame import encode_board
+
+# تعداد پیش‌فرض حرکت‌های دنباله تصادفی
+MOVES = 20000
+# وزن هر نوع حرکت در دنباله تصادفی (انداختن از سایدبار، جابه‌جایی روی صفحه،
+# چرخاندن، پشت‌ورو کردن، برگرداندن، ریست)
+MOVE_WEIGHTS = (
+    ("drop", 0.35),
+    ("move", 0.15),
+    ("rotate", 0.2),
+    ("flip", 0.15),
+    ("return", 0.12),
+    ("reset", 0.03),
+)
+
+
+def new_board(level):
+    """مدل صفحه خالی یک مرحله با همان شناسه کارت‌های Game (به ترتیب ردیف‌های سایدبار)."""
+    return BoardModel(level.cols, level.rows, card_back_colors(level))
+
+
+def apply_moves(board, grid, moves):
+    """حرکت‌ها را روی مدل اعمال می‌کند (همان نتیجه redo در Game)."""
+    face_up = board.face_up
+    turns = board.turns
+    for kind, card, _, new_cell, _, new_turns, _, new_face_up in moves.tolist():
+        if kind == RESET:
+            # همان ریست MainSection.reset
+            grid.return_all()
+            continue
+        if new_cell == OFF_BOARD:
+            grid.remove(card)
+        else:
+            grid.place(card, new_cell)
+        turns[card] = new_turns
+        face_up[card] = new_face_up
+
+
+def random_moves(level, count, seed=0):
+    """دنباله‌ای معتبر از count حرکت تصادفی برای یک مرحله.
+
+    نوع حرکتی که در وضعیت فعلی ممکن نیست (مثلاً ریست صفحه خالی) دوباره قرعه‌کشی
+    می‌شود؛ همیشه دست‌کم یک نوع ممکن است، چون تعداد کارت‌ها و خانه‌ها برابر است.
+    """
+    rng = np.random.default_rng(seed)
+    board = new_board(level)
+    grid = CellGrid(board)
+    kinds = [kind for kind, _ in MOVE_WEIGHTS]
+    weights = np.array([weight for _, weight in MOVE_WEIGHTS])
+    weights = weights / weights.sum()
+    records = np.zeros(count, dtype=MOVE_DTYPE)
+    written = 0
+    while written < count:
+        action = kinds[rng.choice(len(kinds), p=weights)]
+        placed = np.flatnonzero(board.cell != OFF_BOARD)
+        if action == "reset":
+            if not placed.size:
+                continue
+            record = (RESET, -1, OFF_BOARD, OFF_BOARD, 0, 0, True, True)
+        else:
+            if action == "drop":
+                candidates = np.flatnonzero(board.cell == OFF_BOARD)
+            else:
+                candidates = placed
+            free = np.flatnonzero(board.occupant == OFF_BOARD)
+            if not candidates.size or (action in ("drop", "move") and not free.size):
+                continue
+            card = int(candidates[rng.integers(candidates.size)])
+            cell, turn, face = int(board.cell[card]), int(board.turns[card]), bool(board.face_up[card])
+            new_cell, new_turn, new_face = cell, turn, face
+            if action in ("drop", "move"):
+                kind = MOVE
+                new_cell = int(free[rng.integers(free.size)])
+            elif action == "rotate":
+                kind = ROTATE
+                new_turn = (turn + 1) % 4
+            elif action == "flip":
+                kind = FLIP
+                new_face = not face
+            else:
+                kind = RETURN
+                new_cell, new_face = OFF_BOARD, True
+            record = (kind, card, cell, new_cell, turn, new_turn, face, new_face)
+        records[written] = record
+        apply_moves(board, grid, records[written:written + 1])
+        written += 1
+    return records
+
+
+def save_recording(path, level_name, moves):
+    np.savez(path, level=level_name, moves=moves)
+
+
+def load_recording(path):
+    """(نام مرحله، رکوردهای حرکت) یک فایل ذخیره‌شده با save_recording."""
+    with np.load(path) as data:
+        return str(data["level"]), np.asarray(data["moves"], dtype=MOVE_DTYPE)
+
+
+def board_summary(board, cards):
+    return {
+        "placed": len(board.placed()),
+        "digest": "%08x" % zlib.crc32(encode_board(board, cards)),
+        "cells": [
+            [index, card, int(board.turns[card]), bool(board.face_up[card])]
+            for index, card in board.placed()
+        ],
+    }
+
+
+def replay_logic(level, moves):
+    """(ثانیه، مدل نهایی) اجرای دنباله روی منطق بدون ویجت."""
+    board = new_board(level)
+    grid = CellGrid(board)
+    started = time.perf_counter()
+    apply_moves(board, grid, moves)
+    return time.perf_counter() - started, board
+
+
+def drop_move(game, move):
+    """یک رکورد MOVE را مثل رها کردن کارت (CardWidget.on_touch_up) در مرکز خانه مقصد اجرا می‌کند."""
+    main_section = game.main_section
+    card = game.all_cards[move.card]
+    if card.parent is main_section:
+        main_section.release_card(card)
+    elif card.parent is not None:
+        card.parent.remove_widget(card)
+    x, y = main_section.grid.cell_pos(move.new_cell)
+    half = main_section.grid.cell_size / 2.0
+    if main_section.drop_card(card, (x + half, y + half)):
+        card.in_sidebar = False
+    card.angle = move.new_turns * 90
+    card.face_up = move.new_face_up
+    game.select_card(card)
+
+
+def replay_widgets(level, moves):
+    """(ثانیه، مدل نهایی) اجرای دنباله روی یک Game واقعی در پنجره offscreen.
+
+    رکوردهای MOVE از drop_move و بقیه از Game.redo اجرا می‌شوند؛ مکان‌نمای
+    تاریخچه در هر دو حالت جلو می‌رود.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    from kivy.config import Config
+
+    # Clock.tick نباید برای محدود کردن نرخ فریم بخوابد
+    Config.set("graphics", "maxfps", "0")
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+
+    from game import GameScreen
+
+    screen = GameScreen(level=level, name=level.name)
+    screen.size = Window.size
+    Window.add_widget(screen)
+    Clock.tick()
+    game = screen.game
+    game.moves.load(moves)
+    started = time.perf_counter()
+    while game.moves.can_redo:
+        move = game.moves.peek_redo()
+        if move.kind == MOVE:
+            game.moves.redo()
+            drop_move(game, move)
+        else:
+            game.redo()
+        Clock.tick()
+    seconds = time.perf_counter() - started
+    board = game.board.copy()
+    Window.remove_widget(screen)
+    return seconds, board
+
+
+def throughput(seconds, count):
+    return {
+        "seconds": round(seconds, 6),
+        "actions_per_sec": round(count / seconds, 1) if seconds > 0 else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="headless replay of recorded game moves")
+    parser.add_argument("level", nargs="?", default="game_6x6", choices=sorted(LEVELS_BY_NAME))
+    parser.add_argument("--moves", type=int, default=MOVES,
+                        help="length of the generated sequence (ignored with --load)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--load", help="replay a recording saved with --save")
+    parser.add_argument("--save", help="save the replayed sequence (.npz)")
+    parser.add_argument("--widgets", action="store_true",
+                        help="also replay through the real widgets in an offscreen window")
+    parser.add_argument("--out", help="JSON output path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.load:
+        level_name, moves = load_recording(args.load)
+    else:
+        level_name = args.level
+        moves = random_moves(LEVELS_BY_NAME[level_name], args.moves, args.seed)
+    level = LEVELS_BY_NAME[level_name]
+    if args.save:
+        save_recording(args.save, level_name, moves)
+
+    seconds, board = replay_logic(level, moves)
+    report = {
+        "level": level_name,
+        "actions": int(len(moves)),
+        "logic": throughput(seconds, len(moves)),
+        "final_board": board_summary(board, level_cards(level)),
+    }
+    sys.stderr.write(
+        "%-11s logic    %8d actions  %12.0f actions/s\n"
+        % (level_name, len(moves), report["logic"]["actions_per_sec"] or 0)
+    )
+    if args.widgets:
+        widget_seconds, widget_board = replay_widgets(level, moves)
+        report["widgets"] = throughput(widget_seconds, len(moves))
+        report["widgets"]["overhead"] = round(widget_seconds / seconds, 1) if seconds > 0 else None
+        report["widgets"]["final_board_matches"] = widget_board == board
+        sys.stderr.write(
+            "%-11s widgets  %8d actions  %12.0f actions/s  (x%s, final board %s)\n"
+            % (
+                level_name,
+                len(moves),
+                report["widgets"]["actions_per_sec"] or 0,
+                report["widgets"]["overhead"],
+                "matches" if report["widgets"]["final_board_matches"] else "DIFFERS",
+            )
+        )
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    report = main()
+    if not report.get("widgets", {}).get("final_board_matches", True):
+        sys.exit(1)
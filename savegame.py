@@ -0,0 +1,155 @@
+# savegame.py
+"""ذخیره و بازیابی فشرده وضعیت صفحه بازی.
+
+قالب فایل (نسخه ۲):
+
+    سرآیند ۱۲ بایتی: "TT"، نسخه، cols، rows، تعداد رنگ‌ها، تعداد کارت‌ها (uint16)،
+        CRC32 روی و پشت کارت‌های مرحله (uint32)
+    داده: برای هر کارت به ترتیب شناسه، فیلدهای بیتی پشت‌سرهم
+        خانه + ۱ (صفر یعنی سایدبار)، ربع‌چرخش (۲ بیت)، رو بودن (۱ بیت)، رنگ پشت
+    CRC32 سرآیند و داده (uint32)
+
+عرض فیلدهای خانه و رنگ از روی سرآیند حساب می‌شود؛ برای صفحه ۱۲×۱۲ هر کارت
+۱۵ بیت است و کل فایل ۲۸۶ بایت می‌شود. بسته‌بندی بیت‌ها با NumPy انجام می‌شود.
+
+فایل فقط شناسه کارت‌ها را نگه می‌دارد، پس با CRC کارت‌های مرحله (levels.level_cards)
+ذخیره می‌شود؛ فایلی که برای مجموعه کارت دیگری ساخته شده (مثلاً پس از تغییر seed،
+رنگ‌ها یا LEVELS) مثل نسخه ناشناخته رد می‌شود.
+"""
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from board import OFF_BOARD, BoardModel
+
+MAGIC = b"TT"
+SAVE_VERSION = 2
+SAVE_EXTENSION = ".sav"
+
+_HEADER = struct.Struct("<2sBBBBHI")
+_CRC = struct.Struct("<I")
+
+
+def _bits(n_values):
+    """تعداد بیت لازم برای مقادیر 0..n_values-1 (حداقل ۱)."""
+    return max(1, int(n_values - 1).bit_length())
+
+
+def card_set_digest(cards):
+    """CRC32 روی و پشت کارت‌ها (solver.Card) به ترتیب شناسه کارت."""
+    quads = np.array([card.face + card.back for card in cards], dtype=np.uint16)
+    return zlib.crc32(quads.tobytes())
+
+
+def _field_widths(cols, rows, n_colors):
+    return (_bits(cols * rows + 1), 2, 1, _bits(n_colors))
+
+
+def encode_board(board, cards):
+    """مدل صفحه با کارت‌های cards را به بایت‌های فشرده تبدیل می‌کند."""
+    n_cards = board.n_cards
+    n_colors = int(board.back_color.max()) + 1 if n_cards else 1
+    header = _HEADER.pack(
+        MAGIC, SAVE_VERSION, board.cols, board.rows, n_colors, n_cards, card_set_digest(cards)
+    )
+    fields = (
+        board.cell.astype(np.int32) + 1,
+        board.turns.astype(np.int32),
+        board.face_up.astype(np.int32),
+        board.back_color.astype(np.int32),
+    )
+    columns = []
+    for values, width in zip(fields, _field_widths(board.cols, board.rows, n_colors)):
+        shifts = np.arange(width - 1, -1, -1)
+        columns.append((values[:, None] >> shifts) & 1)
+    bits = np.concatenate(columns, axis=1).astype(np.uint8)
+    data = header + np.packbits(bits.ravel()).tobytes()
+    return data + _CRC.pack(zlib.crc32(data))
+
+
+def decode_board(data, cards):
+    """بایت‌های encode_board را به یک BoardModel تازه تبدیل می‌کند.
+
+    داده خراب، نسخه ناشناخته یا فایلی که برای کارت‌هایی غیر از cards ساخته شده ValueError می‌دهد.
+    """
+    if len(data) < _HEADER.size + _CRC.size:
+        raise ValueError("save data is truncated")
+    magic, version, cols, rows, n_colors, n_cards, digest = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a save file")
+    if version != SAVE_VERSION:
+        raise ValueError("unsupported save version %d" % version)
+    (crc,) = _CRC.unpack_from(data, len(data) - _CRC.size)
+    if zlib.crc32(data[:-_CRC.size]) != crc:
+        raise ValueError("save data is corrupt (checksum mismatch)")
+    if digest != card_set_digest(cards):
+        raise ValueError("save was made for a different card set")
+
+    widths = _field_widths(cols, rows, n_colors)
+    row_bits = sum(widths)
+    payload = np.frombuffer(data, dtype=np.uint8, offset=_HEADER.size,
+                            count=len(data) - _HEADER.size - _CRC.size)
+    if payload.size * 8 < n_cards * row_bits:
+        raise ValueError("save data is truncated")
+    bits = np.unpackbits(payload, count=n_cards * row_bits).reshape(n_cards, row_bits)
+    fields = []
+    start = 0
+    for width in widths:
+        weights = 1 << np.arange(width - 1, -1, -1)
+        fields.append(bits[:, start:start + width].astype(np.int32) @ weights)
+        start += width
+    cell, turns, face_up, back_color = fields
+    cell = cell - 1
+
+    n_cells = cols * rows
+    placed = np.flatnonzero(cell != OFF_BOARD)
+    if cell.size and cell.max() >= n_cells:
+        raise ValueError("card outside the %dx%d board" % (cols, rows))
+    if np.unique(cell[placed]).size != placed.size:
+        raise ValueError("two cards in the same cell")
+
+    board = BoardModel(cols, rows, back_color)
+    board.cell[:] = cell
+    board.occupant[cell[placed]] = placed
+    board.turns[:] = turns
+    board.face_up[:] = face_up.astype(np.bool_)
+    return board
+
+
+def save_board(board, cards, path):
+    """ذخیره اتمی: ابتدا در فایل موقت و سپس جایگزینی."""
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encode_board(board, cards))
+    os.replace(tmp_path, path)
+
+
+def load_board(path, cards):
+    """مدل ذخیره‌شده یا None اگر فایلی نباشد."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    return decode_board(data, cards)
+
+
+def save_path(name, directory=None):
+    """مسیر فایل ذخیره یک مرحله (پیش‌فرض: پوشه saves در user_data_dir برنامه).
+
+    بدون App در حال اجرا (بنچمارک، replay، اسکریپت‌ها) پوشه باید صریحاً داده شود
+    تا فایل ذخیره هیچ‌وقت در پوشه جاری نوشته نشود؛ وگرنه RuntimeError.
+    """
+    if directory is None:
+        from kivy.app import App
+
+        app = App.get_running_app()
+        if app is None:
+            raise RuntimeError("no running App: pass the save directory explicitly")
+        directory = os.path.join(app.user_data_dir, "saves")
+    return os.path.join(directory, name + SAVE_EXTENSION)
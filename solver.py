@@ -0,0 +1,565 @@
+# solver.py
+"""حل‌کننده دقیق پازل کارت‌ها با بیت‌ماسک سازگاری لبه‌ها و انتشار قیدها.
+
+هر کارت دو طرف دارد (رو و پشت) و هر طرف چهار ربع رنگی به ترتیب ساعتگرد
+(بالا-چپ، بالا-راست، پایین-راست، پایین-چپ). دو کارت مجاور وقتی جور هستند که
+ربع‌های چسبیده به هم هم‌رنگ باشند. خانه‌ها مثل BoardModel به ترتیب سطری از
+پایین شماره می‌خورند و چرخش‌ها ربع‌چرخش پادساعتگرد هستند (مثل زاویه کارت در Kivy).
+"""
+import random
+import sys
+import time
+from collections import namedtuple
+
+# رنگ‌های پشت کارت بعد از رنگ‌های رو شماره می‌خورند
+BACK_COLOR_BASE = 4
+
+Card = namedtuple("Card", "face back")
+Placement = namedtuple("Placement", "cell card turns face_up")
+
+
+def rotate_quadrants(quads, turns):
+    """ربع‌ها را turns بار ۹۰ درجه پادساعتگرد می‌چرخاند."""
+    turns %= 4
+    return tuple(quads[turns:]) + tuple(quads[:turns])
+
+
+def oriented_quadrants(card, turns, face_up):
+    return rotate_quadrants(card.face if face_up else card.back, turns)
+
+
+def edges(quads):
+    """لبه‌های (چپ، راست، پایین، بالا) یک کارت جهت‌دار."""
+    tl, tr, br, bl = quads
+    return (tl, bl), (tr, br), (bl, br), (tl, tr)
+
+
+def check_solution(cards, cols, rows, placements):
+    """بررسی کامل بودن و درستی یک چیدمان."""
+    if len(placements) != cols * rows:
+        return False
+    grid = {}
+    used = set()
+    for p in placements:
+        if p.card in used or p.cell in grid:
+            return False
+        used.add(p.card)
+        grid[p.cell] = edges(oriented_quadrants(cards[p.card], p.turns, p.face_up))
+    for index, (left, right, bottom, top) in grid.items():
+        row, col = divmod(index, cols)
+        if col + 1 < cols and grid[index + 1][0] != right:
+            return False
+        if row + 1 < rows and grid[index + cols][2] != top:
+            return False
+    return True
+
+
+# بودجه گره در اولین دور جستجو، ضریب افزایش آن و سقفی که بعد از آن بودجه برداشته می‌شود
+RESTART_BASE = 2000
+RESTART_GROWTH = 2
+RESTART_LIMIT = 10 ** 7
+
+if hasattr(int, "bit_count"):
+    _popcount = int.bit_count
+else:
+    def _popcount(value):
+        return bin(value).count("1")
+
+
+def _canonical(card):
+    """کلید نوع کارت مستقل از چرخش و تعداد چرخشی که کارت را به آن می‌رساند."""
+    best = None
+    for turns in range(4):
+        key = (rotate_quadrants(card.face, turns), rotate_quadrants(card.back, turns))
+        if best is None or key < best[0]:
+            best = (key, turns)
+    return best
+
+
+def _bits(mask):
+    """ایندکس بیت‌های روشن یک ماسک به ترتیب صعودی."""
+    values = []
+    while mask:
+        low = mask & -mask
+        mask ^= low
+        values.append(low.bit_length() - 1)
+    return values
+
+
+class Solver(object):
+    """جستجوی عقب‌گرد روی بیت‌ماسک‌ها با MRV، بررسی پیشرو و شمارش رنگ‌ها.
+
+    ربع‌هایی که در یک گوشه شبکه به هم می‌رسند باید هم‌رنگ باشند، پس جور بودن
+    لبه‌ها یعنی هر گوشه شبکه یک رنگ دارد. برای هر گوشه کارت و هر رنگ یک ماسک
+    بیتی از «واریانت‌ها» (نوع کارت + طرف + چرخش) پیشاپیش ساخته می‌شود و دامنه هر
+    خانه با AND ماسک گوشه‌های رنگ‌شده‌اش به دست می‌آید. کارت‌هایی که با چرخش
+    یکسان می‌شوند در یک «نوع» ادغام می‌شوند تا شاخه‌های متقارن تکرار نشوند.
+    """
+
+    def __init__(self, cards, cols, rows=None):
+        self.cards = list(cards)
+        self.cols = cols
+        self.rows = cols if rows is None else rows
+        self.nodes = 0
+        self.restarts = 0
+        self.elapsed = 0.0
+        self._rng = None
+        self._build_tables()
+
+    def _build_tables(self):
+        types = {}
+        self.type_cards = []
+        self.card_offset = []
+        type_quads = []
+        for card_id, card in enumerate(self.cards):
+            key, offset = _canonical(card)
+            self.card_offset.append(offset)
+            if key not in types:
+                types[key] = len(self.type_cards)
+                self.type_cards.append([])
+                type_quads.append(key)
+            self.type_cards[types[key]].append(card_id)
+
+        # رنگی که روی هیچ طرفی کنار رنگ دیگری نمی‌آید (مثل پشت یکدست) فقط وقتی
+        # می‌تواند در جواب باشد که کل صفحه را بپوشاند؛ طرف‌هایی که چنین رنگی دارند
+        # ولی تعدادشان برای پر کردن صفحه کافی نیست از اول کنار گذاشته می‌شوند
+        mixed = set()
+        solid = {}
+        for card in self.cards:
+            for side in (card.face, card.back):
+                if len(set(side)) == 1:
+                    solid[side[0]] = solid.get(side[0], 0) + 1
+                else:
+                    mixed.update(side)
+        n_cells = self.cols * self.rows
+        self.type_sides = []
+        for face, back in type_quads:
+            self.type_sides.append([
+                side for side in (face, back)
+                if len(set(side)) > 1 or side[0] in mixed or solid[side[0]] >= n_cells
+            ])
+
+        # هر «واریانت» یک نوع کارت با یک طرف و یک چرخش مشخص است
+        self.variant_type = []
+        self.variant_turns = []
+        self.variant_face_up = []
+        self.variant_quads = []
+        self.type_mask = [0] * len(self.type_cards)
+        for type_id, (face, back) in enumerate(type_quads):
+            seen = set()
+            for face_up in (True, False):
+                side = face if face_up else back
+                if side not in self.type_sides[type_id]:
+                    continue
+                for turns in range(4):
+                    quads = rotate_quadrants(side, turns)
+                    if quads in seen:
+                        continue
+                    seen.add(quads)
+                    self.type_mask[type_id] |= 1 << len(self.variant_type)
+                    self.variant_type.append(type_id)
+                    self.variant_turns.append(turns)
+                    self.variant_face_up.append(face_up)
+                    self.variant_quads.append(quads)
+        self.variant_index = dict(
+            ((self.variant_type[v], self.variant_turns[v], self.variant_face_up[v]), v)
+            for v in range(len(self.variant_type))
+        )
+
+        # ماسک سازگاری: برای هر گوشه کارت و هر رنگ، واریانت‌هایی که آن گوشه‌شان این رنگ است
+        n_colours = 1 + max([max(card.face + card.back) for card in self.cards] or [0])
+        self.corner_masks = [[0] * n_colours for _ in range(4)]
+        for v, quads in enumerate(self.variant_quads):
+            for corner, colour in enumerate(quads):
+                self.corner_masks[corner][colour] |= 1 << v
+
+        # موجودی رنگ هر نوع کارت (بیشینه دو طرف، چون طرف کارت هنوز معلوم نیست)
+        self.type_supply = [
+            [max([side.count(c) for side in sides] or [0]) for c in range(n_colours)]
+            for sides in self.type_sides
+        ]
+
+        # گوشه‌های شبکه برای هر خانه به ترتیب ربع‌ها: بالا-چپ، بالا-راست، پایین-راست، پایین-چپ
+        vcols = self.cols + 1
+        self.cell_vertices = []
+        for index in range(self.cols * self.rows):
+            row, col = divmod(index, self.cols)
+            bl = row * vcols + col
+            self.cell_vertices.append((bl + vcols, bl + vcols + 1, bl + 1, bl))
+        self.vertex_cells = [0] * (vcols * (self.rows + 1))
+        for vertices in self.cell_vertices:
+            for vertex in vertices:
+                self.vertex_cells[vertex] += 1
+        self.type_colours = [
+            [c for c, count in enumerate(supply) if count] for supply in self.type_supply
+        ]
+
+        # شمارش لبه‌ها: هر لبه باز (یک طرفش پر) یک جفت رنگ ساعتگرد مشخص لازم دارد
+        self.n_colours = n_colours
+        self.type_pairs = []
+        for sides in self.type_sides:
+            counts = {}
+            for side in sides:
+                side_counts = {}
+                for i in range(4):
+                    pair = side[i] * n_colours + side[(i + 1) % 4]
+                    side_counts[pair] = side_counts.get(pair, 0) + 1
+                for pair, count in side_counts.items():
+                    counts[pair] = max(counts.get(pair, 0), count)
+            self.type_pairs.append(sorted(counts.items()))
+        # همسایه‌های هر خانه: (خانه همسایه، ربع اول و دوم لبه مشترک به ترتیب ساعتگرد)
+        self.cell_links = []
+        for index in range(self.cols * self.rows):
+            row, col = divmod(index, self.cols)
+            links = []
+            if row + 1 < self.rows:
+                links.append((index + self.cols, 0, 1))
+            if col + 1 < self.cols:
+                links.append((index + 1, 1, 2))
+            if row > 0:
+                links.append((index - self.cols, 2, 3))
+            if col > 0:
+                links.append((index - 1, 3, 0))
+            self.cell_links.append(links)
+
+    def variant_for(self, card_id, turns, face_up):
+        """واریانت متناظر با یک کارت مشخص در یک جهت مشخص."""
+        type_id = None
+        for t, card_ids in enumerate(self.type_cards):
+            if card_id in card_ids:
+                type_id = t
+                break
+        turns = (turns - self.card_offset[card_id]) % 4
+        quads = rotate_quadrants(
+            self.cards[card_id].face if face_up else self.cards[card_id].back,
+            self.card_offset[card_id] + turns,
+        )
+        for v in range(len(self.variant_type)):
+            if self.variant_type[v] == type_id and self.variant_quads[v] == quads:
+                return v
+        return None
+
+    def reset(self):
+        """وضعیت جستجو را به صفحه خالی برمی‌گرداند."""
+        n_colours = len(self.corner_masks[0])
+        self.colours = [-1] * len(self.vertex_cells)
+        self.open_cells = list(self.vertex_cells)
+        self.demand = [0] * n_colours
+        self.supply = [0] * n_colours
+        self.remaining = [len(card_ids) for card_ids in self.type_cards]
+        for type_id, card_ids in enumerate(self.type_cards):
+            for colour, count in enumerate(self.type_supply[type_id]):
+                self.supply[colour] += count * len(card_ids)
+        self.pair_demand = [0] * (n_colours * n_colours)
+        self.pair_supply = [0] * (n_colours * n_colours)
+        for type_id, card_ids in enumerate(self.type_cards):
+            for pair, count in self.type_pairs[type_id]:
+                self.pair_supply[pair] += count * len(card_ids)
+        self.available = (1 << len(self.variant_type)) - 1
+        self.free_cells = set(range(self.cols * self.rows))
+        self.assignment = {}
+
+    def apply(self, prefix):
+        """از صفحه خالی، جفت‌های (خانه، واریانت) پیشوند را می‌گذارد؛ False در بن‌بست."""
+        self.reset()
+        for index, v in prefix:
+            if self.place(index, v) is None:
+                return False
+        return True
+
+    def branches(self):
+        """خانه‌ای که گام بعدی جستجو روی آن است و واریانت‌های ممکن برای آن.
+
+        (None، []) یعنی صفحه کامل است.
+        """
+        index, mask = self._choose()
+        return index, _bits(mask)
+
+    def children(self, prefix):
+        """پیشوندهای یک گام عمیق‌تر که بلافاصله به بن‌بست نمی‌رسند."""
+        if not self.apply(prefix):
+            return []
+        index, values = self.branches()
+        if index is None:
+            return [prefix]
+        result = []
+        for v in values:
+            undo = self.place(index, v)
+            if undo is not None:
+                self.unplace(undo)
+                result.append(tuple(prefix) + ((index, v),))
+        return result
+
+    def candidates(self, index):
+        """ماسک واریانت‌هایی که با گوشه‌های رنگ‌شده خانه index جور هستند."""
+        mask = self.available
+        colours = self.colours
+        corner_masks = self.corner_masks
+        for corner, vertex in enumerate(self.cell_vertices[index]):
+            colour = colours[vertex]
+            if colour >= 0:
+                mask &= corner_masks[corner][colour]
+        return mask
+
+    def place(self, index, v):
+        """واریانت v را در خانه index می‌گذارد؛ اطلاعات برگشت یا None (بن‌بست) برمی‌گرداند."""
+        type_id = self.variant_type[v]
+        colours = self.colours
+        open_cells = self.open_cells
+        demand = self.demand
+        supply = self.supply
+        for colour, count in enumerate(self.type_supply[type_id]):
+            supply[colour] -= count
+        coloured = []
+        quads = self.variant_quads[v]
+        for vertex, colour in zip(self.cell_vertices[index], quads):
+            open_cells[vertex] -= 1
+            if colours[vertex] < 0:
+                colours[vertex] = colour
+                coloured.append(vertex)
+                demand[colour] += open_cells[vertex]
+            else:
+                demand[colour] -= 1
+        ok = True
+        for colour in quads:
+            if demand[colour] > supply[colour]:
+                ok = False
+                break
+        if ok:
+            for colour in self.type_colours[type_id]:
+                if demand[colour] > supply[colour]:
+                    ok = False
+                    break
+        pair_demand = self.pair_demand
+        pair_supply = self.pair_supply
+        n = self.n_colours
+        touched = []
+        for pair, count in self.type_pairs[type_id]:
+            pair_supply[pair] -= count
+            touched.append(pair)
+        free_cells = self.free_cells
+        for other, first, second in self.cell_links[index]:
+            if other in free_cells:
+                # همسایه باید همین لبه را در جهت مخالف داشته باشد
+                pair = quads[second] * n + quads[first]
+                pair_demand[pair] += 1
+                touched.append(pair)
+            else:
+                pair_demand[quads[first] * n + quads[second]] -= 1
+        if ok:
+            for pair in touched:
+                if pair_demand[pair] > pair_supply[pair]:
+                    ok = False
+                    break
+        self.remaining[type_id] -= 1
+        if not self.remaining[type_id]:
+            self.available &= ~self.type_mask[type_id]
+        self.free_cells.discard(index)
+        self.assignment[index] = v
+        undo = (index, v, coloured)
+        if not ok:
+            self.unplace(undo)
+            return None
+        return undo
+
+    def unplace(self, undo):
+        index, v, coloured = undo
+        type_id = self.variant_type[v]
+        del self.assignment[index]
+        self.free_cells.add(index)
+        if not self.remaining[type_id]:
+            self.available |= self.type_mask[type_id]
+        self.remaining[type_id] += 1
+        for vertex, colour in zip(self.cell_vertices[index], self.variant_quads[v]):
+            if vertex in coloured:
+                self.demand[colour] -= self.open_cells[vertex]
+                self.colours[vertex] = -1
+            else:
+                self.demand[colour] += 1
+            self.open_cells[vertex] += 1
+        for colour, count in enumerate(self.type_supply[type_id]):
+            self.supply[colour] += count
+        quads = self.variant_quads[v]
+        n = self.n_colours
+        for pair, count in self.type_pairs[type_id]:
+            self.pair_supply[pair] += count
+        for other, first, second in self.cell_links[index]:
+            if other in self.free_cells:
+                self.pair_demand[quads[second] * n + quads[first]] -= 1
+            else:
+                self.pair_demand[quads[first] * n + quads[second]] += 1
+
+    def _choose(self):
+        """خانه با کمترین گزینه (MRV)؛ (None، 0) اگر خانه‌ای نمانده و (خانه، 0) در بن‌بست."""
+        best = None
+        best_mask = 0
+        best_count = None
+        unconstrained = None
+        colours = self.colours
+        for index in self.free_cells:
+            constrained = False
+            for vertex in self.cell_vertices[index]:
+                if colours[vertex] >= 0:
+                    constrained = True
+                    break
+            if not constrained:
+                if unconstrained is None:
+                    unconstrained = index
+                continue
+            mask = self.candidates(index)
+            count = _popcount(mask)
+            if not count:
+                return index, 0
+            if best_count is None or count < best_count:
+                best, best_mask, best_count = index, mask, count
+                if count == 1:
+                    break
+        if best is None and unconstrained is not None:
+            return unconstrained, self.available
+        return best, best_mask
+
+    def _search(self, budget, should_stop):
+        """جستجوی عمق‌اول؛ True اگر جواب پیدا شد، None اگر بودجه تمام یا جستجو متوقف شد."""
+        self.nodes += 1
+        if budget is not None and self.nodes > budget:
+            return None
+        index, mask = self._choose()
+        if index is None:
+            return True
+        if not mask:
+            return False
+        if should_stop is not None and not self.nodes & 255 and should_stop():
+            return None
+        values = _bits(mask)
+        if self._rng is not None and len(values) > 1:
+            self._rng.shuffle(values)
+        for v in values:
+            undo = self.place(index, v)
+            if undo is None:
+                continue
+            found = self._search(budget, should_stop)
+            if found or found is None:
+                return found
+            self.unplace(undo)
+        return False
+
+    def placements(self, assignment=None):
+        """تبدیل واریانت‌های انتخاب‌شده به کارت‌های مشخص با چرخش و طرف."""
+        assignment = self.assignment if assignment is None else assignment
+        pools = [list(card_ids) for card_ids in self.type_cards]
+        result = []
+        for index in sorted(assignment):
+            v = assignment[index]
+            card_id = pools[self.variant_type[v]].pop(0)
+            turns = (self.variant_turns[v] + self.card_offset[card_id]) % 4
+            result.append(Placement(index, card_id, turns, self.variant_face_up[v]))
+        return result
+
+    def search(self, prefix=(), budget=None, should_stop=None, seed=None):
+        """یک دور جستجو در زیردرخت پیشوند prefix با سقف budget گره.
+
+        True اگر جواب پیدا شد (در assignment)، False اگر زیردرخت جواب ندارد و
+        None اگر بودجه تمام یا جستجو متوقف شد.
+        """
+        if seed is not None:
+            self._rng = random.Random(seed)
+        self.nodes = 0
+        if not self.apply(prefix):
+            return False
+        return self._search(budget, should_stop)
+
+    def solve(self, should_stop=None, seed=0, prefix=()):
+        """یک چیدمان کامل برمی‌گرداند، یا None اگر پازل (یا زیردرخت prefix) جواب ندارد.
+
+        جستجو با بودجه گره رو به افزایش و ترتیب تصادفی مقادیر از نو شروع می‌شود
+        تا زمان حل به شاخه‌های بد اولیه وابسته نباشد؛ آخرین دور بدون بودجه است.
+        """
+        started = time.perf_counter()
+        self._rng = random.Random(seed)
+        self.restarts = 0
+        total = 0
+        result = None
+        budget = RESTART_BASE
+        if len(self.cards) >= self.cols * self.rows:
+            while True:
+                limit = budget if budget < RESTART_LIMIT else None
+                found = self.search(prefix, limit, should_stop)
+                total += self.nodes
+                if found:
+                    result = self.placements()
+                    break
+                if found is False or limit is None:
+                    break
+                if should_stop is not None and should_stop():
+                    break
+                self.restarts += 1
+                budget *= RESTART_GROWTH
+        self.nodes = total
+        self.elapsed = time.perf_counter() - started
+        return result
+
+
+def solve(cards, cols, rows=None):
+    return Solver(cards, cols, rows).solve()
+
+
+def default_colors(cols, rows=None):
+    """تعداد رنگ پیش‌فرض برای پازل تصادفی.
+
+    با رنگ‌های کم، پازل‌های بزرگ چیدمان‌های نیمه‌درست فراوانی دارند و زمان حل
+    بسیار پراکنده می‌شود؛ تعداد رنگ‌ها با مساحت صفحه زیاد می‌شود.
+    """
+    rows = cols if rows is None else rows
+    n_colors = 4
+    while n_colors ** 3 < 16 * cols * rows:
+        n_colors += 1
+    return n_colors
+
+
+def random_puzzle(cols, rows=None, n_colors=None, n_back_colors=4, seed=None):
+    """یک مجموعه کارت حل‌پذیر تصادفی می‌سازد.
+
+    ابتدا به هر گوشه شبکه یک رنگ داده می‌شود (ربع‌هایی که در یک گوشه به هم
+    می‌رسند باید هم‌رنگ باشند)، سپس کارت‌ها بریده، چرخانده و بُر زده می‌شوند.
+    """
+    rows = cols if rows is None else rows
+    if n_colors is None:
+        n_colors = default_colors(cols, rows)
+    rng = random.Random(seed)
+    # رنگ‌های پشت نباید با رنگ‌های رو یکی شوند
+    back_base = max(BACK_COLOR_BASE, n_colors)
+    corners = [
+        [rng.randrange(n_colors) for _ in range(cols + 1)] for _ in range(rows + 1)
+    ]
+    cards = []
+    for row in range(rows):
+        for col in range(cols):
+            face = (
+                corners[row + 1][col],
+                corners[row + 1][col + 1],
+                corners[row][col + 1],
+                corners[row][col],
+            )
+            back = (back_base + rng.randrange(n_back_colors),) * 4
+            cards.append(Card(rotate_quadrants(face, rng.randrange(4)), back))
+    rng.shuffle(cards)
+    return cards
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or [2, 3, 4, 6, 8]
+    for size in sizes:
+        n_colors = default_colors(size)
+        cards = random_puzzle(size, n_colors=n_colors, seed=size)
+        solver = Solver(cards, size)
+        result = solver.solve()
+        status = "ok" if result and check_solution(cards, size, size, result) else "FAILED"
+        print(
+            "%dx%d (%d colors): %s in %.4fs (%d nodes, %d restarts)"
+            % (size, size, n_colors, status, solver.elapsed, solver.nodes, solver.restarts)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# sound_bank.py
+from kivy.core.audio import SoundLoader
+from kivy.logger import Logger
+
+# افکت‌های صوتی بازی (نام ← مسیر فایل)
+SOUND_FILES = {
+    "flip": "assets/sounds/flip.wav",
+    "rotate": "assets/sounds/rotate.wav",
+    "return": "assets/sounds/return.wav",
+    "reset": "assets/sounds/reset.wav",
+    "drop": "assets/sounds/drop.wav",
+}
+
+# حداکثر تعداد نسخه‌های هم‌زمان از یک افکت
+MAX_VOICES = 2
+
+
+class SoundBank(object):
+    """بانک صوتی مشترک: هر افکت یک‌بار بارگذاری می‌شود و بین همه کارت‌ها مشترک است."""
+
+    def __init__(self, files=None, max_voices=MAX_VOICES):
+        self.files = dict(SOUND_FILES if files is None else files)
+        self.max_voices = max(1, max_voices)
+        self._voices = {}
+        self._next_voice = {}
+        # شمارنده‌ها برای اطمینان از اینکه ساخت صفحه‌ها هیچ I/O صوتی ندارد
+        self.loads = 0
+        self.hits = 0
+
+    def _load(self, name):
+        path = self.files.get(name)
+        if path is None:
+            return None
+        self.loads += 1
+        return SoundLoader.load(path)
+
+    def _voices_for(self, name):
+        voices = self._voices.get(name)
+        if voices is None:
+            sound = self._load(name)
+            voices = [sound] if sound else []
+            self._voices[name] = voices
+            self._next_voice[name] = 0
+        else:
+            self.hits += 1
+        return voices
+
+    def preload(self, names=None):
+        """بارگذاری پیشاپیش افکت‌ها (پیش‌فرض: همه)."""
+        for name in self.files if names is None else names:
+            if name not in self._voices:
+                self._voices_for(name)
+
+    def add(self, name, sound):
+        """افکتی که بیرون از بانک (مثلاً در نخ پس‌زمینه) بارگذاری شده را ثبت می‌کند.
+
+        sound=None یعنی بارگذاری ناموفق بوده؛ افکت بی‌صدا ثبت می‌شود تا play دیگر
+        آن را در نخ اصلی از نو بارگذاری نکند.
+        """
+        if name in self._voices:
+            return
+        self.loads += 1
+        if sound is None:
+            Logger.warning("SoundBank: %s could not be loaded, playing silently" % name)
+        self._voices[name] = [sound] if sound else []
+        self._next_voice[name] = 0
+
+    def get(self, name):
+        """هندل مشترک اولین نسخه از افکت را برمی‌گرداند (یا None)."""
+        voices = self._voices_for(name)
+        return voices[0] if voices else None
+
+    def play(self, name):
+        voices = self._voices_for(name)
+        if not voices:
+            return None
+        for sound in voices:
+            if sound.state != "play":
+                sound.play()
+                return sound
+        # همه نسخه‌ها در حال پخش‌اند → تا سقف مجاز نسخه جدید بساز
+        if len(voices) < self.max_voices:
+            sound = self._load(name)
+            if sound:
+                voices.append(sound)
+                sound.play()
+                return sound
+        # به سقف رسیده‌ایم → قدیمی‌ترین نسخه را از نو پخش کن
+        index = self._next_voice[name] % len(voices)
+        self._next_voice[name] = index + 1
+        sound = voices[index]
+        sound.stop()
+        sound.play()
+        return sound
+
+    def stats(self):
+        return {
+            "loads": self.loads,
+            "hits": self.hits,
+            "voices": dict((name, len(v)) for name, v in self._voices.items()),
+        }
+
+
+# بانک سراسری مشترک در کل برنامه
+SOUND_BANK = SoundBank()
@@ -0,0 +1,11 @@
+# tests/conftest.py
+import os
+import sys
+
+# اجرای بدون پنجره و بدون خواندن آرگومان‌های pytest توسط Kivy
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+os.environ.setdefault("KIVY_AUDIO", "")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,94 @@
+# tests/test_board.py
+import numpy as np
+import pytest
+
+from board import OFF_BOARD, BoardModel
+
+
+def new_board():
+    return BoardModel(3, 2, [0, 0, 1, 1, 2, 2])
+
+
+def test_place_remove_keep_both_directions_in_sync():
+    board = new_board()
+    board.place(0, 4)
+    board.place(0, 1)
+    assert board.cell_of(0) == 1
+    assert board.card_in(1) == 0 and board.card_in(4) is None
+    with pytest.raises(ValueError):
+        board.place(1, 1)
+    board.place(3, 5)
+    assert board.placed() == [(1, 0), (5, 3)]
+    assert board.remove(0) == 1
+    assert board.remove(0) is None
+    assert board.clear() == [3]
+    assert (board.cell == OFF_BOARD).all() and (board.occupant == OFF_BOARD).all()
+
+
+def test_turns_and_face():
+    board = new_board()
+    board.rotate(2, 3)
+    board.rotate(2, 2)
+    assert int(board.turns[2]) == 1
+    board.set_turns(2, -1)
+    assert int(board.turns[2]) == 3
+    board.flip(4)
+    board.set_face_up(5, 0)
+    assert board.face_up.tolist() == [True, True, True, True, False, False]
+
+
+def test_copy_is_independent():
+    board = new_board()
+    board.place(2, 3)
+    board.rotate(2)
+    board.flip(4)
+    other = board.copy()
+    assert other == board
+    for name in ("cell", "occupant", "turns", "face_up", "back_color"):
+        assert not np.shares_memory(getattr(other, name), getattr(board, name))
+
+    other.place(1, 0)
+    other.rotate(2)
+    assert other != board
+    assert board.cell_of(1) is None
+    assert board.card_in(0) is None
+    assert int(board.turns[2]) == 1
+    assert other.placed() == [(0, 1), (3, 2)]
+    assert board.placed() == [(3, 2)]
+
+
+def test_watchers_see_every_cell_change():
+    board = new_board()
+    seen = []
+    board.watchers.append(seen.append)
+    board.place(0, 4)
+    board.place(0, 1)
+    assert seen == [4, 4, 1]
+    del seen[:]
+    board.rotate(0)
+    board.set_turns(0, 1)
+    board.flip(0)
+    board.set_face_up(0, False)
+    assert seen == [1, 1]
+    del seen[:]
+    # کارت بیرون از صفحه خانه‌ای را تغییر نمی‌دهد
+    board.rotate(3)
+    board.flip(3)
+    assert seen == []
+    board.place(3, 5)
+    board.remove(0)
+    assert seen == [5, 1]
+    del seen[:]
+    assert board.clear() == [3]
+    assert seen == [5]
+
+
+def test_copy_and_equality_ignore_watchers():
+    board = new_board()
+    seen = []
+    board.watchers.append(seen.append)
+    other = board.copy()
+    assert other.watchers == []
+    assert other == board
+    other.place(1, 0)
+    assert seen == []
@@ -0,0 +1,54 @@
+# tests/test_card_widget.py
+from kivy.clock import Clock
+
+from components import CardWidget
+
+
+def instructions(group):
+    """همه دستورات گرافیکی یک canvas، شامل گروه‌های تو در تو."""
+    found = []
+    for instruction in group.children:
+        found.append(instruction)
+        if hasattr(instruction, "children"):
+            found.extend(instructions(instruction))
+    return found
+
+
+def test_redraws_update_instructions_in_place():
+    card = CardWidget()
+    Clock.tick()
+    face_up = instructions(card.canvas)
+    card.face_up = False
+    Clock.tick()
+    face_down = instructions(card.canvas)
+    assert len(face_up) != len(face_down)
+    for i in range(20):
+        card.pos = (i * 7, i * 3)
+        card.size = (60 + i, 60 + i)
+        card.angle = (i * 90) % 360
+        card.face_up = bool(i % 2)
+        card.selected = bool(i % 3)
+        Clock.tick()
+        # فقط گروه رو یا پشت در جایگاهش عوض می‌شود؛ هیچ دستوری ساخته نمی‌شود
+        expected = face_up if card.face_up else face_down
+        assert [id(x) for x in instructions(card.canvas)] == [id(x) for x in expected]
+
+
+def test_property_changes_in_one_frame_redraw_once():
+    card = CardWidget()
+    Clock.tick()
+    before = card.redraw_count
+    for frame in range(5):
+        card.pos = (frame, frame)
+        card.size = (70, 70)
+        card.angle = 90 * frame
+        card.face_up = not card.face_up
+        card.selected = not card.selected
+        card.card_color = [frame / 5.0, 0, 0, 1]
+        card.scale_x = 0.5
+        Clock.tick()
+    assert card.redraw_count - before == 5
+    assert card.redraw_stats()["per_frame_max"] == 1
+    # فریم بدون تغییر بازرسمی ندارد
+    Clock.tick()
+    assert card.redraw_count - before == 5
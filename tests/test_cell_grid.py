@@ -0,0 +1,108 @@
+# tests/test_cell_grid.py
+import numpy as np
+import pytest
+
+from board import BoardModel
+from cell_grid import CellGrid
+
+ORIGIN = (10.0, 20.0)
+CELL_SIZE = 30.0
+
+
+def center_distance(grid, index, x, y):
+    cx, cy = grid.cell_pos(index)
+    half = grid.cell_size / 2.0
+    return (cx + half - x) ** 2 + (cy + half - y) ** 2
+
+
+def brute_force_nearest(grid, x, y):
+    free = [i for i in range(grid.cols * grid.rows) if grid.is_free(i)]
+    if not free:
+        return None
+    return min(center_distance(grid, i, x, y) for i in free)
+
+
+@pytest.mark.parametrize("cols, rows", [(2, 2), (3, 3), (6, 6), (12, 12), (5, 3)])
+def test_nearest_free_matches_brute_force(cols, rows):
+    rng = np.random.default_rng(cols * 100 + rows)
+    board = BoardModel(cols, rows, [0] * (cols * rows))
+    grid = CellGrid(board)
+    grid.set_geometry(ORIGIN[0], ORIGIN[1], CELL_SIZE)
+    width, height = cols * CELL_SIZE, rows * CELL_SIZE
+    for fill in range(cols * rows + 1):
+        for _ in range(20):
+            # نقطه‌ها گاهی بیرون از صفحه هم هستند
+            x = ORIGIN[0] + rng.uniform(-0.5, 1.5) * width
+            y = ORIGIN[1] + rng.uniform(-0.5, 1.5) * height
+            index = grid.nearest_free(x, y)
+            best = brute_force_nearest(grid, x, y)
+            if best is None:
+                assert index is None
+            else:
+                assert grid.is_free(index)
+                row, col = grid.cell_at(x, y)
+                if grid.is_free(grid.index_of(row, col)):
+                    # خانه زیر نقطه اگر خالی باشد همیشه انتخاب می‌شود
+                    assert index == grid.index_of(row, col)
+                else:
+                    assert center_distance(grid, index, x, y) == pytest.approx(best)
+        if fill < cols * rows:
+            free = np.flatnonzero(board.occupant < 0)
+            grid.place(fill, int(free[rng.integers(free.size)]))
+
+
+def test_nearest_free_without_geometry():
+    board = BoardModel(3, 3, [0] * 9)
+    grid = CellGrid(board)
+    assert grid.nearest_free(5.0, 5.0) is None
+
+
+def assert_index_consistent(grid):
+    board = grid.board
+    for card in range(board.n_cards):
+        index = grid.slot_of(card)
+        if index is not None:
+            assert grid.card_in(index) == card
+    for index in range(grid.cols * grid.rows):
+        card = grid.card_in(index)
+        if card is not None:
+            assert grid.slot_of(card) == index
+    free = [grid.row_col(i) for i in range(grid.cols * grid.rows) if grid.is_free(i)]
+    assert grid._free_cols == [
+        [col for row, col in free if row == r] for r in range(grid.rows)
+    ]
+    assert grid.free_count == len(free)
+
+
+def test_place_remove_keep_both_directions_in_sync():
+    rng = np.random.default_rng(7)
+    board = BoardModel(4, 4, [0] * 16)
+    grid = CellGrid(board)
+    for _ in range(500):
+        card = int(rng.integers(board.n_cards))
+        action = rng.integers(4)
+        if action == 0:
+            index = grid.slot_of(card)
+            assert grid.remove(card) == index
+        elif action == 1 and rng.random() < 0.05:
+            placed = grid.placed()
+            assert grid.clear() == [c for _, c in placed]
+        else:
+            free = np.flatnonzero(board.occupant < 0)
+            if free.size:
+                grid.place(card, int(free[rng.integers(free.size)]))
+        assert_index_consistent(grid)
+
+
+def test_place_into_occupied_cell_raises():
+    board = BoardModel(2, 2, [0] * 4)
+    grid = CellGrid(board)
+    grid.place(0, 3)
+    with pytest.raises(ValueError):
+        grid.place(1, 3)
+    # گذاشتن دوباره همان کارت در همان خانه تغییری نمی‌دهد
+    grid.place(0, 3)
+    assert grid.slot_of(0) == 3
+    assert grid.remove(0) == 3
+    assert grid.remove(0) is None
+    assert_index_consistent(grid)
@@ -0,0 +1,100 @@
+# tests/test_game.py
+import time
+
+import pytest
+from kivy.clock import Clock
+
+from game import GameScreen
+from move_log import FLIP
+
+
+def run_frames(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        Clock.tick()
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def game():
+    screen = GameScreen(name="game_2x2")
+    Clock.tick()
+    game = screen.game
+    card = game.all_cards[0]
+    game._set_card_state(card, 0, 0, True)
+    return game
+
+
+def test_double_flip_during_animation_is_one_move(game):
+    card = game.selected_card
+    game.flip_selected(None)
+    game.flip_selected(None)
+    run_frames(0.5)
+    assert not card.flipping
+    assert not card.face_up
+    records = game.moves.applied()
+    assert len(records) == 1
+    assert records[0]["kind"] == FLIP
+    assert bool(records[0]["old_face_up"]) and not bool(records[0]["new_face_up"])
+
+
+def test_undo_during_flip_keeps_log_and_board_in_step(game):
+    card = game.selected_card
+    game.flip_selected(None)
+    run_frames(0.5)
+    assert not card.face_up
+    # flip دوم پیش از رسیدن به میانه انیمیشن با undo قطع می‌شود
+    game.flip_selected(None)
+    Clock.tick()
+    game.undo()
+    run_frames(0.5)
+    assert card.face_up and bool(game.board.face_up[0])
+    assert not card.flipping
+    assert len(game.moves.applied()) == 0
+    assert game.moves.can_redo
+    game.redo()
+    assert not game.board.face_up[0]
+
+
+class Touch(object):
+    """لمس ساده برای فراخوانی مستقیم on_touch_down/on_touch_up ویجت‌ها."""
+
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+        self.pos = (x, y)
+
+
+def tap(card):
+    touch = Touch(*card.center)
+    assert card.on_touch_down(touch)
+    assert card.on_touch_up(touch)
+
+
+def test_selection_stays_inside_the_owning_game():
+    screens = [GameScreen(name="game_4x4"), GameScreen(name="game_4x4")]
+    for screen in screens:
+        screen.size = (900, 500)
+    for _ in range(3):
+        Clock.tick()
+    first, second = [screen.game for screen in screens]
+    a0, a1 = first.all_cards[0], first.all_cards[1]
+    b0 = second.all_cards[0]
+    first.main_section.place_card(a0, 0)
+    first.main_section.place_card(a1, 1)
+    second.main_section.place_card(b0, 0)
+    assert a0.game is first and b0.game is second
+
+    tap(a0)
+    assert first.selected_card is a0 and a0.selected
+    assert first.board.cell_of(0) == 0
+    second.select_card(b0)
+    assert first.selected_card is a0 and a0.selected
+    tap(a1)
+    assert first.selected_card is a1
+    assert a1.selected and not a0.selected
+    assert second.selected_card is b0 and b0.selected
+
+    first.return_selected(None)
+    assert first.selected_card is None and not a1.selected
+    assert first.board.cell_of(1) is None
+    assert second.selected_card is b0 and b0.selected
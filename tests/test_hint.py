@@ -0,0 +1,64 @@
+# tests/test_hint.py
+from hint import Hint, compute_hint, local_hint
+from levels import LEVELS_BY_NAME, level_cards
+from solver import Solver, edges, oriented_quadrants
+
+LEVEL = LEVELS_BY_NAME["game_4x4"]
+
+
+def solution_placements():
+    cards = level_cards(LEVEL)
+    solution = Solver(cards, LEVEL.cols, LEVEL.rows).solve()
+    return cards, [(p.cell, p.card, p.turns, p.face_up) for p in solution]
+
+
+def fits(cards, fixed, hint):
+    placed = dict(
+        (index, edges(oriented_quadrants(cards[card], turns, face_up)))
+        for index, card, turns, face_up in fixed
+    )
+    left, right, bottom, top = edges(oriented_quadrants(cards[hint.card], hint.turns, hint.face_up))
+    cols = LEVEL.cols
+    row, col = divmod(hint.cell, cols)
+    checks = [
+        (col > 0, hint.cell - 1, 1, left),
+        (col + 1 < cols, hint.cell + 1, 0, right),
+        (row > 0, hint.cell - cols, 3, bottom),
+        (row + 1 < LEVEL.rows, hint.cell + cols, 2, top),
+    ]
+    return all(
+        placed[other][side] == edge
+        for inside, other, side, edge in checks
+        if inside and other in placed
+    )
+
+
+def test_hint_completes_solvable_board():
+    cards, fixed = solution_placements()
+    hint = compute_hint(cards, LEVEL.cols, LEVEL.rows, tuple(fixed[:5]))
+    assert isinstance(hint, Hint)
+    assert hint.cell not in [index for index, _, _, _ in fixed[:5]]
+    assert fits(cards, fixed[:5], hint)
+
+
+def test_hint_falls_back_to_local_consistency():
+    cards, fixed = solution_placements()
+    # دو کارت گوشه جابه‌جا: با این کارت‌ها دیگر جواب کاملی وجود ندارد
+    a, b = fixed[0], fixed[-1]
+    broken = [(a[0], b[1], b[2], b[3]), (b[0], a[1], a[2], a[3])]
+    solver = Solver(cards, LEVEL.cols, LEVEL.rows)
+    prefix = [
+        (index, solver.variant_for(card, turns, face_up))
+        for index, card, turns, face_up in broken
+    ]
+    assert solver.solve(prefix=prefix) is None
+    hint = compute_hint(cards, LEVEL.cols, LEVEL.rows, tuple(broken))
+    assert hint == local_hint(cards, LEVEL.cols, LEVEL.rows, tuple(broken))
+    assert hint is not None
+    assert fits(cards, broken, hint)
+
+
+def test_no_hint_on_full_board():
+    cards, fixed = solution_placements()
+    assert compute_hint(cards, LEVEL.cols, LEVEL.rows, tuple(fixed)) is None
+    assert local_hint(cards, LEVEL.cols, LEVEL.rows, tuple(fixed)) is None
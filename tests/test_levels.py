@@ -0,0 +1,33 @@
+# tests/test_levels.py
+import pytest
+
+from board import BoardModel
+from levels import LEVELS, card_back_colors, level_cards
+from solver import Solver, check_solution
+from validator import EdgeValidator
+
+
+@pytest.mark.parametrize("level", LEVELS, ids=lambda level: level.name)
+def test_level_is_solvable(level):
+    cards = level_cards(level)
+    assert len(cards) == level.cols * level.rows
+    solution = Solver(cards, level.cols, level.rows).solve()
+    assert solution is not None
+    assert check_solution(cards, level.cols, level.rows, solution)
+
+    # همان چیدمان روی BoardModel باید برای EdgeValidator کامل باشد
+    board = BoardModel(level.cols, level.rows, card_back_colors(level))
+    validator = EdgeValidator(board, cards)
+    for p in solution:
+        board.place(p.card, p.cell)
+        board.set_turns(p.card, p.turns)
+        board.set_face_up(p.card, p.face_up)
+    assert validator.complete
+    assert validator.mismatches == 0
+
+
+def test_level_cards_are_stable():
+    level = LEVELS[2]
+    assert level_cards(level) == level_cards(level)
+    assert level_cards(level, seed=1) != level_cards(level, seed=2)
+    assert level_cards(level._replace(cards=tuple(level_cards(level, seed=1)))) == level_cards(level, seed=1)
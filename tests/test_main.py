@@ -0,0 +1,46 @@
+# tests/test_main.py
+from kivy.clock import Clock
+from kivy.uix.screenmanager import NoTransition, Screen
+
+from board import OFF_BOARD
+from game import GameScreen
+from main import LazyScreenManager
+from move_log import MOVE
+
+
+def test_evicted_screen_keeps_its_undo_history():
+    manager = LazyScreenManager(
+        factories={"game_4x4": GameScreen, "game_6x6": GameScreen},
+        transition=NoTransition(),
+        max_live_screens=1,
+    )
+    manager.add_widget(Screen(name="launcher"))
+    manager.current = "game_4x4"
+    Clock.tick()
+    game = manager.get_screen("game_4x4").game
+    card = game.all_cards[5]
+    old_state = game.card_state(card)
+    game.main_section.place_card(card, 6)
+    game.select_card(card)
+    game.record_move(MOVE, card, old_state)
+    game.rotate_selected(None)
+    moves = game.moves.applied().tolist()
+
+    # با یک صفحه زنده، رفتن (از لانچر) به مرحله دیگر صفحه قبلی را آزاد می‌کند
+    for name in ("launcher", "game_6x6"):
+        manager.current = name
+        Clock.tick()
+    assert not manager.has_screen("game_4x4")
+    manager.current = "game_4x4"
+    Clock.tick()
+    game = manager.get_screen("game_4x4").game
+    assert game.board.cell_of(5) == 6 and int(game.board.turns[5]) == 1
+    assert game.moves.applied().tolist() == moves
+
+    game.undo()
+    assert int(game.board.turns[5]) == 0
+    game.undo()
+    assert game.board.cell[5] == OFF_BOARD
+    game.redo()
+    game.redo()
+    assert game.board.cell_of(5) == 6 and int(game.board.turns[5]) == 1
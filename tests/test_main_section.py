@@ -0,0 +1,43 @@
+# tests/test_main_section.py
+from kivy.clock import Clock
+
+from game import GameScreen
+
+
+def test_resizes_in_one_frame_rebuild_once_and_keep_cards():
+    screen = GameScreen(name="game_4x4")
+    game = screen.game
+    main_section = game.main_section
+    screen.size = (900, 500)
+    # چیدمان اولیه Game و سایدبار چند فریم طول می‌کشد
+    for _ in range(3):
+        Clock.tick()
+    for card_id, index in ((0, 0), (5, 6), (9, 15)):
+        main_section.place_card(game.all_cards[card_id], index)
+    placed = main_section.grid.placed()
+
+    calls = []
+    set_geometry = main_section.grid.set_geometry
+
+    def counting_set_geometry(*args):
+        calls.append(args)
+        set_geometry(*args)
+
+    main_section.grid.set_geometry = counting_set_geometry
+    # تغییرات پشت‌سرهم اندازه پنجره در یک فریم (چیدمان Game اندازه سکشن را عوض می‌کند)
+    for step in range(1, 6):
+        screen.size = (900 + 40 * step, 500 + 20 * step)
+    assert calls == []
+    for _ in range(3):
+        Clock.tick()
+    assert len(calls) == 1
+
+    grid = main_section.grid
+    width, height = main_section.size
+    assert (width, height) != (0, 0)
+    assert grid.cell_size == min(width / 4.0, height / 4.0)
+    assert grid.placed() == placed
+    for index, card_id in placed:
+        card = game.all_cards[card_id]
+        assert tuple(card.pos) == grid.cell_pos(index)
+        assert tuple(card.size) == (grid.cell_size, grid.cell_size)
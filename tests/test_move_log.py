@@ -0,0 +1,64 @@
+# tests/test_move_log.py
+from move_log import MOVE, RESET, ROTATE, MoveLog
+
+SIZE = 8
+
+
+def record_moves(log, first, count):
+    for card in range(first, first + count):
+        log.record(MOVE, card, -1, card, 0, 0, True, True)
+
+
+def test_overflow_keeps_newest_moves():
+    log = MoveLog(SIZE)
+    record_moves(log, 0, 3 * SIZE + 3)
+    assert len(log) == SIZE
+    assert not log.can_redo
+    kept = []
+    while log.can_undo:
+        kept.append(log.undo()[0].card)
+    assert kept[::-1] == list(range(2 * SIZE + 3, 3 * SIZE + 3))
+
+
+def test_undo_redo_after_overflow():
+    log = MoveLog(SIZE)
+    record_moves(log, 0, SIZE + 5)
+    undone = []
+    while log.can_undo:
+        move, _ = log.undo()
+        undone.append(move.card)
+    assert undone == list(range(SIZE + 4, 4, -1))
+    assert log.undo() is None
+
+    redone = []
+    while log.can_redo:
+        move, _ = log.redo()
+        redone.append(move.card)
+    assert redone == list(range(5, SIZE + 5))
+    assert log.redo() is None
+
+
+def test_record_after_undo_drops_redo_tail():
+    log = MoveLog(SIZE)
+    record_moves(log, 0, SIZE + 2)
+    log.undo()
+    log.undo()
+    log.record(ROTATE, 99, 0, 0, 0, 1, True, True)
+    assert not log.can_redo
+    assert len(log) == SIZE - 1
+    assert log.undo()[0].card == 99
+
+
+def test_snapshots_are_dropped_with_their_records():
+    log = MoveLog(SIZE)
+    log.record(RESET, snapshot=b"first")
+    record_moves(log, 0, SIZE - 1)
+    assert len(log.snapshots) == 1
+    record_moves(log, SIZE, 1)
+    assert log.snapshots == {}
+
+    log.record(RESET, snapshot=b"second")
+    assert log.undo()[1] == b"second"
+    # رکورد تازه جای ریست undoشده را می‌گیرد و وضعیتش باید حذف شود
+    record_moves(log, 0, 1)
+    assert log.snapshots == {}
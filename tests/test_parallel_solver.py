@@ -0,0 +1,25 @@
+# tests/test_parallel_solver.py
+import multiprocessing
+
+import parallel_solver
+from parallel_solver import ParallelSolver
+from solver import check_solution, random_puzzle
+
+
+def test_workers_are_clamped_to_cpu_count():
+    cards = random_puzzle(6, seed=0)
+    assert ParallelSolver(cards, 6, workers=1000).workers == multiprocessing.cpu_count()
+    assert ParallelSolver(cards, 6, workers=0).workers == multiprocessing.cpu_count()
+
+
+def test_small_board_or_single_worker_solves_serially(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("no worker processes expected")
+
+    monkeypatch.setattr(parallel_solver.multiprocessing, "Pool", no_pool)
+    for size, workers in ((4, None), (6, 1)):
+        cards = random_puzzle(size, seed=1)
+        solver = ParallelSolver(cards, size, workers=workers)
+        result = solver.solve()
+        assert result is not None and check_solution(cards, size, size, result)
+        assert solver.nodes > 0
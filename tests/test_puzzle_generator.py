@@ -0,0 +1,40 @@
+# tests/test_puzzle_generator.py
+import json
+
+import pytest
+
+from levels import LEVELS_BY_NAME, level_cards, load_puzzle
+from puzzle_generator import generate_one
+from solver import Placement, check_solution
+
+
+def write_puzzles(path, puzzles):
+    with open(path, "w") as out:
+        for puzzle in puzzles:
+            out.write(json.dumps(puzzle) + "\n")
+
+
+def test_generated_puzzle_is_playable(tmp_path):
+    path = str(tmp_path / "puzzles.jsonl")
+    puzzles = [generate_one(("game_4x4", None, seed)) for seed in (1, 2)]
+    write_puzzles(path, puzzles)
+
+    level = load_puzzle(path, 1)
+    base = LEVELS_BY_NAME["game_4x4"]
+    assert level.name.startswith("game_4x4_") and level.name != base.name
+    assert (level.cols, level.rows, level.row_colors) == (base.cols, base.rows, base.row_colors)
+    cards = level_cards(level)
+    assert cards == level_cards(base, seed=2)
+    solution = [Placement(*p) for p in puzzles[1]["solution"]]
+    assert check_solution(cards, level.cols, level.rows, solution)
+
+
+def test_load_puzzle_rejects_foreign_cards(tmp_path):
+    path = str(tmp_path / "puzzles.jsonl")
+    puzzle = generate_one(("game_4x4", None, 1))
+    puzzle["cards"][0][1] = [99, 99, 99, 99]
+    write_puzzles(path, [puzzle])
+    with pytest.raises(ValueError):
+        load_puzzle(path)
+    with pytest.raises(ValueError):
+        load_puzzle(path, 5)
@@ -0,0 +1,23 @@
+# tests/test_replay.py
+import pytest
+
+import replay
+from levels import LEVELS_BY_NAME
+from move_log import MOVE, RESET
+
+
+@pytest.mark.parametrize("name", ["game_6x6", "game_12x12"])
+def test_widget_replay_matches_logic(name):
+    level = LEVELS_BY_NAME[name]
+    moves = replay.random_moves(level, 400, seed=3)
+    assert (moves["kind"] == MOVE).any()
+    _, board = replay.replay_logic(level, moves)
+    _, widget_board = replay.replay_widgets(level, moves)
+    assert widget_board == board
+
+
+@pytest.mark.parametrize("name", ["game_2x2", "game_6x6"])
+def test_random_moves_has_requested_length(name):
+    moves = replay.random_moves(LEVELS_BY_NAME[name], 300, seed=1)
+    assert len(moves) == 300
+    assert (moves["kind"] == RESET).any()
@@ -0,0 +1,78 @@
+# tests/test_savegame.py
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from board import BoardModel
+from levels import LEVELS, LEVELS_BY_NAME, card_back_colors, level_cards
+from savegame import SAVE_VERSION, decode_board, encode_board, load_board, save_board
+
+LEVEL = LEVELS_BY_NAME["game_4x4"]
+
+
+def random_board(level, rng):
+    """صفحه پر با جای‌گشت، چرخش و طرف تصادفی کارت‌ها."""
+    board = BoardModel(level.cols, level.rows, card_back_colors(level))
+    for card, index in enumerate(rng.permutation(level.cols * level.rows)[:board.n_cards]):
+        board.place(card, int(index))
+    board.turns[:] = rng.integers(0, 4, board.n_cards)
+    board.face_up[:] = rng.integers(0, 2, board.n_cards).astype(np.bool_)
+    return board
+
+
+@pytest.mark.parametrize("level", LEVELS, ids=lambda level: level.name)
+def test_round_trip(level):
+    rng = np.random.default_rng(level.cols)
+    cards = level_cards(level)
+    for _ in range(20):
+        board = random_board(level, rng)
+        # نیمی از کارت‌ها به سایدبار برمی‌گردند
+        for card in range(0, board.n_cards, 2):
+            board.remove(card)
+        decoded = decode_board(encode_board(board, cards), cards)
+        assert decoded == board
+        assert (decoded.occupant == board.occupant).all()
+
+
+def test_12x12_file_size():
+    level = LEVELS_BY_NAME["game_12x12"]
+    board = random_board(level, np.random.default_rng(0))
+    assert len(encode_board(board, level_cards(level))) == 286
+
+
+def test_corrupt_data_is_rejected():
+    cards = level_cards(LEVEL)
+    data = bytearray(encode_board(random_board(LEVEL, np.random.default_rng(0)), cards))
+    data[14] ^= 0x01
+    with pytest.raises(ValueError, match="checksum"):
+        decode_board(bytes(data), cards)
+    with pytest.raises(ValueError, match="truncated"):
+        decode_board(bytes(data[:6]), cards)
+
+
+def test_other_version_is_rejected():
+    cards = level_cards(LEVEL)
+    data = bytearray(encode_board(random_board(LEVEL, np.random.default_rng(0)), cards)[:-4])
+    data[2] = SAVE_VERSION - 1
+    # CRC درست است تا فقط نسخه رد شود
+    data = bytes(data) + struct.pack("<I", zlib.crc32(bytes(data)))
+    with pytest.raises(ValueError, match="version"):
+        decode_board(data, cards)
+
+
+def test_other_card_set_is_rejected():
+    # همان ابعاد و رنگ پشت‌ها، ولی روی کارت‌ها از seed دیگری
+    data = encode_board(random_board(LEVEL, np.random.default_rng(0)), level_cards(LEVEL))
+    with pytest.raises(ValueError, match="card set"):
+        decode_board(data, level_cards(LEVEL, seed=1))
+
+
+def test_save_and_load(tmp_path):
+    cards = level_cards(LEVEL)
+    board = random_board(LEVEL, np.random.default_rng(0))
+    path = str(tmp_path / "saves" / "game_4x4.sav")
+    assert load_board(path, cards) is None
+    save_board(board, cards, path)
+    assert load_board(path, cards) == board
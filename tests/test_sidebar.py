@@ -0,0 +1,116 @@
+# tests/test_sidebar.py
+from collections import Counter
+
+import pytest
+from kivy.clock import Clock
+from kivy.core.window import Window
+
+from components import CardWidget, SidebarRow, VirtualSidebar
+from game import GameScreen
+
+
+class Touch(object):
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+        self.pos = (x, y)
+
+
+def build(name, size=(900, 500)):
+    screen = GameScreen(name=name)
+    screen.size = size
+    for _ in range(3):
+        Clock.tick()
+    return screen.game
+
+
+def test_batch_return_lays_out_each_row_once(monkeypatch):
+    layouts = []
+    original = SidebarRow.do_layout
+
+    # هم‌نام متد اصلی، چون trigger چیدمان متد را با نامش از روی ویجت پیدا می‌کند
+    def do_layout(self, *args):
+        layouts.append(self)
+        original(self, *args)
+
+    # پیش از ساخت ردیف‌ها، تا trigger چیدمان هر ردیف همین تابع را صدا بزند
+    monkeypatch.setattr(SidebarRow, "do_layout", do_layout)
+    game = build("game_4x4")
+    rows = game.sidebar.rows
+    board = game.board
+    # کارت‌های ردیف‌های ۰ و ۲ روی صفحه می‌روند
+    moved = [card_id for card_id in range(board.n_cards) if int(board.back_color[card_id]) in (0, 2)]
+    for index, card_id in enumerate(moved):
+        game.main_section.place_card(game.all_cards[card_id], index)
+    Clock.tick()
+    del layouts[:]
+
+    game._return_all_cards()
+    Clock.tick()
+    assert Counter(id(row) for row in layouts) == Counter({id(rows[0]): 1, id(rows[2]): 1})
+    assert board.placed() == []
+    for card_id in range(board.n_cards):
+        card = game.all_cards[card_id]
+        assert card.parent is rows[int(board.back_color[card_id])]
+        assert card.in_sidebar and card.face_up
+        assert tuple(card.card_color) == tuple(rows[int(board.back_color[card_id])].row_color)
+
+
+def card_widgets(widget):
+    return sum(isinstance(w, CardWidget) for w in widget.walk())
+
+
+@pytest.fixture
+def virtual_game():
+    screen = GameScreen(name="game_12x12")
+    Window.add_widget(screen)
+    screen.size = (900, 500)
+    for _ in range(4):
+        Clock.tick()
+    yield screen.game
+    Window.remove_widget(screen)
+
+
+def test_virtual_sidebar_keeps_card_widgets_bounded(virtual_game):
+    game = virtual_game
+    sidebar = game.sidebar
+    assert isinstance(sidebar, VirtualSidebar)
+    row_list = sidebar.row_list
+    # ۱۲ ردیف در این ارتفاع جا نمی‌شوند
+    assert row_list.do_scroll_y
+    counts = []
+    for scroll_y in (1, 0.75, 0.5, 0.25, 0, 0.5, 1):
+        row_list.scroll_y = scroll_y
+        for _ in range(2):
+            Clock.tick()
+        counts.append(card_widgets(sidebar))
+        # فقط کارت‌های نمونه ردیف‌های دیده‌شده؛ هیچ کارتی از ۱۴۴ کارت ویجت ندارد
+        assert game.all_cards.live == 0
+    assert 0 < max(counts) <= len(sidebar.row_colors)
+    assert max(counts) * 10 < game.board.n_cards
+
+
+def test_card_picked_from_virtual_sidebar_drops_on_board(virtual_game):
+    game = virtual_game
+    sidebar = game.sidebar
+    grid = game.main_section.grid
+    row = 3
+    before = list(sidebar.counts)
+    view = next(v for v in sidebar.row_list.layout_manager.children if v.row_index == row)
+    card = sidebar.pick_card(row, *view.to_window(*view.center))
+    assert card is not None and card.dragging
+    assert int(game.board.back_color[card.card_id]) == row
+    Clock.tick()
+    assert sidebar.counts[row] == before[row] - 1
+
+    index = 17
+    x, y = grid.cell_pos(index)
+    half = grid.cell_size / 2.0
+    touch = Touch(x + half, y + half)
+    assert card.on_touch_up(touch)
+    Clock.tick()
+    assert game.board.cell_of(card.card_id) == index
+    assert card.parent is game.main_section and not card.in_sidebar
+    assert card.card_id not in sidebar.held
+    assert sidebar.counts[row] == before[row] - 1
+    assert game.all_cards.live == 1
+    assert game.selected_card is card
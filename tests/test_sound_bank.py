@@ -0,0 +1,37 @@
+# tests/test_sound_bank.py
+from kivy.clock import Clock
+
+from asset_loader import SOUND, AssetLoader
+from game import GameScreen
+from sound_bank import SOUND_BANK, SoundBank
+
+
+def test_building_game_screens_does_no_audio_io():
+    SOUND_BANK.preload()
+    loads = SOUND_BANK.loads
+    for _ in range(2):
+        hits = SOUND_BANK.hits
+        screen = GameScreen(name="game_4x4")
+        Clock.tick()
+        # ساخت صفحه و کارت‌ها هیچ افکتی بارگذاری یا حتی پیدا نمی‌کند
+        assert SOUND_BANK.loads == loads
+        assert SOUND_BANK.hits == hits
+        card = screen.game.all_cards[0]
+        card.play_drop_sound()
+        card.play_return_sound()
+        assert SOUND_BANK.hits == hits + 2
+    assert SOUND_BANK.loads == loads
+
+
+def test_failed_background_decode_is_not_retried_on_play():
+    bank = SoundBank(files={"flip": "assets/sounds/missing.wav"})
+    loader = AssetLoader(launcher_images=(), game_images=(), sound_bank=bank)
+    # نخ پس‌زمینه نتوانسته فایل را decode کند
+    loader._install(SOUND, "flip", bank.files["flip"], None)
+    loads = bank.loads
+    for _ in range(3):
+        assert bank.play("flip") is None
+        assert bank.get("flip") is None
+    # play هیچ بارگذاری تازه‌ای در نخ اصلی انجام نمی‌دهد
+    assert bank.loads == loads
+    assert bank.stats()["voices"] == {"flip": 0}
@@ -0,0 +1,50 @@
+# tests/test_stability.py
+import shutil
+
+import pytest
+from kivy.app import App
+from kivy.clock import Clock
+
+import bench
+from levels import LEVELS
+from main import MAX_LIVE_GAME_SCREENS
+
+
+@pytest.fixture
+def bench_app():
+    app = bench.BenchApp()
+    app.root = app.build()
+    App._running_app = app
+    yield app
+    App._running_app = None
+    if app._data_dir is not None:
+        shutil.rmtree(app._data_dir, ignore_errors=True)
+
+
+def test_resize_and_screen_switches_stay_flat(bench_app):
+    # مرحله‌های بیشتر از بودجه LRU تا در هر چرخه یک صفحه آزاد و دوباره ساخته شود
+    levels = LEVELS[:MAX_LIVE_GAME_SCREENS + 2]
+    report = bench.check_stability(24, levels=levels)
+    assert report["max_live_screens"] == MAX_LIVE_GAME_SCREENS
+    assert report["instructions_after"] == report["instructions_before"]
+    assert report["launcher_instructions_replaced"] == 0
+    assert report["memory_growth_kb"] < bench.MEMORY_TOLERANCE_KB
+    assert report["flat"]
+
+
+def test_stability_check_catches_unsynced_kv_rules(bench_app, monkeypatch):
+    # بدون Builder.sync قواعد canvas هر صفحه ساخته‌شده در صف kv می‌مانند
+    monkeypatch.setattr(bench, "frame", Clock.tick)
+    report = bench.check_stability(36, levels=LEVELS[:MAX_LIVE_GAME_SCREENS + 2])
+    assert not report["flat"]
+
+
+def test_atlas_shares_one_texture_between_buttons(bench_app):
+    report = bench.texture_report(LEVELS[:1])
+    for name, stats in report.items():
+        # تصاویر جدا هیچ‌وقت تعویض بافت کمتری ندارند
+        assert stats["binds_per_frame"] <= stats["separate_binds_per_frame"]
+        assert stats["textures"] <= stats["separate_textures"]
+    game = report[LEVELS[0].name]
+    # پنج دکمه سایدبار با تصاویر جدا پنج بافت دارند و با اطلس یکی
+    assert game["separate_textures"] - game["textures"] == 4
@@ -0,0 +1,51 @@
+# tests/test_validator.py
+import numpy as np
+import pytest
+
+from board import BoardModel
+from levels import LEVELS, cards_per_color, level_cards
+from validator import MISMATCH, EdgeValidator, check_boards, edge_states
+
+
+def back_colors(level):
+    return [color for color in range(len(level.row_colors)) for _ in range(cards_per_color(level))]
+
+
+def vector_states(validator):
+    board = validator.board
+    h, v = edge_states(
+        validator.table, board.cols, board.rows, board.cell, board.turns, board.face_up
+    )
+    return np.concatenate([h.ravel(), v.ravel()]).tolist()
+
+
+@pytest.mark.parametrize("level", LEVELS, ids=lambda level: level.name)
+def test_incremental_states_match_edge_states(level):
+    rng = np.random.default_rng(level.cols * level.rows)
+    board = BoardModel(level.cols, level.rows, back_colors(level))
+    validator = EdgeValidator(board, level_cards(level))
+    for _ in range(600):
+        card = int(rng.integers(board.n_cards))
+        action = rng.integers(5)
+        if action == 0:
+            free = np.flatnonzero(board.occupant < 0)
+            if free.size:
+                board.place(card, int(free[rng.integers(free.size)]))
+        elif action == 1:
+            board.remove(card)
+        elif action == 2:
+            board.rotate(card)
+        elif action == 3:
+            board.flip(card)
+        elif rng.random() < 0.05:
+            with validator.suspended():
+                board.clear()
+        states = vector_states(validator)
+        assert validator.states == states
+        assert validator.mismatches == states.count(MISMATCH)
+        assert validator.filled == len(board.placed())
+        mismatches, complete = check_boards(validator.table, [board])
+        assert validator.mismatches == mismatches[0]
+        assert validator.complete == complete[0]
+    validator.detach()
+    assert board.watchers == []
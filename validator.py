@@ -0,0 +1,279 @@
+# validator.py
+"""بررسی جور بودن لبه‌های کارت‌های روی صفحه.
+
+هر لبه بین دو خانه مجاور یکی از سه حالت را دارد: خالی (یکی از دو خانه کارت
+ندارد)، جور (ربع‌های چسبیده به هم هم‌رنگ هستند) یا ناجور. EdgeValidator حالت
+همه لبه‌های یک BoardModel را نگه می‌دارد و با هر تغییر یک خانه (انداختن،
+برداشتن، چرخاندن یا پشت‌ورو کردن کارت) فقط چهار لبه همان خانه را دوباره حساب
+می‌کند؛ تعداد لبه‌های ناجور و کامل بودن صفحه همیشه آماده است.
+
+edge_states و check_boards همان بررسی را به صورت برداری (NumPy) برای یک یا
+چند صفحه یکجا انجام می‌دهند. جهت ربع‌ها و چرخش‌ها مثل solver.py است.
+"""
+import sys
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from board import OFF_BOARD, BoardModel
+from solver import oriented_quadrants
+
+# حالت لبه‌ها
+EMPTY, MATCH, MISMATCH = 0, 1, 2
+# ایندکس ربع‌ها در quads: بالا-چپ، بالا-راست، پایین-راست، پایین-چپ
+TL, TR, BR, BL = range(4)
+
+
+def quadrant_table(cards):
+    """آرایه (کارت، رو بودن، ربع‌چرخش، ربع) رنگ ربع‌های هر کارت در هر جهت."""
+    table = np.zeros((len(cards), 2, 4, 4), dtype=np.int16)
+    for card_id, card in enumerate(cards):
+        for face_up in (False, True):
+            for turns in range(4):
+                table[card_id, int(face_up), turns] = oriented_quadrants(card, turns, face_up)
+    return table
+
+
+def edge_states(quads, cols, rows, cell, turns, face_up):
+    """حالت لبه‌های افقی و عمودی برای یک دسته صفحه.
+
+    cell، turns و face_up آرایه‌های (صفحه، کارت) هستند. خروجی (h، v) با شکل‌های
+    (صفحه، rows، cols-1) برای لبه بین هر خانه و خانه راستش و (صفحه، rows-1، cols)
+    برای لبه بین هر خانه و خانه بالایش.
+    """
+    cell = np.atleast_2d(cell)
+    turns = np.atleast_2d(turns)
+    face_up = np.atleast_2d(face_up)
+    n_boards = cell.shape[0]
+    boards, cards = np.nonzero(cell != OFF_BOARD)
+    cells = cell[boards, cards]
+    grid = np.full((n_boards, cols * rows, 4), -1, dtype=np.int16)
+    grid[boards, cells] = quads[cards, face_up[boards, cards].astype(np.intp), turns[boards, cards]]
+    occupied = np.zeros((n_boards, cols * rows), dtype=np.bool_)
+    occupied[boards, cells] = True
+    grid = grid.reshape(n_boards, rows, cols, 4)
+    occupied = occupied.reshape(n_boards, rows, cols)
+
+    left, right = grid[:, :, :-1], grid[:, :, 1:]
+    h_match = (left[..., TR] == right[..., TL]) & (left[..., BR] == right[..., BL])
+    h_both = occupied[:, :, :-1] & occupied[:, :, 1:]
+    lower, upper = grid[:, :-1], grid[:, 1:]
+    v_match = (lower[..., TL] == upper[..., BL]) & (lower[..., TR] == upper[..., BR])
+    v_both = occupied[:, :-1] & occupied[:, 1:]
+    h = np.where(h_both, np.where(h_match, MATCH, MISMATCH), EMPTY).astype(np.uint8)
+    v = np.where(v_both, np.where(v_match, MATCH, MISMATCH), EMPTY).astype(np.uint8)
+    return h, v
+
+
+def check_boards(quads, boards):
+    """(تعداد لبه‌های ناجور، کامل بودن) برای هر صفحه از یک لیست BoardModel هم‌اندازه."""
+    first = boards[0]
+    h, v = edge_states(
+        quads,
+        first.cols,
+        first.rows,
+        np.stack([board.cell for board in boards]),
+        np.stack([board.turns for board in boards]),
+        np.stack([board.face_up for board in boards]),
+    )
+    mismatches = (h == MISMATCH).sum(axis=(1, 2)) + (v == MISMATCH).sum(axis=(1, 2))
+    full = np.stack([board.occupant != OFF_BOARD for board in boards]).all(axis=1)
+    return mismatches, full & (mismatches == 0)
+
+
+class EdgeValidator(object):
+    """حالت لبه‌های یک BoardModel که با هر تغییر خانه به‌روز می‌شود.
+
+    لبه‌ها با شماره مشخص می‌شوند: اول لبه‌های افقی (بین خانه و خانه راستش، سطر
+    به سطر) و بعد لبه‌های عمودی (بین خانه و خانه بالایش). on_change پس از هر
+    به‌روزرسانی صدا زده می‌شود و لبه‌هایی که حالتشان عوض شده در dirty جمع می‌شوند.
+    cards کارت‌های solver.Card مرحله به ترتیب شناسه کارت است (levels.level_cards).
+    """
+
+    def __init__(self, board, cards, on_change=None):
+        self.board = board
+        self.cols = cols = board.cols
+        self.rows = rows = board.rows
+        self.table = quadrant_table(cards)
+        self.quads = self.table.tolist()
+        self.on_change = on_change
+
+        # دو سر هر لبه (خانه چپ/پایین، خانه راست/بالا) و افقی بودن آن
+        self.n_horizontal = rows * (cols - 1)
+        self.edge_cells = []
+        for row in range(rows):
+            for col in range(cols - 1):
+                index = row * cols + col
+                self.edge_cells.append((index, index + 1, True))
+        for row in range(rows - 1):
+            for col in range(cols):
+                index = row * cols + col
+                self.edge_cells.append((index, index + cols, False))
+        # لبه‌های هر خانه به ترتیب چپ، راست، پایین، بالا (None در حاشیه صفحه)
+        self.cell_edges = []
+        for index in range(cols * rows):
+            row, col = divmod(index, cols)
+            h = row * (cols - 1) + col
+            v = self.n_horizontal + row * cols + col
+            self.cell_edges.append((
+                h - 1 if col > 0 else None,
+                h if col + 1 < cols else None,
+                v - cols if row > 0 else None,
+                v if row + 1 < rows else None,
+            ))
+        self.dirty = set()
+        self.states = None
+        self._suspended = 0
+        self.refresh()
+        board.watchers.append(self.cell_changed)
+
+    def detach(self):
+        if self.cell_changed in self.board.watchers:
+            self.board.watchers.remove(self.cell_changed)
+
+    @property
+    def n_edges(self):
+        return len(self.edge_cells)
+
+    @property
+    def complete(self):
+        """همه خانه‌ها پر و همه لبه‌ها جور."""
+        return self.filled == self.cols * self.rows and not self.mismatches
+
+    @contextmanager
+    def suspended(self):
+        """برای تغییرات دسته‌ای (ریست، بازیابی): به‌روزرسانی خانه‌به‌خانه متوقف و در
+        پایان یک refresh برداری انجام می‌شود."""
+        self._suspended += 1
+        try:
+            yield self
+        finally:
+            self._suspended -= 1
+            if not self._suspended:
+                self.refresh()
+
+    def refresh(self):
+        """حالت همه لبه‌ها را با edge_states از نو حساب می‌کند."""
+        board = self.board
+        h, v = edge_states(
+            self.table, self.cols, self.rows, board.cell, board.turns, board.face_up
+        )
+        states = np.concatenate([h.ravel(), v.ravel()]).tolist()
+        old = self.states
+        if old is not None:
+            self.dirty.update(e for e in range(len(states)) if states[e] != old[e])
+        self.states = states
+        self.mismatches = states.count(MISMATCH)
+        self.filled = int((board.occupant != OFF_BOARD).sum())
+        self._occupied = (board.occupant != OFF_BOARD).tolist()
+        if self.on_change is not None:
+            self.on_change()
+
+    def _quads(self, index):
+        card = int(self.board.occupant[index])
+        if card == OFF_BOARD:
+            return None
+        board = self.board
+        return self.quads[card][int(board.face_up[card])][int(board.turns[card])]
+
+    def _edge_state(self, edge):
+        a, b, horizontal = self.edge_cells[edge]
+        qa = self._quads(a)
+        qb = self._quads(b)
+        if qa is None or qb is None:
+            return EMPTY
+        if horizontal:
+            match = qa[TR] == qb[TL] and qa[BR] == qb[BL]
+        else:
+            match = qa[TL] == qb[BL] and qa[TR] == qb[BR]
+        return MATCH if match else MISMATCH
+
+    def cell_changed(self, index):
+        """فقط چهار لبه خانه index دوباره حساب می‌شوند."""
+        if self._suspended:
+            return
+        occupied = self.board.occupant[index] != OFF_BOARD
+        if occupied != self._occupied[index]:
+            self._occupied[index] = occupied
+            self.filled += 1 if occupied else -1
+        states = self.states
+        for edge in self.cell_edges[index]:
+            if edge is None:
+                continue
+            state = self._edge_state(edge)
+            old = states[edge]
+            if state != old:
+                if old == MISMATCH:
+                    self.mismatches -= 1
+                elif state == MISMATCH:
+                    self.mismatches += 1
+                states[edge] = state
+                self.dirty.add(edge)
+        if self.on_change is not None:
+            self.on_change()
+
+    def cell_state(self, index):
+        """حالت لبه‌های چپ، راست، پایین و بالای خانه index."""
+        return tuple(EMPTY if edge is None else self.states[edge] for edge in self.cell_edges[index])
+
+    def pop_dirty(self):
+        """لبه‌هایی که از فراخوانی قبلی حالتشان عوض شده."""
+        dirty = self.dirty
+        self.dirty = set()
+        return dirty
+
+
+def random_boards(cols, rows, back_colors, count, seed=0):
+    """صفحه‌های پر تصادفی (جای‌گشت، چرخش و طرف تصادفی کارت‌ها) برای سنجش."""
+    rng = np.random.default_rng(seed)
+    boards = []
+    n_cells = cols * rows
+    for _ in range(count):
+        board = BoardModel(cols, rows, back_colors)
+        board.cell[:] = rng.permutation(n_cells)[:board.n_cards]
+        board.occupant[board.cell] = np.arange(board.n_cards)
+        board.turns[:] = rng.integers(0, 4, board.n_cards)
+        board.face_up[:] = rng.integers(0, 2, board.n_cards).astype(np.bool_)
+        boards.append(board)
+    return boards
+
+
+def main(argv=None):
+    from levels import LEVELS_BY_NAME, card_back_colors, level_cards
+
+    argv = sys.argv[1:] if argv is None else argv
+    names = argv or ["game_4x4", "game_12x12"]
+    count = 1000
+    for name in names:
+        level = LEVELS_BY_NAME[name]
+        boards = random_boards(level.cols, level.rows, card_back_colors(level), count)
+        validator = EdgeValidator(boards[0], level_cards(level))
+        started = time.perf_counter()
+        mismatches, complete = check_boards(validator.table, boards)
+        batch = time.perf_counter() - started
+
+        # به‌روزرسانی افزایشی: چرخاندن کارت‌های یک صفحه پر یکی‌یکی
+        board = boards[0]
+        started = time.perf_counter()
+        for i in range(count):
+            board.rotate(i % board.n_cards)
+        incremental = time.perf_counter() - started
+        ok = validator.mismatches == check_boards(validator.table, [board])[0][0]
+        print(
+            "%s: %d boards checked in %.2fms (%.2fus/board, %d complete); "
+            "incremental update %.2fus (%s)"
+            % (
+                name,
+                count,
+                batch * 1000,
+                batch * 1e6 / count,
+                int(complete.sum()),
+                incremental * 1e6 / count,
+                "consistent" if ok else "INCONSISTENT",
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()